@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.modules.auth.router import router as auth_router
 from app.modules.roles.router import router as roles_router
+from app.modules.system.router import router as system_router
 from app.modules.users.router import router as users_router
 
 main_router = APIRouter()
@@ -9,5 +10,6 @@ main_router = APIRouter()
 main_router.include_router(auth_router, prefix="/auth", tags=["Auth"])
 main_router.include_router(roles_router, prefix="/roles", tags=["Roles"])
 main_router.include_router(users_router, prefix="/users", tags=["Users"])
+main_router.include_router(system_router, prefix="/system", tags=["System"])
 
 __all__ = ["main_router"]
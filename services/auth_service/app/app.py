@@ -1,9 +1,19 @@
+import logging
 import os
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from learning_platform_common.logging import setup_logging
+from learning_platform_common.utils import ResponseUtils
 
 from app.api.main_router import main_router
+from app.core.argon2_calibration import calibrate_on_startup
+from app.core.password_pool import PasswordPoolBusyError, password_pool
 from app.middleware.auth import setup_auth_middleware
+from app.modules.auth.purge import refresh_purge_worker, start_refresh_purge
+from app.modules.auth.rehash import rehash_worker
+
+logger = logging.getLogger(__name__)
 
 
 def try_pycharm_attach() -> None:
@@ -19,12 +29,13 @@ def try_pycharm_attach() -> None:
         suspend=False,
         trace_only_current_thread=False,
       )
-      print(f"[debug] ✅ Attached to PyCharm at {host}:{port}")
+      logger.info("PyCharm debugger attached at %s:%s", host, port)
     except Exception as e:
-      print(f"[debug] ❌ Failed to attach to PyCharm: {e}")
+      logger.warning("Failed to attach to PyCharm: %s", e)
 
 
 def create_app() -> FastAPI:
+  setup_logging("auth_service")
   try_pycharm_attach()
 
   app = FastAPI(
@@ -40,6 +51,20 @@ def create_app() -> FastAPI:
 
   # app.add_event_handler("startup", _startup_attach)
 
+  async def password_pool_busy_handler(request: Request, exc: PasswordPoolBusyError):
+    return JSONResponse(
+      ResponseUtils.error("auth_busy"),
+      status_code=503,
+      headers={"Retry-After": "1"},
+    )
+
+  app.add_exception_handler(PasswordPoolBusyError, password_pool_busy_handler)
+  app.router.add_event_handler("startup", calibrate_on_startup)
+  app.router.add_event_handler("startup", start_refresh_purge)
+  app.router.add_event_handler("shutdown", refresh_purge_worker.stop)
+  app.router.add_event_handler("shutdown", rehash_worker.stop)
+  app.router.add_event_handler("shutdown", password_pool.shutdown)
+
   setup_auth_middleware(app)
 
   app.include_router(main_router)
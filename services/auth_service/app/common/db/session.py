@@ -1,18 +1,101 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
   AsyncEngine,
   AsyncSession,
   async_sessionmaker,
   create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
 
 from app.common.db import models_registry  # noqa: F401
 from app.core.config import settings
 
-engine: AsyncEngine = create_async_engine(
-  settings.db_dsn,
-  poolclass=NullPool,
-)
+
+@dataclass
+class PoolWaitStats:
+  waits: int = 0
+  total_wait: float = 0.0
+  max_wait: float = 0.0
+
+  def record(self, seconds: float) -> None:
+    self.waits += 1
+    self.total_wait += seconds
+    self.max_wait = max(self.max_wait, seconds)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+  """QueuePool, который замеряет время ожидания свободного соединения."""
+
+  def __init__(self, *args, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.wait_stats = PoolWaitStats()
+
+  def _do_get(self):
+    started = time.perf_counter()
+    try:
+      return super()._do_get()
+    finally:
+      self.wait_stats.record(time.perf_counter() - started)
+
+  def recreate(self):
+    pool = super().recreate()
+    pool.wait_stats = self.wait_stats
+    return pool
+
+
+def create_engine(dsn: str | None = None, *, null_pool: bool | None = None) -> AsyncEngine:
+  url = make_url(dsn or settings.db_dsn)
+  if null_pool is None:
+    null_pool = settings.db_null_pool
+
+  if null_pool:
+    # тестам нужен новый коннект на каждый event loop
+    return create_async_engine(url, poolclass=NullPool)
+
+  connect_args = {}
+  if url.get_backend_name() == "postgresql" and url.get_driver_name() == "asyncpg":
+    connect_args["statement_cache_size"] = settings.db_statement_cache_size
+    url = url.update_query_dict(
+      {"prepared_statement_cache_size": str(settings.db_statement_cache_size)}
+    )
+
+  return create_async_engine(
+    url,
+    poolclass=TimedQueuePool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    connect_args=connect_args,
+  )
+
+
+def pool_stats(pool: Pool | None = None) -> dict:
+  pool = pool or engine.pool
+  if not isinstance(pool, TimedQueuePool):
+    return {"pool": type(pool).__name__}
+
+  wait = pool.wait_stats
+  return {
+    "pool": type(pool).__name__,
+    "size": pool.size(),
+    "checked_out": pool.checkedout(),
+    "checked_in": pool.checkedin(),
+    "overflow": pool.overflow(),
+    "max_overflow": pool._max_overflow,
+    "checkouts": wait.waits,
+    "wait_avg_ms": round(wait.total_wait / wait.waits * 1000, 3) if wait.waits else 0.0,
+    "wait_max_ms": round(wait.max_wait * 1000, 3),
+  }
+
+
+engine: AsyncEngine = create_engine()
 
 SessionLocal = async_sessionmaker(
   bind=engine,
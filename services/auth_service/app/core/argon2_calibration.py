@@ -0,0 +1,186 @@
+"""
+Калибровка параметров argon2 под текущую машину.
+
+Подбирает memory_cost/time_cost так, чтобы медианное время хэша укладывалось
+в бюджет (например, 50 мс), а N одновременных входов не превышали потолок
+памяти. Результат пишется в JSON, который читает `_pwd_ctx`
+(ARGON2_SETTINGS_FILE).
+
+CLI:
+    python -m app.core.argon2_calibration --target-ms 50 --memory-mib 512 \\
+        --concurrency 8 --output /app/keys/argon2.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.core.security import reset_password_context
+
+logger = logging.getLogger(__name__)
+
+MIN_MEMORY_KIB = 8 * 1024
+MAX_MEMORY_KIB = 256 * 1024
+MAX_TIME_COST = 10
+
+
+@dataclass
+class CalibrationResult:
+  time_cost: int
+  memory_cost: int
+  parallelism: int
+  p50_ms: float
+  target_ms: float
+  memory_ceiling_mib: int
+  concurrency: int
+  workers: int
+  logins_per_second: float
+
+  def as_settings(self) -> dict:
+    return {
+      "time_cost": self.time_cost,
+      "memory_cost": self.memory_cost,
+      "parallelism": self.parallelism,
+    }
+
+
+def measure_p50(time_cost: int, memory_cost: int, parallelism: int, samples: int = 5) -> float:
+  ctx = CryptContext(
+    schemes=["argon2"],
+    argon2__type="ID",
+    argon2__time_cost=time_cost,
+    argon2__memory_cost=memory_cost,
+    argon2__parallelism=parallelism,
+  )
+  ctx.hash("warmup")
+  timings = []
+  for _ in range(samples):
+    started = time.perf_counter()
+    ctx.hash("calibration-password")
+    timings.append((time.perf_counter() - started) * 1000)
+  return statistics.median(timings)
+
+
+def _memory_limit_kib(memory_ceiling_mib: int, concurrency: int) -> int:
+  # степень двойки, чтобы concurrency хэшей разом уложились в потолок
+  limit = memory_ceiling_mib * 1024 // max(concurrency, 1)
+  memory = MIN_MEMORY_KIB
+  while memory * 2 <= min(limit, MAX_MEMORY_KIB):
+    memory *= 2
+  return memory
+
+
+def calibrate(
+  target_ms: float = 50.0,
+  memory_ceiling_mib: int = 512,
+  concurrency: int = 8,
+  parallelism: int | None = None,
+  workers: int | None = None,
+  measure: Callable[[int, int, int], float] = measure_p50,
+) -> CalibrationResult:
+  parallelism = parallelism or int(settings.argon2_parallelism)
+  workers = workers or password_pool.workers
+
+  memory = _memory_limit_kib(memory_ceiling_mib, concurrency)
+  time_cost = 1
+  p50 = measure(time_cost, memory, parallelism)
+
+  # даже t=1 не укладывается в бюджет — уменьшаем память
+  while p50 > target_ms and memory > MIN_MEMORY_KIB:
+    memory //= 2
+    p50 = measure(time_cost, memory, parallelism)
+
+  # добираем бюджет проходами
+  while time_cost < MAX_TIME_COST:
+    candidate = measure(time_cost + 1, memory, parallelism)
+    if candidate > target_ms:
+      break
+    time_cost += 1
+    p50 = candidate
+
+  return CalibrationResult(
+    time_cost=time_cost,
+    memory_cost=memory,
+    parallelism=parallelism,
+    p50_ms=round(p50, 2),
+    target_ms=target_ms,
+    memory_ceiling_mib=memory_ceiling_mib,
+    concurrency=concurrency,
+    workers=workers,
+    logins_per_second=round(workers * 1000 / p50, 1) if p50 else 0.0,
+  )
+
+
+def write_settings(result: CalibrationResult, path: str | Path) -> None:
+  path = Path(path)
+  path.parent.mkdir(parents=True, exist_ok=True)
+  payload = {**result.as_settings(), "report": asdict(result)}
+  # через временный файл: падение посреди записи не оставит обрезанный JSON
+  tmp = path.with_suffix(path.suffix + ".tmp")
+  tmp.write_text(json.dumps(payload, indent=2))
+  tmp.replace(path)
+
+
+async def calibrate_on_startup() -> None:
+  """Однократная калибровка при старте, если включена и файла ещё нет."""
+  path = settings.argon2_settings_file
+  if not settings.argon2_calibrate_on_startup or not path or Path(path).exists():
+    return
+
+  result = await asyncio.to_thread(
+    calibrate,
+    target_ms=settings.argon2_target_ms,
+    memory_ceiling_mib=settings.argon2_memory_ceiling_mib,
+    concurrency=settings.argon2_concurrency,
+  )
+  write_settings(result, path)
+  reset_password_context()
+  logger.info("argon2 calibrated: %s", format_report(result))
+
+
+def format_report(result: CalibrationResult) -> str:
+  return (
+    f"argon2id t={result.time_cost} m={result.memory_cost // 1024}MiB p={result.parallelism}: "
+    f"p50 {result.p50_ms} ms (budget {result.target_ms} ms), "
+    f"{result.concurrency} concurrent logins use "
+    f"{result.memory_cost * result.concurrency // 1024}MiB of {result.memory_ceiling_mib}MiB, "
+    f"ceiling ~{result.logins_per_second} logins/s on {result.workers} workers"
+  )
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Подбор параметров argon2 под текущую машину")
+  parser.add_argument("--target-ms", type=float, default=settings.argon2_target_ms)
+  parser.add_argument("--memory-mib", type=int, default=settings.argon2_memory_ceiling_mib)
+  parser.add_argument("--concurrency", type=int, default=settings.argon2_concurrency)
+  parser.add_argument("--parallelism", type=int, default=None)
+  parser.add_argument("--output", default=settings.argon2_settings_file)
+  args = parser.parse_args(argv)
+
+  result = calibrate(
+    target_ms=args.target_ms,
+    memory_ceiling_mib=args.memory_mib,
+    concurrency=args.concurrency,
+    parallelism=args.parallelism,
+  )
+  print(format_report(result))
+
+  if args.output:
+    write_settings(result, args.output)
+    print(f"written to {args.output}")
+
+
+if __name__ == "__main__":
+  main()
@@ -7,6 +7,24 @@ from sqlalchemy import URL
 
 class Settings(BaseSettings):
   db_dsn: str | None = Field(alias="DB_DSN", default=None)
+  db_pool_size: int = Field(alias="DB_POOL_SIZE", default=10)
+  db_max_overflow: int = Field(alias="DB_MAX_OVERFLOW", default=10)
+  db_pool_timeout: float = Field(alias="DB_POOL_TIMEOUT", default=30.0)
+  db_pool_recycle: int = Field(alias="DB_POOL_RECYCLE", default=1800)
+  db_pool_pre_ping: bool = Field(alias="DB_POOL_PRE_PING", default=True)
+  db_statement_cache_size: int = Field(alias="DB_STATEMENT_CACHE_SIZE", default=100)
+  db_null_pool: bool = Field(alias="DB_NULL_POOL", default=False)
+
+  user_status_cache_size: int = Field(alias="USER_STATUS_CACHE_SIZE", default=10_000)
+  user_status_cache_ttl: float = Field(alias="USER_STATUS_CACHE_TTL", default=30.0)
+  # короче трёх символов у триграммного индекса нет опоры — будет seq scan
+  user_search_min_length: int = Field(alias="USER_SEARCH_MIN_LENGTH", default=3)
+  role_catalog_ttl: float = Field(alias="ROLE_CATALOG_TTL", default=60.0)
+  # массовый импорт: строк в одной транзакции, предел строк на запрос,
+  # потоки общего пула хэширования (0 — половина PASSWORD_HASH_WORKERS)
+  user_import_batch_size: int = Field(alias="USER_IMPORT_BATCH_SIZE", default=500)
+  user_import_max_rows: int = Field(alias="USER_IMPORT_MAX_ROWS", default=50_000)
+  user_import_hash_workers: int = Field(alias="USER_IMPORT_HASH_WORKERS", default=0)
 
   env: str = Field(alias="ENV", default="dev")
 
@@ -14,19 +32,44 @@ class Settings(BaseSettings):
   argon2_time_cost: str = Field(alias="ARGON2_TIME_COST", default="3")
   argon2_memory_cost: str = Field(alias="ARGON2_MEMORY_COST", default="65536")
   argon2_parallelism: str = Field(alias="ARGON2_PARALLELISM", default="2")
+  # файл с подобранными параметрами argon2 (app.core.argon2_calibration)
+  argon2_settings_file: str | None = Field(alias="ARGON2_SETTINGS_FILE", default=None)
+  argon2_calibrate_on_startup: bool = Field(alias="ARGON2_CALIBRATE_ON_STARTUP", default=False)
+  argon2_target_ms: float = Field(alias="ARGON2_TARGET_MS", default=50.0)
+  argon2_memory_ceiling_mib: int = Field(alias="ARGON2_MEMORY_CEILING_MIB", default=512)
+  argon2_concurrency: int = Field(alias="ARGON2_CONCURRENCY", default=8)
+  # 0 — по числу CPU, но не больше 4
+  password_hash_workers: int = Field(alias="PASSWORD_HASH_WORKERS", default=0)
+  password_hash_queue_limit: int = Field(alias="PASSWORD_HASH_QUEUE_LIMIT", default=64)
   cors_origins: list[str] = Field(alias="CORS_ORIGINS", default_factory=list)
 
   api_prefix: str = Field(alias="API_PREFIX", default="/api/v1")
 
   jwt_iss: str = Field(alias="JWT_ISS", default="auth-service")
+  # RS256 | ES256 | EdDSA — ключи из связки; иначе симметричный HS* с JWT_SECRET
   jwt_alg: str = Field(alias="JWT_ALG", default="RS256")
 
   jwt_secret: str | None = Field(alias="JWT_SECRET", default=None)
   jwt_private_key_path: str | None = Field(alias="JWT_PRIVATE_KEY_PATH", default=None)
   jwt_public_key_path: str | None = Field(alias="JWT_PUBLIC_KEY_PATH", default=None)
+  # каталог связки ключей; по умолчанию <каталог JWT_PRIVATE_KEY_PATH>/keyring
+  jwt_keyring_dir: str | None = Field(alias="JWT_KEYRING_DIR", default=None)
+  jwt_keyring_max_keys: int = Field(alias="JWT_KEYRING_MAX_KEYS", default=5)
+  jwks_max_age: int = Field(alias="JWKS_MAX_AGE", default=300)
+  # новый ключ подписывает только через столько секунд после публикации в JWKS;
+  # не меньше JWKS_MAX_AGE и TTL кэша JWKS у courses/progress (300 с)
+  jwt_key_publish_delay: int = Field(alias="JWT_KEY_PUBLISH_DELAY", default=360)
 
   jwt_access_ttl_min: int = Field(alias="JWT_ACCESS_TTL_MIN", default=15)
   jwt_refresh_ttl_days: int = Field(alias="JWT_REFRESH_TTL_DAYS", default=30)
+  # чистка истёкших/отозванных refresh-токенов
+  refresh_purge_enabled: bool = Field(alias="REFRESH_PURGE_ENABLED", default=True)
+  refresh_purge_interval: float = Field(alias="REFRESH_PURGE_INTERVAL", default=3600.0)
+  refresh_purge_batch_size: int = Field(alias="REFRESH_PURGE_BATCH_SIZE", default=1000)
+  refresh_purge_throttle_ms: int = Field(alias="REFRESH_PURGE_THROTTLE_MS", default=100)
+  refresh_purge_grace_hours: int = Field(alias="REFRESH_PURGE_GRACE_HOURS", default=24)
+  # лента отзыва для courses/progress: опрос требует X-Feed-Token; без токена лента закрыта
+  revocation_feed_token: str | None = Field(alias="REVOCATION_FEED_TOKEN", default=None)
 
   cookie_domain: str = Field(alias="COOKIE_DOMAIN")
   cookie_secure: bool = Field(alias="COOKIE_SECURE")
@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import base64
+import contextlib
+import dataclasses
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+  Encoding,
+  NoEncryption,
+  PrivateFormat,
+  PublicFormat,
+)
+
+logger = logging.getLogger(__name__)
+
+LEGACY_KID = "main-key-1"
+MANIFEST = "keyring.json"
+SUPPORTED_ALGS = ("RS256", "ES256", "EdDSA")
+
+
+class KeyRingFullError(RuntimeError):
+  """Все max_keys ключей ещё проверяют живые токены — ротировать некуда."""
+
+
+@dataclass
+class KeyEntry:
+  kid: str
+  path: str
+  alg: str
+  # разобранные объекты ключей: PyJWT принимает их как есть и не парсит PEM на каждый токен
+  private_key: Any
+  public_key: Any
+  public_pem: str
+  jwk: dict
+  created_at: float
+  retired_at: float | None = None
+  # с этого момента ключ подписывает; до него только опубликован в JWKS
+  activate_at: float | None = None
+
+  def manifest(self) -> dict:
+    return {
+      "kid": self.kid,
+      "path": self.path,
+      "alg": self.alg,
+      "created_at": self.created_at,
+      "retired_at": self.retired_at,
+      "activate_at": self.activate_at,
+    }
+
+
+@dataclass(frozen=True)
+class KeyRingState:
+  """
+  Снимок набора ключей. Меняется только целиком: ротация в потоке собирает
+  новый снимок и подставляет его одним присваиванием, поэтому event loop
+  никогда не видит словарь посреди изменения, а JWKS и ETag — от разных
+  состояний.
+  """
+
+  keys: dict[str, KeyEntry]
+  active_kid: str
+  next_kid: str | None
+  jwks_body: bytes
+  etag: str
+
+  @property
+  def active(self) -> KeyEntry:
+    return self.keys[self.active_kid]
+
+  @property
+  def next(self) -> KeyEntry | None:
+    return self.keys.get(self.next_kid) if self.next_kid else None
+
+
+def _state(keys: dict[str, KeyEntry], active_kid: str, next_kid: str | None) -> KeyRingState:
+  # активный ключ первым — клиенты без kid берут keys[0]; следующий — за ним
+  ordered = sorted(keys.values(), key=lambda e: (e.kid != active_kid, e.kid != next_kid))
+  body = json.dumps({"keys": [e.jwk for e in ordered]}, separators=(",", ":")).encode()
+  return KeyRingState(
+    keys=keys,
+    active_kid=active_kid,
+    next_kid=next_kid,
+    jwks_body=body,
+    etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+  )
+
+
+def _promoted(state: KeyRingState, now: float) -> KeyRingState | None:
+  # момент переключения записан в манифесте, поэтому все воркеры
+  # переключаются одинаково, без отдельной записи
+  pending = state.next
+  if pending is None or pending.activate_at > now:
+    return None
+  keys = dict(state.keys)
+  keys[state.active_kid] = dataclasses.replace(state.active, retired_at=pending.activate_at)
+  return _state(keys, pending.kid, None)
+
+
+def _b64(raw: bytes) -> str:
+  return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64_int(value: int, size: int | None = None) -> str:
+  return _b64(value.to_bytes(size or (value.bit_length() + 7) // 8, "big"))
+
+
+def _alg_for(private_key: Any) -> str:
+  if isinstance(private_key, rsa.RSAPrivateKey):
+    return "RS256"
+  if isinstance(private_key, ec.EllipticCurvePrivateKey) and isinstance(
+    private_key.curve, ec.SECP256R1
+  ):
+    return "ES256"
+  if isinstance(private_key, ed25519.Ed25519PrivateKey):
+    return "EdDSA"
+  raise ValueError(f"Unsupported signing key type: {type(private_key).__name__}")
+
+
+def _public_jwk(kid: str, alg: str, public_key: Any) -> dict:
+  jwk = {"use": "sig", "kid": kid, "alg": alg}
+  if alg == "RS256":
+    numbers = public_key.public_numbers()
+    jwk.update(kty="RSA", n=_b64_int(numbers.n), e=_b64_int(numbers.e))
+  elif alg == "ES256":
+    numbers = public_key.public_numbers()
+    jwk.update(kty="EC", crv="P-256", x=_b64_int(numbers.x, 32), y=_b64_int(numbers.y, 32))
+  else:
+    raw = public_key.public_bytes(encoding=Encoding.Raw, format=PublicFormat.Raw)
+    jwk.update(kty="OKP", crv="Ed25519", x=_b64(raw))
+  return jwk
+
+
+def _generate(alg: str) -> Any:
+  if alg == "RS256":
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+  if alg == "ES256":
+    return ec.generate_private_key(ec.SECP256R1())
+  if alg == "EdDSA":
+    return ed25519.Ed25519PrivateKey.generate()
+  raise ValueError(f"Unsupported signing algorithm: {alg}")
+
+
+def _private_pem(private_key: Any) -> str:
+  return private_key.private_bytes(
+    encoding=Encoding.PEM,
+    format=PrivateFormat.PKCS8,
+    encryption_algorithm=NoEncryption(),
+  ).decode()
+
+
+def _public_pem(public_key: Any) -> str:
+  return public_key.public_bytes(
+    encoding=Encoding.PEM, format=PublicFormat.SubjectPublicKeyInfo
+  ).decode()
+
+
+def _entry(
+  kid: str, path: str, private_key: Any, created_at: float, retired_at=None, activate_at=None
+) -> KeyEntry:
+  alg = _alg_for(private_key)
+  public_key = private_key.public_key()
+  return KeyEntry(
+    kid=kid,
+    path=path,
+    alg=alg,
+    private_key=private_key,
+    public_key=public_key,
+    public_pem=_public_pem(public_key),
+    jwk=_public_jwk(kid, alg, public_key),
+    created_at=created_at,
+    retired_at=retired_at,
+    activate_at=activate_at,
+  )
+
+
+def _load_private(path: str | Path) -> Any:
+  return serialization.load_pem_private_key(Path(path).read_bytes(), password=None)
+
+
+class KeyRing:
+  """
+  Набор ключей подписи JWT: один активный и несколько выведенных.
+
+  Новый ключ сначала только публикуется в JWKS и начинает подписывать
+  через publish_delay — к этому моменту потребители уже перечитали JWKS
+  и знают его kid. Выведенные ключи остаются в JWKS и продолжают
+  проверять токены, пока не истекут все выданные ими токены
+  (retain_seconds), поэтому ротация не ломает сессии: если все max_keys
+  ключей ещё нужны, ротация отклоняется (KeyRingFullError). JWKS-документ и его
+  ETag считаются один раз на ротацию.
+  Всё изменяемое лежит в неизменяемом снимке state (KeyRingState): читатели
+  берут его один раз, писатели (ротация в потоке, перечитывание манифеста
+  в event loop) сериализуются коротким threading.Lock.
+  Состояние хранится в `keyring.json` рядом с ключами; другие воркеры
+  подхватывают ротацию по mtime манифеста.
+  """
+
+  def __init__(
+    self,
+    directory: str | Path,
+    legacy_private_path: str | Path,
+    legacy_public_path: str | Path,
+    max_keys: int = 5,
+    retain_seconds: float = 0.0,
+    alg: str = "RS256",
+    publish_delay: float = 0.0,
+  ):
+    if alg not in SUPPORTED_ALGS:
+      raise ValueError(f"Unsupported signing algorithm: {alg}")
+    self.directory = Path(directory)
+    self.legacy_private_path = Path(legacy_private_path)
+    self.legacy_public_path = Path(legacy_public_path)
+    self.max_keys = max_keys
+    self.retain_seconds = retain_seconds
+    self.alg = alg
+    self.publish_delay = publish_delay
+
+    self.state = _state({}, LEGACY_KID, None)
+    self._mutex = threading.Lock()
+    self._manifest_mtime: float | None = None
+    self._checked_at = 0.0
+
+  @property
+  def manifest_path(self) -> Path:
+    return self.directory / MANIFEST
+
+  @property
+  def keys(self) -> dict[str, KeyEntry]:
+    return self.state.keys
+
+  @property
+  def active_kid(self) -> str:
+    return self.state.active_kid
+
+  @property
+  def next_kid(self) -> str | None:
+    return self.state.next_kid
+
+  @property
+  def jwks_body(self) -> bytes:
+    return self.state.jwks_body
+
+  @property
+  def etag(self) -> str:
+    return self.state.etag
+
+  @property
+  def active(self) -> KeyEntry:
+    return self.state.active
+
+  @property
+  def next(self) -> KeyEntry | None:
+    return self.state.next
+
+  def load(self) -> None:
+    if self.manifest_path.exists():
+      manifest = json.loads(self.manifest_path.read_text())
+      keys = {
+        item["kid"]: _entry(
+          item["kid"],
+          item["path"],
+          _load_private(item["path"]),
+          item["created_at"],
+          item.get("retired_at"),
+          item.get("activate_at"),
+        )
+        for item in manifest["keys"]
+      }
+      state = _state(keys, manifest["active"], manifest.get("next"))
+      mtime = self.manifest_path.stat().st_mtime
+    else:
+      private_key = self._ensure_legacy_pair()
+      keys = {
+        LEGACY_KID: _entry(LEGACY_KID, str(self.legacy_private_path), private_key, time.time())
+      }
+      state = _state(keys, LEGACY_KID, None)
+      mtime = None
+
+    with self._mutex:
+      self.state = _promoted(state, time.time()) or state
+      self._manifest_mtime = mtime
+
+  def ensure_algorithm(self) -> None:
+    """
+    Если активный ключ другого алгоритма (сменили JWT_ALG) — выпустить новый
+    тем же путём, что rotate: до publish_delay подписывает прежний ключ.
+    """
+    if not self._needs_algorithm_key():
+      return
+    with self._lock():
+      # другой воркер (или прошлый запуск) мог успеть раньше
+      self.maybe_reload(force=True)
+      if self._needs_algorithm_key():
+        try:
+          self._rotate()
+        except KeyRingFullError:
+          logger.warning(
+            "JWT_ALG=%s: keyring is full, keep signing with %s", self.alg, self.active.alg
+          )
+
+  def _needs_algorithm_key(self) -> bool:
+    state = self.state
+    pending = state.next
+    return state.active.alg != self.alg and (pending is None or pending.alg != self.alg)
+
+  def maybe_reload(self, force: bool = False) -> None:
+    """Перечитать манифест, если его поменял другой процесс (stat не чаще раза в секунду)."""
+    self._promote(time.time())
+    now = time.monotonic()
+    if not force and now - self._checked_at < 1.0:
+      return
+    self._checked_at = now
+    try:
+      mtime = self.manifest_path.stat().st_mtime
+    except FileNotFoundError:
+      return
+    if mtime != self._manifest_mtime:
+      self.load()
+
+  def get(self, kid: str) -> KeyEntry | None:
+    return self.keys.get(kid)
+
+  def rotate(self) -> KeyEntry:
+    """Выпустить следующий ключ: сразу в JWKS, подписывать начнёт через publish_delay."""
+    with self._lock():
+      self.maybe_reload(force=True)
+      return self._rotate()
+
+  def _promote(self, now: float) -> bool:
+    if _promoted(self.state, now) is None:
+      return False
+    with self._mutex:
+      # под мьютексом заново: ротация могла подменить снимок
+      promoted = _promoted(self.state, now)
+      if promoted is None:
+        return False
+      self.state = promoted
+      return True
+
+  def _rotate(self) -> KeyEntry:
+    # генерация RSA-ключа — самое долгое, мьютекс на это время не держим
+    private_key = _generate(self.alg)
+
+    with self._mutex:
+      now = time.time()
+      state = _promoted(self.state, now) or self.state
+      # незадействованный следующий ключ будет заменён, его не считаем
+      pending = state.next
+      live = [e for e in state.keys.values() if not self._expired(e, now) and e is not pending]
+      if len(live) >= self.max_keys:
+        raise KeyRingFullError("keyring_full")
+
+      kid = f"key-{time.strftime('%Y%m%d%H%M%S', time.gmtime(now))}-{secrets.token_hex(2)}"
+      self.directory.mkdir(parents=True, exist_ok=True)
+      path = self.directory / f"{kid}.pem"
+      path.write_text(_private_pem(private_key))
+      os.chmod(path, 0o600)
+
+      entry = _entry(kid, str(path), private_key, now, activate_at=now + self.publish_delay)
+      # незадействованный следующий ключ просто заменяется: им ещё ничего не подписано
+      keys = {k: e for k, e in state.keys.items() if e is not pending}
+      keys[kid] = entry
+      staged = _state(keys, state.active_kid, kid)
+      staged = _promoted(staged, now) or staged
+
+      # удаляем только ключи, чьи токены уже истекли; лимит max_keys держит проверка выше
+      dropped = [e for e in staged.keys.values() if self._expired(e, now)]
+      if pending is not None:
+        dropped.append(pending)
+      keys = {k: e for k, e in staged.keys.items() if not self._expired(e, now)}
+      new_state = _state(keys, staged.active_kid, staged.next_kid)
+
+      self._write_manifest(new_state)
+      self.state = new_state
+
+    for dropped_entry in dropped:
+      dropped_path = Path(dropped_entry.path)
+      if dropped_path.parent == self.directory:
+        dropped_path.unlink(missing_ok=True)
+    return entry
+
+  @contextlib.contextmanager
+  def _lock(self) -> Iterator[None]:
+    # ротацию между воркерами сериализуем flock-ом рядом с манифестом
+    self.directory.mkdir(parents=True, exist_ok=True)
+    with open(self.directory / ".lock", "w") as fh:
+      fcntl.flock(fh, fcntl.LOCK_EX)
+      try:
+        yield
+      finally:
+        fcntl.flock(fh, fcntl.LOCK_UN)
+
+  def _expired(self, entry: KeyEntry, now: float) -> bool:
+    return entry.retired_at is not None and entry.retired_at + self.retain_seconds < now
+
+  def _write_manifest(self, state: KeyRingState) -> None:
+    payload = {
+      "active": state.active_kid,
+      "next": state.next_kid,
+      "keys": [entry.manifest() for entry in state.keys.values()],
+    }
+    tmp = self.manifest_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, indent=2))
+    tmp.replace(self.manifest_path)
+    self._manifest_mtime = self.manifest_path.stat().st_mtime
+
+  def _ensure_legacy_pair(self) -> Any:
+    priv_path, pub_path = self.legacy_private_path, self.legacy_public_path
+    if priv_path.exists() and pub_path.exists():
+      return _load_private(priv_path)
+
+    priv_path.parent.mkdir(parents=True, exist_ok=True)
+    pub_path.parent.mkdir(parents=True, exist_ok=True)
+    private_key = _generate("RS256")
+    priv_path.write_text(_private_pem(private_key))
+    pub_path.write_text(_public_pem(private_key.public_key()))
+    return private_key
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class PasswordPoolBusyError(RuntimeError):
+  """Очередь на хэширование переполнена — запрос стоит повторить позже."""
+
+
+class _Timing:
+  def __init__(self) -> None:
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+
+  def record(self, seconds: float) -> None:
+    self.count += 1
+    self.total += seconds
+    self.max = max(self.max, seconds)
+
+  def as_dict(self) -> dict:
+    return {
+      "avg_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+      "max_ms": round(self.max * 1000, 3),
+    }
+
+
+class PasswordHasherPool:
+  """
+  Пул потоков для argon2/bcrypt.
+
+  argon2-cffi и bcrypt отпускают GIL на время вычисления, поэтому потоков
+  достаточно, чтобы event loop не простаивал. Одновременно считается не
+  больше workers хэшей, ещё queue_limit запросов ждут своей очереди,
+  остальные сразу получают PasswordPoolBusyError.
+  """
+
+  def __init__(self, workers: int, queue_limit: int):
+    self.workers = max(workers, 1)
+    self.queue_limit = queue_limit
+    self._executor: ThreadPoolExecutor | None = None
+    self._slots: asyncio.Semaphore | None = None
+    self._loop: asyncio.AbstractEventLoop | None = None
+
+    self.in_flight = 0
+    self.waiting = 0
+    self.max_waiting = 0
+    self.completed = 0
+    self.rejected = 0
+    self.wait_time = _Timing()
+    self.hash_time = _Timing()
+
+  async def run(self, fn: Callable[..., T], *args) -> T:
+    loop = asyncio.get_running_loop()
+    if self._loop is not loop:
+      # семафор привязан к event loop, на котором его впервые ждали
+      self._loop = loop
+      self._slots = asyncio.Semaphore(self.workers)
+    if self._executor is None:
+      self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+
+    slots = self._slots
+    if slots.locked() and self.waiting >= self.queue_limit:
+      self.rejected += 1
+      raise PasswordPoolBusyError("password_hashing_busy")
+
+    queued_at = time.perf_counter()
+    self.waiting += 1
+    self.max_waiting = max(self.max_waiting, self.waiting)
+    try:
+      await slots.acquire()
+    finally:
+      self.waiting -= 1
+
+    started = time.perf_counter()
+    self.wait_time.record(started - queued_at)
+    self.in_flight += 1
+    try:
+      return await loop.run_in_executor(self._executor, fn, *args)
+    finally:
+      self.in_flight -= 1
+      self.completed += 1
+      self.hash_time.record(time.perf_counter() - started)
+      slots.release()
+
+  def shutdown(self) -> None:
+    if self._executor is not None:
+      self._executor.shutdown(wait=False, cancel_futures=True)
+      self._executor = None
+
+  def stats(self) -> dict:
+    return {
+      "workers": self.workers,
+      "queue_limit": self.queue_limit,
+      "in_flight": self.in_flight,
+      "queue_depth": self.waiting,
+      "max_queue_depth": self.max_waiting,
+      "completed": self.completed,
+      "rejected": self.rejected,
+      "wait": self.wait_time.as_dict(),
+      "hash": self.hash_time.as_dict(),
+    }
+
+
+password_pool = PasswordHasherPool(
+  workers=settings.password_hash_workers or min(os.cpu_count() or 1, 4),
+  queue_limit=settings.password_hash_queue_limit,
+)
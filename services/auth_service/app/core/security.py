@@ -1,22 +1,15 @@
 from __future__ import annotations
 
-import base64
 import datetime as dt
 import hashlib
+import json
+import logging
 import os
 import re
 from functools import lru_cache
 from pathlib import Path
 
 import jwt
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
-from cryptography.hazmat.primitives.serialization import (
-  Encoding,
-  NoEncryption,
-  PrivateFormat,
-  PublicFormat,
-)
 from jwt import (
   ExpiredSignatureError,
   InvalidSignatureError,
@@ -27,6 +20,10 @@ from passlib.exc import UnknownHashError
 from starlette.responses import Response
 
 from app.core.config import settings
+from app.core.keyring import LEGACY_KID, SUPPORTED_ALGS, KeyRing
+from app.core.password_pool import password_pool
+
+logger = logging.getLogger(__name__)
 
 HEX64_RE = re.compile(r"^[0-9a-f]{64}$")
 
@@ -44,6 +41,24 @@ def _int_from_env_or_settings(env: str, settings_value, default: int) -> int:
   return int(default)
 
 
+def _load_calibrated_argon2() -> dict | None:
+  path = settings.argon2_settings_file
+  if not path or not Path(path).exists():
+    return None
+  try:
+    data = json.loads(Path(path).read_text())
+    return {key: int(data[key]) for key in ("time_cost", "memory_cost", "parallelism") if key in data}
+  except (OSError, ValueError, TypeError, AttributeError) as err:
+    # битый файл не должен ронять логин: берём параметры из env/settings
+    logger.warning("ignoring ARGON2_SETTINGS_FILE %s: %s", path, err)
+    return None
+
+
+def reset_password_context() -> None:
+  """Пересобрать CryptContext, например после новой калибровки argon2."""
+  _pwd_ctx.cache_clear()
+
+
 @lru_cache
 def _pwd_ctx() -> CryptContext:
   scheme = (
@@ -67,6 +82,12 @@ def _pwd_ctx() -> CryptContext:
     getattr(settings, "argon2_parallelism", None),
     2,
   )
+
+  calibrated = _load_calibrated_argon2()
+  if calibrated:
+    a_time = calibrated.get("time_cost", a_time)
+    a_mem = calibrated.get("memory_cost", a_mem)
+    a_par = calibrated.get("parallelism", a_par)
   if scheme == "bcrypt":
     schemes = ["bcrypt", "argon2"]
     deprecated = ["argon2"]
@@ -125,6 +146,14 @@ def verify_password(raw: str, hashed: str) -> bool:
     return False
 
 
+async def hash_password_async(raw: str) -> str:
+  return await password_pool.run(hash_password, raw)
+
+
+async def verify_password_async(raw: str, hashed: str) -> bool:
+  return await password_pool.run(verify_password, raw, hashed)
+
+
 def needs_rehash(hashed: str) -> bool:
   try:
     return _pwd_ctx().needs_update(hashed)
@@ -132,47 +161,52 @@ def needs_rehash(hashed: str) -> bool:
     return True
 
 
-def _ensure_rsa_key_pair() -> tuple[str, str]:
-  if not settings.jwt_private_key_path or not settings.jwt_public_key_path:
-    msg = "RSA key paths must be configured when using RS256"
-    raise RuntimeError(msg)
-
-  priv_path = Path(settings.jwt_private_key_path)
-  pub_path = Path(settings.jwt_public_key_path)
+def _keyring_dir() -> Path:
+  if settings.jwt_keyring_dir:
+    return Path(settings.jwt_keyring_dir)
+  return Path(settings.jwt_private_key_path).parent / "keyring"
 
-  if priv_path.exists() and pub_path.exists():
-    return priv_path.read_text(), pub_path.read_text()
 
-  priv_path.parent.mkdir(parents=True, exist_ok=True)
-  pub_path.parent.mkdir(parents=True, exist_ok=True)
+def _build_keyring() -> KeyRing:
+  if not settings.jwt_private_key_path or not settings.jwt_public_key_path:
+    msg = "Key paths must be configured when using asymmetric algorithms"
+    raise RuntimeError(msg)
 
-  key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-  private_bytes = key.private_bytes(
-    encoding=Encoding.PEM,
-    format=PrivateFormat.TraditionalOpenSSL,
-    encryption_algorithm=NoEncryption(),
+  ring = KeyRing(
+    directory=_keyring_dir(),
+    legacy_private_path=settings.jwt_private_key_path,
+    legacy_public_path=settings.jwt_public_key_path,
+    max_keys=settings.jwt_keyring_max_keys,
+    # выведенный ключ живёт, пока не истекут подписанные им refresh-токены
+    retain_seconds=settings.jwt_refresh_ttl_days * 24 * 3600 + settings.jwt_access_ttl_min * 60,
+    alg=settings.jwt_alg,
+    publish_delay=max(settings.jwt_key_publish_delay, settings.jwks_max_age),
   )
-  public_bytes = key.public_key().public_bytes(
-    encoding=Encoding.PEM,
-    format=PublicFormat.SubjectPublicKeyInfo,
-  )
-
-  priv_path.write_bytes(private_bytes)
-  pub_path.write_bytes(public_bytes)
-
-  return private_bytes.decode(), public_bytes.decode()
+  ring.load()
+  # JWT_ALG сменили: прежний ключ остаётся для проверки, подписываем новым
+  ring.ensure_algorithm()
+  return ring
 
 
-def _read_keys() -> tuple[str, str]:
-  if settings.jwt_alg == "RS256":
-    return _ensure_rsa_key_pair()
+def _read_keys() -> KeyRing | None:
+  if settings.jwt_alg in SUPPORTED_ALGS:
+    return _build_keyring()
   if not settings.jwt_secret:
     msg = "JWT_SECRET must be set when using symmetric algorithms"
     raise RuntimeError(msg)
-  return settings.jwt_secret, settings.jwt_secret
+  return None
 
 
-_private_key, _public_key = _read_keys()
+keyring = _read_keys()
+
+
+def _encode(payload: dict) -> str:
+  if keyring is None:
+    return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_alg)
+
+  keyring.maybe_reload()
+  active = keyring.active
+  return jwt.encode(payload, active.private_key, algorithm=active.alg, headers={"kid": active.kid})
 
 
 def make_access_jwt(subject: str, role: str | None = None) -> str:
@@ -180,13 +214,14 @@ def make_access_jwt(subject: str, role: str | None = None) -> str:
   payload: dict = {
     "iss": settings.jwt_iss,
     "sub": subject,
-    "iat": int(now.timestamp()),
+    # с долями секунды: отзыв сравнивает iat с точным моментом (revocation.watermark)
+    "iat": now.timestamp(),
     "exp": int((now + dt.timedelta(minutes=settings.jwt_access_ttl_min)).timestamp()),
     "type": "access",
   }
   if role:
     payload["role"] = role
-  return jwt.encode(payload, _private_key, algorithm=settings.jwt_alg)
+  return _encode(payload)
 
 
 def make_refresh_jwt(subject: str, jti: str) -> str:
@@ -194,16 +229,27 @@ def make_refresh_jwt(subject: str, jti: str) -> str:
   payload: dict = {
     "iss": settings.jwt_iss,
     "sub": subject,
-    "iat": int(now.timestamp()),
+    "iat": now.timestamp(),
     "exp": int((now + dt.timedelta(days=settings.jwt_refresh_ttl_days)).timestamp()),
     "jti": jti,
     "type": "refresh",
   }
-  return jwt.encode(payload, _private_key, algorithm=settings.jwt_alg)
+  return _encode(payload)
 
 
 def decode_jwt(token: str) -> dict:
-  return jwt.decode(token, _public_key, algorithms=[settings.jwt_alg])
+  if keyring is None:
+    return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
+
+  # токены без kid выпущены до появления связки ключей
+  kid = jwt.get_unverified_header(token).get("kid") or LEGACY_KID
+  entry = keyring.get(kid)
+  if entry is None:
+    keyring.maybe_reload(force=True)
+    entry = keyring.get(kid)
+  if entry is None:
+    raise InvalidTokenError("unknown_kid")
+  return jwt.decode(token, entry.public_key, algorithms=[entry.alg])
 
 
 def verify_access_token(token: str) -> dict:
@@ -248,22 +294,10 @@ def verify_refresh_token(token: str) -> dict:
   return payload
 
 
-def get_public_key_pem() -> str:
-  return _public_key
-
-
-def public_key_to_jwk_components(public_key_pem: str) -> tuple[str, str]:
-  key = serialization.load_pem_public_key(public_key_pem.encode())
-  if not isinstance(key, rsa.RSAPublicKey):
-    raise ValueError("Public key must be RSA")
-  numbers = key.public_numbers()
-  n_bytes = numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, "big")
-  e_bytes = numbers.e.to_bytes((numbers.e.bit_length() + 7) // 8, "big")
-  n = base64.urlsafe_b64encode(n_bytes).rstrip(b"=").decode()
-  e = base64.urlsafe_b64encode(e_bytes).rstrip(b"=").decode()
-  return n, e
+def get_keyring() -> KeyRing | None:
+  return keyring
 
 
 def ensure_keys_ready() -> None:
-  global _private_key, _public_key
-  _private_key, _public_key = _read_keys()
+  global keyring
+  keyring = _read_keys()
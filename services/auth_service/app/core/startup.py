@@ -1,14 +1,14 @@
 import logging
 
 from fastapi import FastAPI
+from learning_platform_common.logging import setup_logging
 
 from app.common.db.session import SessionLocal
-from app.core.logging import setup_logging
 from app.core.security import ensure_keys_ready
 
 
 def register_startup(app: FastAPI) -> None:
-  setup_logging()
+  setup_logging("auth_service")
 
   @app.on_event("startup")
   async def _on_startup():
@@ -1,20 +1,19 @@
 from __future__ import annotations
 
 import uuid
-from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Annotated
 
 from fastapi import Depends, FastAPI, HTTPException, Request
+from learning_platform_common.logging import RequestContextMiddleware, update_request_context
 from learning_platform_common.utils import ResponseUtils
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
 from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.common.db.session import SessionLocal
 from app.core.security import TokenError, verify_access_token
-from app.modules.users.models import User
+from app.modules.users.status_cache import load_user_status, user_status_cache
 
 PUBLIC_PATHS = {
   "/",
@@ -26,6 +25,8 @@ PUBLIC_PATHS = {
   "/auth/register",
   "/auth/refresh",
   "/auth/.well-known/jwks.json",
+  # сервисная лента: защищена своим заголовком с REVOCATION_FEED_TOKEN
+  "/auth/revocations",
 }
 
 PUBLIC_GET_PATHS = {
@@ -50,52 +51,85 @@ def _is_public(path: str, method: str) -> bool:
   return False
 
 
-def _extract_bearer_token(request: Request) -> str | None:
-  auth_header = request.headers.get("authorization")
+def _extract_bearer_token(conn: HTTPConnection) -> str | None:
+  auth_header = conn.headers.get("authorization")
   if auth_header and auth_header.lower().startswith("bearer "):
     return auth_header.split(" ", 1)[1].strip()
-  return request.cookies.get("access_token")
+  return conn.cookies.get("access_token")
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-  async def dispatch(
-    self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-  ) -> Response:
-    path = _normalize_path(request.url.path)
-    if _is_public(path, request.method.upper()):
-      return await call_next(request)
+def _deny(message: str, status_code: int = 401) -> JSONResponse:
+  return JSONResponse(ResponseUtils.error(message), status_code=status_code)
 
-    token = _extract_bearer_token(request)
-    if not token:
-      return JSONResponse(ResponseUtils.error("access_required"), status_code=401)
 
-    try:
-      claims = verify_access_token(token)
-    except TokenError as exc:
-      return JSONResponse(ResponseUtils.error(str(exc)), status_code=401)
+async def authenticate(conn: HTTPConnection) -> Response | None:
+  """
+  Проверить запрос и заполнить conn.state; вернуть ответ-отказ или None.
 
-    try:
-      user_id = uuid.UUID(claims.get("sub", ""))
-    except (TypeError, ValueError):
-      return JSONResponse(ResponseUtils.error("invalid_subject"), status_code=401)
+  state пишется в scope["state"], так что request.state в ручках видит
+  те же auth_user_id / auth_user_role / auth_token / auth_claims.
+  """
+  token = _extract_bearer_token(conn)
+  if not token:
+    return _deny("access_required")
 
+  try:
+    claims = verify_access_token(token)
+  except TokenError as exc:
+    return _deny(str(exc))
+
+  try:
+    user_id = uuid.UUID(claims.get("sub", ""))
+  except (TypeError, ValueError):
+    return _deny("invalid_subject")
+
+  user = user_status_cache.get(user_id)
+  if user is None:
     async with SessionLocal() as db:
-      user = await db.scalar(
-        select(User).options(selectinload(User.role)).where(User.id == user_id)
-      )
+      user = await load_user_status(db, user_id)
+    if user is not None:
+      user_status_cache.set(user)
+
+  if not user or not user.is_active:
+    return _deny("user_inactive")
+
+  if not user.role_slug:
+    return _deny("role_not_configured", status_code=500)
+
+  if user.not_before is not None and claims.get("iat", 0) < user.not_before:
+    return _deny("token_revoked")
+
+  conn.state.auth_user_id = user.user_id
+  conn.state.auth_user_role = user.role_slug
+  conn.state.auth_token = token
+  conn.state.auth_claims = claims
+  update_request_context(user_id=str(user.user_id))
+  return None
+
+
+class AuthMiddleware:
+  """
+  Чистый ASGI-middleware: без BaseHTTPMiddleware нет лишних задач и
+  memory-stream на каждый запрос, а ответы (в т.ч. стриминговые) идут
+  в send напрямую.
+  """
 
-    if not user or not user.is_active:
-      return JSONResponse(ResponseUtils.error("user_inactive"), status_code=401)
+  def __init__(self, app: ASGIApp):
+    self.app = app
 
-    if not user.role:
-      return JSONResponse(ResponseUtils.error("role_not_configured"), status_code=500)
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
 
-    request.state.auth_user_id = user.id
-    request.state.auth_user_role = user.role.slug
-    request.state.auth_token = token
-    request.state.auth_claims = claims
+    path = _normalize_path(scope["path"])
+    if not _is_public(path, scope["method"].upper()):
+      denied = await authenticate(HTTPConnection(scope))
+      if denied is not None:
+        await denied(scope, receive, send)
+        return
 
-    return await call_next(request)
+    await self.app(scope, receive, send)
 
 
 @dataclass
@@ -125,3 +159,5 @@ def require_roles(*roles: str):
 
 def setup_auth_middleware(app: FastAPI) -> None:
   app.add_middleware(AuthMiddleware)
+  # добавлен последним => внешний: контекст логов есть и у отказов авторизации
+  app.add_middleware(RequestContextMiddleware)
@@ -5,7 +5,17 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, func
+from sqlalchemy import (
+  BigInteger,
+  DateTime,
+  ForeignKey,
+  Index,
+  Sequence,
+  String,
+  UniqueConstraint,
+  func,
+  text,
+)
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,16 +37,45 @@ class RefreshToken(Base):
   user_id: Mapped[uuid.UUID] = mapped_column(
     ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
   )
-  token_hash: Mapped[str] = mapped_column(String(255), nullable=False)
+  token_hash: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
   fingerprint: Mapped[str | None] = mapped_column(String(255), nullable=True)
   user_agent: Mapped[str | None] = mapped_column(String(255), nullable=True)
   created_at: Mapped[datetime] = mapped_column(
     DateTime(timezone=True), server_default=func.now(), nullable=False
   )
-  expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+  expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
   revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
   replaced_by: Mapped[uuid.UUID | None] = mapped_column(PGUUID(as_uuid=True))
 
   user: Mapped[User] = relationship("User", back_populates="refresh_tokens")
 
-  __table_args__ = (UniqueConstraint("user_id", "token_hash", name="uq_refreshtoken_user_token"),)
+  __table_args__ = (
+    UniqueConstraint("user_id", "token_hash", name="uq_refreshtoken_user_token"),
+    Index(
+      "ix_refresh_tokens_revoked_at",
+      "revoked_at",
+      postgresql_where=text("revoked_at IS NOT NULL"),
+    ),
+  )
+
+
+revocation_seq = Sequence("token_revocations_seq")
+
+
+class TokenRevocation(Base):
+  """
+  Водяной знак отзыва: access-токены пользователя с iat < not_before недействительны.
+
+  Одна строка на пользователя (без FK — отзыв должен пережить удаление
+  пользователя); seq растёт при каждом обновлении и служит курсором ленты.
+  """
+
+  __tablename__ = "token_revocations"
+
+  user_id: Mapped[uuid.UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+  not_before: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+  seq: Mapped[int] = mapped_column(
+    BigInteger, revocation_seq, server_default=revocation_seq.next_value(), nullable=False
+  )
+
+  __table_args__ = (Index("ix_token_revocations_seq", "seq", unique=True),)
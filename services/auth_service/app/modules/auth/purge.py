@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import logging
+import time
+
+from sqlalchemy import delete, or_, select, text
+
+from app.common.db.session import SessionLocal
+from app.core.config import settings
+from app.modules.auth.models import RefreshToken
+from app.modules.auth.revocation import prune_statement
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshTokenPurgeWorker:
+  """
+  Фоновая чистка refresh_tokens от истёкших и отозванных записей.
+
+  Каждый логин добавляет строку, а старые никто не удалял. Воркер раз в
+  `interval` секунд удаляет строки пачками по `batch_size`, каждая пачка —
+  отдельная короткая транзакция. Кандидаты выбираются с `FOR UPDATE SKIP
+  LOCKED`, поэтому воркеры разных процессов не ждут друг друга и не мешают
+  /auth/refresh. Между пачками пауза `throttle` — чтобы не забивать диск и
+  реплику при первом проходе по накопленному хвосту. Заодно удаляются
+  водяные знаки отзыва старше ttl access-токена.
+  """
+
+  def __init__(
+    self,
+    interval: float = 3600.0,
+    batch_size: int = 1000,
+    throttle: float = 0.1,
+    grace: dt.timedelta = dt.timedelta(days=1),
+  ):
+    self.interval = interval
+    self.batch_size = batch_size
+    self.throttle = throttle
+    self.grace = grace
+    self._task: asyncio.Task | None = None
+
+    self.runs = 0
+    self.batches = 0
+    self.purged = 0
+    self.revocations_pruned = 0
+    self.failed = 0
+    self.last_run_at: float | None = None
+    self.last_run_purged = 0
+    self.last_run_seconds = 0.0
+
+  def start(self) -> None:
+    loop = asyncio.get_running_loop()
+    if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+      self._task = loop.create_task(self._run())
+
+  async def stop(self) -> None:
+    if self._task is not None and not self._task.done():
+      self._task.cancel()
+      with contextlib.suppress(asyncio.CancelledError):
+        await self._task
+    self._task = None
+
+  async def _run(self) -> None:
+    while True:
+      try:
+        await self.purge()
+        await self.prune_revocations()
+      except Exception:
+        self.failed += 1
+        logger.exception("Refresh token purge failed")
+      await asyncio.sleep(self.interval)
+
+  def purge_statement(self, now: dt.datetime):
+    # истёкшие и отозванные раньше now - grace; отозванные недавно держим для разбора инцидентов
+    cutoff = now - self.grace
+    candidates = (
+      select(RefreshToken.id)
+      .where(or_(RefreshToken.expires_at < cutoff, RefreshToken.revoked_at < cutoff))
+      .limit(self.batch_size)
+      .with_for_update(skip_locked=True)
+    )
+    return (
+      delete(RefreshToken)
+      .where(RefreshToken.id.in_(candidates.scalar_subquery()))
+      .execution_options(synchronize_session=False)
+    )
+
+  async def purge_batch(self, now: dt.datetime) -> int:
+    async with SessionLocal() as db:
+      result = await db.execute(self.purge_statement(now))
+      await db.commit()
+    return result.rowcount or 0
+
+  async def purge(self) -> int:
+    """Один проход: пачки, пока очередная не окажется неполной."""
+    started = time.monotonic()
+    now = dt.datetime.now(dt.UTC)
+    total = 0
+    while True:
+      deleted = await self.purge_batch(now)
+      self.batches += 1
+      total += deleted
+      self.purged += deleted
+      if deleted < self.batch_size:
+        break
+      await asyncio.sleep(self.throttle)
+
+    self.runs += 1
+    self.last_run_at = time.time()
+    self.last_run_purged = total
+    self.last_run_seconds = round(time.monotonic() - started, 3)
+    if total:
+      logger.info("Purged %s refresh tokens in %ss", total, self.last_run_seconds)
+    return total
+
+  async def prune_revocations(self) -> int:
+    async with SessionLocal() as db:
+      result = await db.execute(prune_statement(dt.datetime.now(dt.UTC)))
+      await db.commit()
+    deleted = result.rowcount or 0
+    self.revocations_pruned += deleted
+    return deleted
+
+  def stats(self) -> dict:
+    return {
+      "running": self._task is not None and not self._task.done(),
+      "interval_seconds": self.interval,
+      "batch_size": self.batch_size,
+      "throttle_seconds": self.throttle,
+      "grace_seconds": self.grace.total_seconds(),
+      "runs": self.runs,
+      "batches": self.batches,
+      "purged": self.purged,
+      "failed": self.failed,
+      "revocations_pruned": self.revocations_pruned,
+      "last_run_at": self.last_run_at,
+      "last_run_purged": self.last_run_purged,
+      "last_run_seconds": self.last_run_seconds,
+    }
+
+
+async def refresh_tokens_table_stats(db) -> dict:
+  # оценки из каталога: count(*) по большой таблице сам по себе дорогой
+  row = (
+    await db.execute(
+      text(
+        "SELECT c.reltuples::bigint AS estimated_rows,"
+        " pg_total_relation_size(c.oid) AS total_bytes,"
+        " pg_relation_size(c.oid) AS table_bytes"
+        " FROM pg_class c WHERE c.oid = 'refresh_tokens'::regclass"
+      )
+    )
+  ).one()
+  return {
+    "estimated_rows": max(row.estimated_rows, 0),
+    "total_bytes": row.total_bytes,
+    "table_bytes": row.table_bytes,
+  }
+
+
+async def start_refresh_purge() -> None:
+  if settings.refresh_purge_enabled:
+    refresh_purge_worker.start()
+
+
+refresh_purge_worker = RefreshTokenPurgeWorker(
+  interval=settings.refresh_purge_interval,
+  batch_size=settings.refresh_purge_batch_size,
+  throttle=settings.refresh_purge_throttle_ms / 1000,
+  grace=dt.timedelta(hours=settings.refresh_purge_grace_hours),
+)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+
+from sqlalchemy import func, select, update
+
+from app.common.db.session import SessionLocal
+from app.core.security import _pwd_ctx, hash_password_async, needs_rehash
+from app.modules.users.models import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _RehashJob:
+  user_id: uuid.UUID
+  raw_password: str
+  old_hash: str
+
+
+class PasswordRehashWorker:
+  """
+  Фоновое обновление устаревших хэшей паролей при входе.
+
+  login кладёт задачу в ограниченную очередь и сразу отвечает; воркер
+  считает новый хэш в пуле хэширования и пишет его условным UPDATE
+  (`WHERE hashed_password = <старый хэш>`), поэтому параллельная смена
+  пароля никогда не затирается.
+  """
+
+  def __init__(self, queue_size: int = 1000):
+    self.queue_size = queue_size
+    self._queue: asyncio.Queue[_RehashJob] | None = None
+    self._task: asyncio.Task | None = None
+
+    self.queued = 0
+    self.upgraded = 0
+    self.conflicts = 0
+    self.failed = 0
+    self.dropped = 0
+
+  def submit(self, user_id: uuid.UUID, raw_password: str, old_hash: str) -> bool:
+    if not needs_rehash(old_hash):
+      return False
+
+    self._ensure_started()
+    try:
+      self._queue.put_nowait(_RehashJob(user_id, raw_password, old_hash))
+    except asyncio.QueueFull:
+      # не страшно: пользователь обновится при следующем входе
+      self.dropped += 1
+      return False
+    self.queued += 1
+    return True
+
+  async def stop(self) -> None:
+    if self._task is not None and not self._task.done():
+      self._task.cancel()
+      with contextlib.suppress(asyncio.CancelledError):
+        await self._task
+    self._task = None
+    self._queue = None
+
+  async def drain(self) -> None:
+    if self._queue is not None:
+      await self._queue.join()
+
+  def _ensure_started(self) -> None:
+    loop = asyncio.get_running_loop()
+    if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+      self._queue = asyncio.Queue(maxsize=self.queue_size)
+      self._task = loop.create_task(self._run(self._queue))
+
+  async def _run(self, queue: asyncio.Queue[_RehashJob]) -> None:
+    while True:
+      job = await queue.get()
+      try:
+        await self._process(job)
+      except Exception:
+        self.failed += 1
+        logger.exception("Password rehash failed for user %s", job.user_id)
+      finally:
+        queue.task_done()
+
+  async def _process(self, job: _RehashJob) -> None:
+    new_hash = await hash_password_async(job.raw_password)
+
+    async with SessionLocal() as db:
+      result = await db.execute(
+        update(User)
+        .where(User.id == job.user_id, User.hashed_password == job.old_hash)
+        .values(hashed_password=new_hash)
+        .execution_options(synchronize_session=False)
+      )
+      await db.commit()
+
+    if result.rowcount == 1:
+      self.upgraded += 1
+    else:
+      self.conflicts += 1
+
+  def stats(self) -> dict:
+    return {
+      "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+      "queue_size": self.queue_size,
+      "queued": self.queued,
+      "upgraded": self.upgraded,
+      "conflicts": self.conflicts,
+      "failed": self.failed,
+      "dropped": self.dropped,
+    }
+
+
+def current_hash_prefix() -> str:
+  """Префикс хэша с актуальными параметрами, например `$argon2id$v=19$m=65536,t=3,p=2$`."""
+  return _hash_prefix(_pwd_ctx())
+
+
+@lru_cache(maxsize=4)
+def _hash_prefix(ctx) -> str:
+  sample = ctx.hash("calibration")
+  parts = sample.split("$")
+  keep = 4 if parts[1].startswith("argon2") else 3
+  return "$".join(parts[:keep]) + "$"
+
+
+async def rehash_progress(db) -> dict:
+  prefix = current_hash_prefix()
+  total = await db.scalar(select(func.count()).select_from(User))
+  current = await db.scalar(
+    select(func.count()).select_from(User).where(User.hashed_password.startswith(prefix))
+  )
+  total = total or 0
+  current = current or 0
+  return {
+    "target_prefix": prefix,
+    "total_users": total,
+    "up_to_date": current,
+    "outdated": total - current,
+    "percent_done": round(current / total * 100, 2) if total else 100.0,
+  }
+
+
+rehash_worker = PasswordRehashWorker()
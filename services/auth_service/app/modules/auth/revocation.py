@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.auth.models import TokenRevocation, revocation_seq
+
+
+def access_ttl() -> dt.timedelta:
+  return dt.timedelta(minutes=settings.jwt_access_ttl_min)
+
+
+def watermark(at: dt.datetime) -> float:
+  """
+  not_before в секундах с долями: сравнивается с iat токена (iat < not_before).
+
+  iat выдаётся с той же точностью, поэтому токен, выпущенный до отзыва,
+  отсекается, а повторный вход сразу после отзыва — даже в ту же секунду —
+  проходит.
+  """
+  return at.timestamp()
+
+
+def revoke_statement(user_id: uuid.UUID, at: dt.datetime):
+  stmt = insert(TokenRevocation).values(user_id=user_id, not_before=at)
+  return stmt.on_conflict_do_update(
+    index_elements=[TokenRevocation.user_id],
+    set_={
+      # водяной знак только растёт; seq обновляется всегда, чтобы запись снова попала в ленту
+      "not_before": func.greatest(TokenRevocation.not_before, stmt.excluded.not_before),
+      "seq": revocation_seq.next_value(),
+    },
+  )
+
+
+async def revoke_user_tokens(
+  db: AsyncSession, user_id: uuid.UUID, at: dt.datetime | None = None
+) -> None:
+  """Отозвать все access-токены пользователя, выданные до `at`. commit — за вызывающим."""
+  await db.execute(revoke_statement(user_id, at or dt.datetime.now(dt.UTC)))
+
+
+def feed_statement(since: int, limit: int, now: dt.datetime):
+  # записи старше ttl access-токена никого уже не отсекают — в ленту их не отдаём
+  return (
+    select(TokenRevocation.user_id, TokenRevocation.not_before, TokenRevocation.seq)
+    .where(TokenRevocation.seq > since)
+    .where(TokenRevocation.not_before > now - access_ttl())
+    .order_by(TokenRevocation.seq)
+    .limit(limit + 1)
+  )
+
+
+async def revocation_feed(db: AsyncSession, since: int, limit: int) -> dict:
+  rows = (await db.execute(feed_statement(since, limit, dt.datetime.now(dt.UTC)))).all()
+  has_more = len(rows) > limit
+  rows = rows[:limit]
+  return {
+    "entries": [
+      {"user_id": str(row.user_id), "not_before": watermark(row.not_before)} for row in rows
+    ],
+    "cursor": rows[-1].seq if rows else since,
+    "has_more": has_more,
+    "ttl": int(access_ttl().total_seconds()),
+  }
+
+
+def prune_statement(now: dt.datetime):
+  return delete(TokenRevocation).where(TokenRevocation.not_before < now - access_ttl())
@@ -1,9 +1,12 @@
+import asyncio
 import datetime as dt
 import hashlib
+import hmac
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from learning_platform_common.http import etag_matches
 from learning_platform_common.utils import ResponseUtils
 from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
@@ -12,23 +15,26 @@ from sqlalchemy.orm import selectinload
 
 from app.common.db.session import get_db
 from app.core.config import settings
+from app.core.keyring import KeyRingFullError
 from app.core.security import (
   TokenError,
-  get_public_key_pem,
-  hash_password,
+  get_keyring,
+  hash_password_async,
   make_access_jwt,
   make_refresh_jwt,
-  public_key_to_jwk_components,
   set_token_cookies,
-  verify_password,
+  verify_password_async,
   verify_refresh_token,
 )
-from app.middleware.auth import AuthContext, current_auth
+from app.middleware.auth import AuthContext, current_auth, require_roles
 from app.modules.auth.models import RefreshToken
+from app.modules.auth.rehash import rehash_worker
+from app.modules.auth.revocation import revocation_feed, revoke_user_tokens
 from app.modules.auth.schemas import ChangePasswordRequest, LoginRequest, RefreshRequest
-from app.modules.roles.models import Role
+from app.modules.roles.catalog import role_catalog
 from app.modules.users.models import User, UserProfile
 from app.modules.users.schemas import UserOut, UserRegisterRequest
+from app.modules.users.status_cache import user_status_cache
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
@@ -39,14 +45,14 @@ def _hash_refresh_token(raw: str) -> str:
   return hashlib.sha256(raw.encode()).hexdigest()
 
 
-async def _get_role_or_error(db: DbSession, slug: str) -> Role:
-  role = await db.scalar(select(Role).where(Role.slug == slug))
-  if not role:
+async def _get_role_id_or_error(db: DbSession, slug: str) -> uuid.UUID:
+  role_id = await role_catalog.role_id(db, slug)
+  if not role_id:
     raise HTTPException(
       status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
       detail="role_not_configured",
     )
-  return role
+  return role_id
 
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
@@ -58,13 +64,13 @@ async def register_user(
   if existing_user:
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="username_taken")
 
-  default_role = await _get_role_or_error(db, "student")
+  default_role_id = await _get_role_id_or_error(db, "student")
 
   user = User(
     username=payload.username,
     email=payload.email,
-    hashed_password=hash_password(payload.password),
-    role=default_role,
+    hashed_password=await hash_password_async(payload.password),
+    role_id=default_role_id,
   )
   profile = UserProfile(
     user=user,
@@ -102,7 +108,7 @@ async def login(
   user = await db.scalar(
     select(User).options(selectinload(User.role)).where(User.username == payload.username)
   )
-  if not user or not verify_password(payload.password, user.hashed_password):
+  if not user or not await verify_password_async(payload.password, user.hashed_password):
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="invalid_credentials")
 
   if not user.role:
@@ -130,6 +136,9 @@ async def login(
 
   await db.commit()
 
+  # устаревший хэш обновляем в фоне, ответ не ждёт argon2
+  rehash_worker.submit(user.id, payload.password, user.hashed_password)
+
   set_token_cookies(response, access_token, refresh_token)
 
   return ResponseUtils.success(
@@ -248,13 +257,13 @@ async def change_password(
   if not user or not user.is_active:
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="user_inactive")
 
-  if not verify_password(payload.current_password, user.hashed_password):
+  if not await verify_password_async(payload.current_password, user.hashed_password):
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="wrong_password")
 
   if payload.current_password == payload.new_password:
     raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="password_same")
 
-  user.hashed_password = hash_password(payload.new_password)
+  user.hashed_password = await hash_password_async(payload.new_password)
   user.must_change_password = False
 
   now = dt.datetime.now(dt.UTC)
@@ -264,29 +273,75 @@ async def change_password(
     .where(RefreshToken.revoked_at.is_(None))
     .values(revoked_at=now)
   )
+  # access-токены живут до exp — публикуем водяной знак для courses/progress
+  await revoke_user_tokens(db, user.id, now)
 
   await db.commit()
+  user_status_cache.invalidate_user(user.id)
 
   return ResponseUtils.success(message="password_changed")
 
 
 @router.get("/.well-known/jwks.json")
-async def jwks():
-  if settings.jwt_alg != "RS256":
+async def jwks(request: Request):
+  ring = get_keyring()
+  if ring is None:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="jwks_not_available")
 
-  public_key = get_public_key_pem()
-  n, e = public_key_to_jwk_components(public_key)
-
-  return {
-    "keys": [
-      {
-        "kty": "RSA",
-        "use": "sig",
-        "kid": "main-key-1",
-        "alg": "RS256",
-        "n": n,
-        "e": e,
-      }
-    ]
+  ring.maybe_reload()
+  # один снимок: тело и ETag всегда от одного состояния, даже если ротация идёт в потоке
+  state = ring.state
+  headers = {
+    "ETag": state.etag,
+    "Cache-Control": f"public, max-age={settings.jwks_max_age}",
   }
+  if etag_matches(request, state.etag):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+  return Response(content=state.jwks_body, media_type="application/json", headers=headers)
+
+
+@router.get("/revocations")
+async def revocations(
+  request: Request,
+  response: Response,
+  db: DbSession,
+  since: Annotated[int, Query(ge=0)] = 0,
+  limit: Annotated[int, Query(ge=1, le=5000)] = 1000,
+):
+  """
+  Лента отзыва: access-токены user_id с iat < not_before недействительны.
+
+  Сервисы-потребители опрашивают её с since=<cursor прошлого ответа> и держат
+  карту user_id -> not_before в памяти; since=0 отдаёт всё, что ещё актуально
+  (не старше ttl access-токена).
+  """
+  # путь публичный для JWT, поэтому без настроенного токена ленту не отдаём никому
+  expected = settings.revocation_feed_token
+  if not expected or not hmac.compare_digest(request.headers.get("x-feed-token", ""), expected):
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="feed_forbidden")
+
+  response.headers["Cache-Control"] = "no-store"
+  return ResponseUtils.success(**await revocation_feed(db, since, limit))
+
+
+@router.post("/keys/rotate", dependencies=[Depends(require_roles("admin"))])
+async def rotate_signing_key():
+  ring = get_keyring()
+  if ring is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="jwks_not_available")
+
+  try:
+    # генерация ключа, flock и запись файлов — вне event loop
+    entry = await asyncio.to_thread(ring.rotate)
+  except KeyRingFullError as err:
+    # все ключи ещё проверяют живые токены — удаление любого разлогинит пользователей
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="keyring_full") from err
+  state = ring.state
+  return ResponseUtils.success(
+    message="key_rotated",
+    active_kid=state.active_kid,
+    next_kid=state.next_kid,
+    activate_at=entry.activate_at,
+    kids=list(state.keys),
+  )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import uuid
+
+from learning_platform_common.utils import ResponseUtils
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.roles.models import Role
+from app.modules.roles.schemas import RoleOut
+
+
+class RoleCatalog:
+  """
+  Каталог ролей в памяти процесса.
+
+  Хранит готовое тело ответа GET /roles и его strong ETag, а также
+  slug -> id для регистрации. Ручки CRUD ролей сбрасывают каталог после
+  commit; ttl ограничивает расхождение между воркерами, которые о чужом
+  изменении не узнают.
+  """
+
+  def __init__(self, ttl: float):
+    self.ttl = ttl
+    self.body: bytes = b""
+    self.etag: str = ""
+    self._ids: dict[str, uuid.UUID] = {}
+    self._expires_at = 0.0
+    self.loads = 0
+    self.hits = 0
+
+  @property
+  def is_fresh(self) -> bool:
+    return time.monotonic() < self._expires_at
+
+  async def ensure(self, db: AsyncSession) -> RoleCatalog:
+    if self.is_fresh:
+      self.hits += 1
+      return self
+
+    roles = (await db.scalars(select(Role).order_by(Role.slug))).all()
+    payload = ResponseUtils.success(
+      total=len(roles),
+      roles=[serialize_role(role) for role in roles],
+    )
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+    self.body = body
+    self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    self._ids = {role.slug: role.id for role in roles}
+    self._expires_at = time.monotonic() + self.ttl
+    self.loads += 1
+    return self
+
+  async def role_id(self, db: AsyncSession, slug: str) -> uuid.UUID | None:
+    await self.ensure(db)
+    return self._ids.get(slug)
+
+  def invalidate(self) -> None:
+    self._expires_at = 0.0
+
+  def stats(self) -> dict:
+    return {
+      "ttl_seconds": self.ttl,
+      "fresh": self.is_fresh,
+      "roles": len(self._ids),
+      "etag": self.etag,
+      "loads": self.loads,
+      "hits": self.hits,
+    }
+
+
+def serialize_role(role: Role) -> dict:
+  # mode="json": каталог сам сериализует тело в байты
+  return RoleOut(
+    id=str(role.id),
+    slug=role.slug,
+    name=role.name,
+    description=role.description,
+    is_system=role.is_system,
+    created_at=role.created_at,
+    updated_at=role.updated_at,
+  ).model_dump(mode="json")
+
+
+role_catalog = RoleCatalog(ttl=settings.role_catalog_ttl)
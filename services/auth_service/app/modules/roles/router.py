@@ -3,7 +3,8 @@ from __future__ import annotations
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from learning_platform_common.http import etag_matches
 from learning_platform_common.utils import ResponseUtils
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
@@ -11,27 +12,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.db.session import get_db
 from app.middleware.auth import require_roles
+from app.modules.roles.catalog import role_catalog, serialize_role
 from app.modules.roles.models import Role
-from app.modules.roles.schemas import RoleCreate, RoleOut, RoleUpdate
+from app.modules.roles.schemas import RoleCreate, RoleUpdate
 from app.modules.users.models import User
+from app.modules.users.status_cache import user_status_cache
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 router = APIRouter()
 
 
-def _serialize_role(role: Role) -> dict:
-  return RoleOut(
-    id=str(role.id),
-    slug=role.slug,
-    name=role.name,
-    description=role.description,
-    is_system=role.is_system,
-    created_at=role.created_at,
-    updated_at=role.updated_at,
-  ).model_dump()
-
-
 def _parse_uuid(role_id: str) -> uuid.UUID:
   try:
     return uuid.UUID(role_id)
@@ -44,13 +35,16 @@ def _get_slug(value: str | None) -> str | None:
 
 
 @router.get("/")
-async def list_roles(db: DbSession):
-  result = await db.scalars(select(Role).order_by(Role.slug))
-  roles = result.all()
-  return ResponseUtils.success(
-    total=len(roles),
-    roles=[_serialize_role(role) for role in roles],
-  )
+async def list_roles(request: Request, db: DbSession):
+  catalog = await role_catalog.ensure(db)
+  headers = {
+    "ETag": catalog.etag,
+    # каталог меняется ручками CRUD — клиент каждый раз сверяет ETag
+    "Cache-Control": "private, no-cache",
+  }
+  if etag_matches(request, catalog.etag):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+  return Response(content=catalog.body, media_type="application/json", headers=headers)
 
 
 @router.post(
@@ -71,8 +65,9 @@ async def create_role(payload: RoleCreate, db: DbSession):
     await db.rollback()
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="role_exists") from exc
 
+  role_catalog.invalidate()
   await db.refresh(role)
-  return ResponseUtils.success(role=_serialize_role(role))
+  return ResponseUtils.success(role=serialize_role(role))
 
 
 async def _get_role_or_404(role_id: str, db: DbSession) -> Role:
@@ -86,7 +81,7 @@ async def _get_role_or_404(role_id: str, db: DbSession) -> Role:
 @router.get("/{role_id}")
 async def get_role(role_id: str, db: DbSession):
   role = await _get_role_or_404(role_id, db)
-  return ResponseUtils.success(role=_serialize_role(role))
+  return ResponseUtils.success(role=serialize_role(role))
 
 
 @router.patch("/{role_id}", dependencies=[Depends(require_roles("admin"))])
@@ -108,8 +103,10 @@ async def update_role(role_id: str, payload: RoleUpdate, db: DbSession):
     await db.rollback()
     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="role_exists") from exc
 
+  user_status_cache.invalidate_role(role.id)
+  role_catalog.invalidate()
   await db.refresh(role)
-  return ResponseUtils.success(role=_serialize_role(role))
+  return ResponseUtils.success(role=serialize_role(role))
 
 
 @router.delete("/{role_id}", dependencies=[Depends(require_roles("admin"))])
@@ -127,4 +124,6 @@ async def delete_role(role_id: str, db: DbSession):
 
   await db.delete(role)
   await db.commit()
+  user_status_cache.invalidate_role(role.id)
+  role_catalog.invalidate()
   return ResponseUtils.success(message="role_deleted")
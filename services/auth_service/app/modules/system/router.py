@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from learning_platform_common.logging import logging_stats
+from learning_platform_common.utils import ResponseUtils
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.db.session import get_db, pool_stats
+from app.core.password_pool import password_pool
+from app.middleware.auth import require_roles
+from app.modules.auth.purge import refresh_purge_worker, refresh_tokens_table_stats
+from app.modules.auth.rehash import rehash_progress, rehash_worker
+from app.modules.roles.catalog import role_catalog
+from app.modules.users.status_cache import user_status_cache
+
+router = APIRouter()
+
+
+@router.get("/db-pool", dependencies=[Depends(require_roles("admin"))])
+async def db_pool_stats():
+  return ResponseUtils.success(pool=pool_stats())
+
+
+@router.get("/user-status-cache", dependencies=[Depends(require_roles("admin"))])
+async def user_status_cache_stats():
+  return ResponseUtils.success(cache=user_status_cache.stats())
+
+
+@router.get("/password-hashing", dependencies=[Depends(require_roles("admin"))])
+async def password_hashing_stats():
+  return ResponseUtils.success(hashing=password_pool.stats())
+
+
+@router.get("/password-rehash", dependencies=[Depends(require_roles("admin"))])
+async def password_rehash_stats(db: Annotated[AsyncSession, Depends(get_db)]):
+  return ResponseUtils.success(
+    worker=rehash_worker.stats(),
+    progress=await rehash_progress(db),
+  )
+
+
+@router.get("/refresh-tokens", dependencies=[Depends(require_roles("admin"))])
+async def refresh_tokens_stats(db: Annotated[AsyncSession, Depends(get_db)]):
+  return ResponseUtils.success(
+    purge=refresh_purge_worker.stats(),
+    table=await refresh_tokens_table_stats(db),
+  )
+
+
+@router.get("/role-catalog", dependencies=[Depends(require_roles("admin"))])
+async def role_catalog_stats():
+  return ResponseUtils.success(catalog=role_catalog.stats())
+
+
+@router.get("/logging", dependencies=[Depends(require_roles("admin"))])
+async def logging_queue_stats():
+  return ResponseUtils.success(logging=logging_stats())
@@ -0,0 +1,358 @@
+"""
+Массовый импорт пользователей (CSV / NDJSON).
+
+Вход читается потоком и обрабатывается пачками по batch_size строк; на
+пачку — один SELECT уже занятых username, параллельное хэширование паролей
+через общий password_pool (импорт занимает не больше hash_workers его
+потоков, остальные остаются логину) и два многострочных INSERT (users ...
+ON CONFLICT DO NOTHING RETURNING и user_profiles) в одной транзакции.
+Ошибка пачки откатывает только её: строки пачки получают статус failed,
+импорт идёт дальше. На каждую строку входа в отчёт попадает статус:
+created / exists / duplicate / invalid / failed.
+
+CLI (из services/auth_service):
+    PYTHONPATH=.:../../shared python -m app.modules.users.bulk_import cohort.csv --report out.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import time
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel, EmailStr, Field, ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.db.session import SessionLocal
+from app.core.config import settings
+from app.core.password_pool import password_pool
+from app.core.security import hash_password
+from app.modules.roles.catalog import role_catalog
+from app.modules.users.models import User, UserProfile
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+class ImportFormatError(ValueError):
+  """Вход не разбирается целиком (нет заголовка CSV, неизвестный формат)."""
+
+
+class ImportRow(BaseModel):
+  username: str = Field(min_length=3, max_length=150)
+  password: str = Field(min_length=8)
+  first_name: str = Field(min_length=1, max_length=100)
+  last_name: str = Field(min_length=1, max_length=100)
+  middle_name: str | None = Field(default=None, max_length=100)
+  email: EmailStr | None = None
+  role: str = "student"
+
+
+@dataclass
+class ImportReport:
+  rows: list[dict[str, Any]] = field(default_factory=list)
+  counts: Counter = field(default_factory=Counter)
+  truncated: bool = False
+  started: float = field(default_factory=time.perf_counter)
+
+  def add(self, row: int, status: str, **extra: Any) -> None:
+    self.counts[status] += 1
+    self.rows.append({"row": row, "status": status, **extra})
+
+  def summary(self) -> dict[str, Any]:
+    seconds = time.perf_counter() - self.started
+    return {
+      "total": sum(self.counts.values()),
+      "created": self.counts["created"],
+      "exists": self.counts["exists"],
+      "duplicate": self.counts["duplicate"],
+      "invalid": self.counts["invalid"],
+      "failed": self.counts["failed"],
+      "truncated": self.truncated,
+      "seconds": round(seconds, 3),
+      "users_per_second": round(self.counts["created"] / seconds, 1) if seconds else 0.0,
+    }
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+  """Строки из потока байт; UTF-8 декодируется инкрементально, BOM отбрасывается."""
+  decoder = codecs.getincrementaldecoder("utf-8-sig")()
+  tail = ""
+  async for chunk in chunks:
+    tail += decoder.decode(chunk)
+    *lines, tail = tail.split("\n")
+    for line in lines:
+      yield line.rstrip("\r")
+  tail += decoder.decode(b"", final=True)
+  if tail:
+    yield tail.rstrip("\r")
+
+
+async def iter_records(
+  lines: AsyncIterable[str], fmt: str
+) -> AsyncIterator[tuple[int, dict[str, Any] | None, str | None]]:
+  """
+  (номер строки, данные, ошибка разбора). Пустые строки пропускаются.
+
+  CSV разбирается построчно: поля с переводом строки внутри кавычек не
+  поддерживаются — для таких данных есть NDJSON.
+  """
+  if fmt not in IMPORT_FORMATS:
+    raise ImportFormatError("unknown_format")
+
+  header: list[str] | None = None
+  number = 0
+  async for line in lines:
+    if not line.strip():
+      continue
+    if fmt == "csv" and header is None:
+      header = [name.strip() for name in next(csv.reader([line]))]
+      if "username" not in header or "password" not in header:
+        raise ImportFormatError("csv_header_required")
+      continue
+
+    number += 1
+    if fmt == "csv":
+      values = next(csv.reader([line]))
+      if len(values) != len(header):
+        yield number, None, "column_count_mismatch"
+        continue
+      yield number, {k: v for k, v in zip(header, values, strict=True) if v != ""}, None
+    else:
+      try:
+        data = json.loads(line)
+      except ValueError:
+        yield number, None, "invalid_json"
+        continue
+      if not isinstance(data, dict):
+        yield number, None, "invalid_json"
+        continue
+      yield number, data, None
+
+
+def _validation_errors(err: ValidationError) -> list[str]:
+  return [f"{'.'.join(str(p) for p in e['loc'])}: {e['type']}" for e in err.errors()]
+
+
+class UserImporter:
+  def __init__(
+    self,
+    db: AsyncSession,
+    batch_size: int | None = None,
+    max_rows: int | None = None,
+    hash_workers: int | None = None,
+  ):
+    self.db = db
+    self.batch_size = max(batch_size or settings.user_import_batch_size, 1)
+    self.max_rows = max_rows or settings.user_import_max_rows
+    # доля общего пула хэширования: по умолчанию половина, логину остаётся вторая
+    workers = hash_workers or settings.user_import_hash_workers or password_pool.workers // 2
+    self.hash_workers = min(max(workers, 1), password_pool.workers)
+    self._hash_slots = asyncio.Semaphore(self.hash_workers)
+    self.report = ImportReport()
+    self._seen: set[str] = set()
+
+  async def run(
+    self, records: AsyncIterable[tuple[int, dict[str, Any] | None, str | None]]
+  ) -> ImportReport:
+    batch: list[tuple[int, ImportRow]] = []
+    async for number, data, error in records:
+      if number > self.max_rows:
+        self.report.truncated = True
+        break
+      row = self._validate(number, data, error)
+      if row is None:
+        continue
+      batch.append((number, row))
+      if len(batch) >= self.batch_size:
+        await self._flush(batch)
+        batch = []
+    if batch:
+      await self._flush(batch)
+
+    self.report.rows.sort(key=lambda r: r["row"])
+    return self.report
+
+  def _validate(
+    self, number: int, data: dict[str, Any] | None, error: str | None
+  ) -> ImportRow | None:
+    if error is not None:
+      self.report.add(number, "invalid", errors=[error])
+      return None
+    try:
+      row = ImportRow.model_validate(data)
+    except ValidationError as err:
+      self.report.add(
+        number, "invalid", username=data.get("username"), errors=_validation_errors(err)
+      )
+      return None
+
+    if row.username in self._seen:
+      self.report.add(number, "duplicate", username=row.username)
+      return None
+    self._seen.add(row.username)
+    return row
+
+  async def _flush(self, batch: list[tuple[int, ImportRow]]) -> None:
+    try:
+      outcomes = await self._write(batch)
+    except Exception:
+      # пачка откатывается целиком, следующие пачки импортируются дальше
+      logger.exception("User import batch of %d rows failed", len(batch))
+      await self.db.rollback()
+      outcomes = [
+        (number, "failed", {"username": row.username, "errors": ["batch_failed"]})
+        for number, row in batch
+      ]
+    for number, status, extra in outcomes:
+      self.report.add(number, status, **extra)
+
+  async def _hash(self, raw: str) -> str:
+    async with self._hash_slots:
+      return await password_pool.run(hash_password, raw)
+
+  async def _write(
+    self, batch: list[tuple[int, ImportRow]]
+  ) -> list[tuple[int, str, dict[str, Any]]]:
+    """Записать пачку одной транзакцией; статусы строк — только после commit."""
+    names = [row.username for _, row in batch]
+    taken = set(await self.db.scalars(select(User.username).where(User.username.in_(names))))
+
+    outcomes: list[tuple[int, str, dict[str, Any]]] = []
+    pending: list[tuple[int, ImportRow, uuid.UUID]] = []
+    for number, row in batch:
+      if row.username in taken:
+        outcomes.append((number, "exists", {"username": row.username}))
+        continue
+      role_id = await role_catalog.role_id(self.db, row.role)
+      if role_id is None:
+        outcomes.append(
+          (number, "invalid", {"username": row.username, "errors": ["role: role_not_found"]})
+        )
+        continue
+      pending.append((number, row, role_id))
+    if not pending:
+      return outcomes
+
+    # хэши — дорогая часть: считаем только для строк, которые реально вставим
+    hashes = await asyncio.gather(*(self._hash(row.password) for _, row, _ in pending))
+
+    users = []
+    for (_, row, role_id), hashed in zip(pending, hashes, strict=True):
+      users.append(
+        {
+          "id": uuid.uuid4(),
+          "username": row.username,
+          "email": row.email,
+          "hashed_password": hashed,
+          "role_id": role_id,
+        }
+      )
+    # параллельный импорт/регистрация могли занять имя после SELECT — это "exists"
+    result = await self.db.execute(
+      insert(User)
+      .values(users)
+      .on_conflict_do_nothing(index_elements=[User.username])
+      .returning(User.username, User.id)
+    )
+    created = dict(result.all())
+
+    profiles = [
+      {
+        "id": uuid.uuid4(),
+        "user_id": created[row.username],
+        "first_name": row.first_name,
+        "last_name": row.last_name,
+        "middle_name": row.middle_name,
+        "display_name": f"{row.first_name} {row.last_name}".strip(),
+      }
+      for _, row, _ in pending
+      if row.username in created
+    ]
+    if profiles:
+      await self.db.execute(insert(UserProfile).values(profiles))
+    await self.db.commit()
+
+    for number, row, _ in pending:
+      user_id = created.get(row.username)
+      if user_id is None:
+        outcomes.append((number, "exists", {"username": row.username}))
+      else:
+        outcomes.append((number, "created", {"username": row.username, "user_id": str(user_id)}))
+    return outcomes
+
+
+async def import_users(
+  db: AsyncSession, chunks: AsyncIterable[bytes], fmt: str, **options: Any
+) -> ImportReport:
+  importer = UserImporter(db, **options)
+  return await importer.run(iter_records(iter_lines(chunks), fmt))
+
+
+def guess_format(filename_or_type: str | None) -> str | None:
+  value = (filename_or_type or "").lower()
+  if "json" in value:
+    return "ndjson"
+  if "csv" in value:
+    return "csv"
+  return None
+
+
+async def _file_chunks(path: str, size: int = 1 << 16) -> AsyncIterator[bytes]:
+  with open(path, "rb") as fh:
+    while chunk := fh.read(size):
+      yield chunk
+
+
+def _write_report(rows: Iterable[dict[str, Any]], path: str) -> None:
+  with open(path, "w", encoding="utf-8") as fh:
+    for row in rows:
+      fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+async def _main(args: argparse.Namespace) -> dict[str, Any]:
+  fmt = args.format or guess_format(args.path)
+  if fmt is None:
+    raise SystemExit("cannot guess format, pass --format csv|ndjson")
+
+  async with SessionLocal() as db:
+    report = await import_users(
+      db,
+      _file_chunks(args.path),
+      fmt,
+      batch_size=args.batch_size,
+      max_rows=args.max_rows,
+      hash_workers=args.workers,
+    )
+  if args.report:
+    _write_report(report.rows, args.report)
+  return report.summary()
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description="Массовый импорт пользователей из CSV / NDJSON")
+  parser.add_argument("path")
+  parser.add_argument("--format", choices=IMPORT_FORMATS, default=None)
+  parser.add_argument("--batch-size", type=int, default=None)
+  parser.add_argument("--max-rows", type=int, default=10**9)
+  parser.add_argument("--workers", type=int, default=None)
+  parser.add_argument("--report", default=None, help="построчный отчёт в NDJSON")
+  args = parser.parse_args(argv)
+
+  print(json.dumps(asyncio.run(_main(args)), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import hashlib
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.modules.roles.models import Role
+from app.modules.users.models import User, UserProfile
+from app.modules.users.schemas import UserCompactOut
+
+
+async def lookup_etag(db: AsyncSession, ids: list[uuid.UUID]) -> str:
+  """
+  ETag набора профилей без загрузки строк.
+
+  Один агрегат по users/profiles/roles: любое изменение пользователя,
+  профиля или роли двигает updated_at, удаление — count.
+  """
+  row = (
+    await db.execute(
+      select(
+        func.count(User.id),
+        func.max(User.updated_at),
+        func.max(UserProfile.updated_at),
+        func.max(Role.updated_at),
+      )
+      .select_from(User)
+      .outerjoin(UserProfile, UserProfile.user_id == User.id)
+      .outerjoin(Role, Role.id == User.role_id)
+      .where(User.id.in_(ids))
+    )
+  ).one()
+  key = "|".join([",".join(sorted(map(str, ids))), *(str(value) for value in row)])
+  return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+async def load_compact(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, UserCompactOut]:
+  users = (
+    await db.scalars(
+      select(User)
+      .options(selectinload(User.profile), selectinload(User.role))
+      .where(User.id.in_(ids))
+    )
+  ).all()
+  return {
+    u.id: UserCompactOut(
+      id=str(u.id),
+      display_name=u.profile.display_name if u.profile else None,
+      role=u.role.slug if u.role else None,
+      is_active=u.is_active,
+    )
+    for u in users
+  }
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, func, text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -46,6 +46,26 @@ class User(Base):
   role: Mapped[Role] = relationship("Role", back_populates="users")
   refresh_tokens: Mapped[list[RefreshToken]] = relationship("RefreshToken", back_populates="user")
 
+  __table_args__ = (
+    # keyset-пагинация списка пользователей
+    Index("ix_users_created_at_id", "created_at", "id"),
+    Index("ix_users_email_id", func.coalesce(email, ""), "id"),
+    Index("ix_users_is_verified_id", "is_verified", "id"),
+    # pg_trgm: ILIKE '%q%' и similarity в поиске админки
+    Index(
+      "ix_users_username_trgm",
+      "username",
+      postgresql_using="gin",
+      postgresql_ops={"username": "gin_trgm_ops"},
+    ),
+    Index(
+      "ix_users_email_trgm",
+      "email",
+      postgresql_using="gin",
+      postgresql_ops={"email": "gin_trgm_ops"},
+    ),
+  )
+
   def __repr__(self) -> str:
     return f"User(id={self.id}, username={self.username!r}, role_id={self.role_id})"
 
@@ -69,3 +89,12 @@ class UserProfile(Base):
   )
 
   user: Mapped[User] = relationship("User", back_populates="profile")
+
+  __table_args__ = (
+    Index(
+      "ix_user_profiles_display_name_trgm",
+      "display_name",
+      postgresql_using="gin",
+      postgresql_ops={"display_name": "gin_trgm_ops"},
+    ),
+  )
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import base64
+import datetime as dt
+import json
+import uuid
+from typing import Any
+
+from sqlalchemy import Select, func, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.users.models import User
+
+# email nullable: для стабильного keyset сортируем по coalesce, NULL идёт как ""
+ORDER_COLUMNS = {
+  "email": func.coalesce(User.email, ""),
+  "created_at": User.created_at,
+  "verified": User.is_verified,
+}
+
+
+VALUE_TYPES = {"email": str, "created_at": dt.datetime, "verified": bool}
+
+
+class CursorError(ValueError):
+  pass
+
+
+def order_clause(order_by: str, order: str) -> list:
+  col = ORDER_COLUMNS[order_by]
+  # id — тай-брейкер, чтобы порядок был полным и курсор однозначным
+  if order == "asc":
+    return [col.asc(), User.id.asc()]
+  return [col.desc(), User.id.desc()]
+
+
+def _dump_value(value: Any) -> Any:
+  if isinstance(value, dt.datetime):
+    return {"dt": value.isoformat()}
+  return value
+
+
+def _load_value(value: Any) -> Any:
+  if isinstance(value, dict) and "dt" in value:
+    return dt.datetime.fromisoformat(value["dt"])
+  return value
+
+
+def sort_value(user: User, order_by: str) -> Any:
+  if order_by == "email":
+    return user.email or ""
+  if order_by == "verified":
+    return user.is_verified
+  return user.created_at
+
+
+def encode_cursor(user: User, order_by: str, order: str) -> str:
+  payload = {
+    "o": order_by,
+    "d": order,
+    "v": _dump_value(sort_value(user, order_by)),
+    "id": str(user.id),
+  }
+  raw = json.dumps(payload, separators=(",", ":")).encode()
+  return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, order_by: str, order: str) -> tuple[Any, uuid.UUID]:
+  try:
+    raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+    payload = json.loads(raw)
+    value, last_id = _load_value(payload["v"]), uuid.UUID(payload["id"])
+  except (ValueError, KeyError, TypeError) as err:
+    raise CursorError("invalid_cursor") from err
+  # курсор привязан к сортировке, в которой выдан
+  if payload.get("o") != order_by or payload.get("d") != order:
+    raise CursorError("cursor_order_mismatch")
+  if not isinstance(value, VALUE_TYPES[order_by]):
+    raise CursorError("invalid_cursor")
+  return value, last_id
+
+
+def after_cursor(stmt: Select, cursor: str, order_by: str, order: str) -> Select:
+  value, last_id = decode_cursor(cursor, order_by, order)
+  key = tuple_(ORDER_COLUMNS[order_by], User.id)
+  if order == "asc":
+    return stmt.where(key > tuple_(value, last_id))
+  return stmt.where(key < tuple_(value, last_id))
+
+
+def apply_filters(stmt: Select, q: str | None, role_ids: list[uuid.UUID] | None) -> Select:
+  if q:
+    like_expr = f"%{q}%"
+    stmt = stmt.where(or_(User.email.ilike(like_expr), User.username.ilike(like_expr)))
+  if role_ids:
+    stmt = stmt.where(User.role_id.in_(role_ids))
+  return stmt
+
+
+async def count_users(
+  db: AsyncSession, mode: str, q: str | None, role_ids: list[uuid.UUID] | None
+) -> int | None:
+  if mode == "none":
+    return None
+
+  if mode == "exact":
+    return await db.scalar(apply_filters(select(func.count()).select_from(User), q, role_ids)) or 0
+
+  if not q and not role_ids:
+    # без фильтров — статистика из каталога, без чтения таблицы
+    estimate = await db.scalar(
+      text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'users'::regclass")
+    )
+    if estimate is not None and estimate >= 0:
+      return estimate
+
+  # с фильтрами — оценка планировщика для того же запроса; EXPLAIN не принимает
+  # bind-параметры через text(), поэтому SQL компилируется в paramstyle драйвера
+  stmt = apply_filters(select(User.id), q, role_ids)
+  conn = await db.connection()
+  compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+  params = tuple(compiled.params[name] for name in compiled.positiontup)
+  result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+  plan = result.scalar()
+  if isinstance(plan, str):
+    plan = json.loads(plan)
+  return int(plan[0]["Plan"]["Plan Rows"])
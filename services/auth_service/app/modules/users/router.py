@@ -1,23 +1,61 @@
 import uuid
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse
+from learning_platform_common.http import etag_matches
 from learning_platform_common.utils import ResponseUtils
-from sqlalchemy import func, or_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.common.db.session import get_db
-from app.middleware.auth import require_roles
+from app.core.config import settings
+from app.middleware.auth import current_auth, require_roles
+from app.modules.auth.revocation import revoke_user_tokens
 from app.modules.roles.models import Role
+from app.modules.users.bulk_import import (
+  IMPORT_FORMATS,
+  ImportFormatError,
+  guess_format,
+  import_users,
+)
+from app.modules.users.lookup import load_compact, lookup_etag
 from app.modules.users.models import User, UserProfile
-from app.modules.users.schemas import UserOut, UserUpdateRequest
+from app.modules.users.pagination import (
+  CursorError,
+  after_cursor,
+  apply_filters,
+  count_users,
+  encode_cursor,
+  order_clause,
+)
+from app.modules.users.schemas import UserLookupRequest, UserOut, UserUpdateRequest
+from app.modules.users.search import search_users
+from app.modules.users.status_cache import user_status_cache
 
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 
 router = APIRouter()
 
 
+def _user_out(u: User) -> dict:
+  """UserOut пользователя с загруженными role и profile."""
+  return UserOut(
+    id=str(u.id),
+    email=u.email or "",
+    is_active=u.is_active,
+    is_verified=u.is_verified,
+    must_change_password=u.must_change_password,
+    role=u.role.slug if u.role else None,
+    created_at=u.created_at,
+    updated_at=u.updated_at,
+    last_login=u.last_login,
+    display_name=u.profile.display_name if u.profile else None,
+    login=u.username,
+  ).model_dump()
+
+
 @router.get("/", dependencies=[Depends(require_roles("admin"))])
 async def list_users(
   db: DbSession,
@@ -27,54 +65,104 @@ async def list_users(
   order: Annotated[str, Query(pattern="^(asc|desc)$")] = "desc",
   limit: Annotated[int, Query(ge=1, le=100)] = 20,
   offset: Annotated[int, Query(ge=0)] = 0,
+  cursor: Annotated[
+    str | None, Query(description="next_cursor from the previous page; replaces offset")
+  ] = None,
+  count: Annotated[str, Query(pattern="^(exact|estimate|none)$")] = "exact",
+):
+  stmt = apply_filters(
+    select(User).options(selectinload(User.role), selectinload(User.profile)), q, role_ids
+  )
+
+  if cursor:
+    try:
+      stmt = after_cursor(stmt, cursor, order_by, order)
+    except CursorError as err:
+      raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+  elif offset:
+    stmt = stmt.offset(offset)
+
+  # +1 строка — понять, есть ли следующая страница, без count
+  stmt = stmt.order_by(*order_clause(order_by, order)).limit(limit + 1)
+  rows = list((await db.execute(stmt)).scalars().all())
+  has_more = len(rows) > limit
+  rows = rows[:limit]
+
+  total = await count_users(db, count, q, role_ids)
+
+  items = [_user_out(u) for u in rows]
+
+  return ResponseUtils.success(
+    items=items,
+    total=total,
+    count=count,
+    limit=limit,
+    offset=0 if cursor else offset,
+    next_cursor=encode_cursor(rows[-1], order_by, order) if has_more else None,
+  )
+
+
+@router.get("/search", dependencies=[Depends(require_roles("admin"))])
+async def search_users_route(
+  db: DbSession,
+  q: Annotated[str, Query(description="username, email or display name fragment")],
+  limit: Annotated[int, Query(ge=1, le=50)] = 20,
 ):
-  stmt = select(User).options(selectinload(User.role), selectinload(User.profile))
-
-  if q:
-    like_expr = f"%{q}%"
-    stmt = stmt.where(or_(User.email.ilike(like_expr), User.username.ilike(like_expr)))
-
-  if role_ids:
-    stmt = stmt.join(User.role).where(Role.id.in_(role_ids))
-
-  if order_by == "email":
-    ob_col = User.email
-  elif order_by == "verified":
-    ob_col = User.is_verified
-  else:
-    ob_col = User.created_at
-
-  stmt = stmt.order_by(ob_col.asc() if order == "asc" else ob_col.desc())
-
-  rows = (await db.execute(stmt.limit(limit).offset(offset))).scalars().unique().all()
-
-  count_stmt = select(func.count(func.distinct(User.id))).select_from(User)
-  if q:
-    like_expr = f"%{q}%"
-    count_stmt = count_stmt.where(or_(User.email.ilike(like_expr), User.username.ilike(like_expr)))
-  if role_ids:
-    count_stmt = count_stmt.join(User.role).where(Role.id.in_(role_ids))
-
-  total = await db.scalar(count_stmt)
-
-  items = [
-    UserOut(
-      id=str(u.id),
-      email=u.email or "",
-      is_active=u.is_active,
-      is_verified=u.is_verified,
-      must_change_password=u.must_change_password,
-      role=u.role.slug if u.role else None,
-      created_at=u.created_at,
-      updated_at=u.updated_at,
-      last_login=u.last_login,
-      display_name=u.profile.display_name if u.profile else None,
-      login=u.username,
-    ).model_dump()
-    for u in rows
-  ]
-
-  return ResponseUtils.success(items=items, total=total or 0, limit=limit, offset=offset)
+  q = q.strip()
+  if len(q) < settings.user_search_min_length:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="query_too_short")
+
+  users = await search_users(db, q, limit)
+  items = [_user_out(u) for u in users]
+  return ResponseUtils.success(items=items, limit=limit)
+
+
+@router.post("/lookup", dependencies=[Depends(current_auth)])
+async def lookup_users(payload: UserLookupRequest, request: Request, db: DbSession):
+  """
+  Компактные профили пачкой — для списков участников и отзывов в courses/progress.
+
+  Поддерживает If-None-Match: при неизменившемся наборе (и на `*`) отвечает
+  412 после одного агрегатного запроса, не загружая профили. Для POST
+  304 не допускается (RFC 9110, 13.1.2), клиент по 412 оставляет у себя
+  прежний ответ.
+  """
+  ids = list(dict.fromkeys(payload.ids))
+  etag = await lookup_etag(db, ids)
+  headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+  if etag_matches(request, etag):
+    return Response(status_code=status.HTTP_412_PRECONDITION_FAILED, headers=headers)
+
+  found = await load_compact(db, ids)
+  body = ResponseUtils.success(
+    users=[found[i].model_dump() for i in ids if i in found],
+    missing=[str(i) for i in ids if i not in found],
+  )
+  return JSONResponse(body, headers=headers)
+
+
+@router.post("/import", dependencies=[Depends(require_roles("admin"))])
+async def import_users_route(
+  request: Request,
+  db: DbSession,
+  fmt: Annotated[str | None, Query(alias="format", pattern="^(csv|ndjson)$")] = None,
+):
+  """
+  Массовое создание пользователей из тела запроса (text/csv или application/x-ndjson).
+
+  Тело читается потоком, строки вставляются пачками; в ответе — сводка и
+  статус каждой строки (created / exists / duplicate / invalid).
+  """
+  fmt = fmt or guess_format(request.headers.get("content-type"))
+  if fmt not in IMPORT_FORMATS:
+    raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="unknown_format")
+
+  try:
+    report = await import_users(db, request.stream(), fmt)
+  except ImportFormatError as err:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+
+  return ResponseUtils.success(summary=report.summary(), rows=report.rows)
 
 
 @router.get("/{user_id}", dependencies=[Depends(require_roles("admin"))])
@@ -87,21 +175,7 @@ async def get_user_by_id(user_id: uuid.UUID, db: DbSession):
   if not user:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user_not_found")
 
-  payload = UserOut(
-    id=str(user.id),
-    email=user.email or "",
-    is_active=user.is_active,
-    is_verified=user.is_verified,
-    must_change_password=user.must_change_password,
-    role=user.role.slug if user.role else None,
-    created_at=user.created_at,
-    updated_at=user.updated_at,
-    last_login=user.last_login,
-    display_name=user.profile.display_name if user.profile else None,
-    login=user.username,
-  ).model_dump()
-
-  return ResponseUtils.success(user=payload)
+  return ResponseUtils.success(user=_user_out(user))
 
 
 @router.patch("/{user_id}", dependencies=[Depends(require_roles("admin"))])
@@ -114,6 +188,7 @@ async def update_user(user_id: uuid.UUID, payload: UserUpdateRequest, db: DbSess
   if not user:
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="user_not_found")
 
+  revoke = False
   if payload.role_id:
     try:
       role_uuid = uuid.UUID(payload.role_id)
@@ -126,11 +201,14 @@ async def update_user(user_id: uuid.UUID, payload: UserUpdateRequest, db: DbSess
     role = await db.get(Role, role_uuid)
     if not role:
       raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="role_not_found")
+    # роль зашита в access-токен — старые токены с прежней ролью отзываем
+    revoke = user.role_id != role.id
     user.role = role
 
   if payload.email is not None:
     user.email = payload.email
   if payload.is_active is not None:
+    revoke = revoke or (user.is_active and not payload.is_active)
     user.is_active = payload.is_active
   if payload.is_verified is not None:
     user.is_verified = payload.is_verified
@@ -151,7 +229,11 @@ async def update_user(user_id: uuid.UUID, payload: UserUpdateRequest, db: DbSess
   if payload.display_name is not None:
     profile.display_name = payload.display_name
 
+  if revoke:
+    await revoke_user_tokens(db, user_id)
+
   await db.commit()
+  user_status_cache.invalidate_user(user_id)
   await db.refresh(user)
 
   return await get_user_by_id(user_id, db)
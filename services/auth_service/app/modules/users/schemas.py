@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 
 from pydantic import BaseModel, EmailStr, Field
@@ -41,3 +42,14 @@ class UserUpdateRequest(BaseModel):
   last_name: str | None = Field(default=None, min_length=1)
   middle_name: str | None = None
   display_name: str | None = None
+
+
+class UserLookupRequest(BaseModel):
+  ids: list[uuid.UUID] = Field(min_length=1, max_length=500)
+
+
+class UserCompactOut(BaseModel):
+  id: str
+  display_name: str | None = None
+  role: str | None = None
+  is_active: bool
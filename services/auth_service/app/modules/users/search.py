@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from sqlalchemy import Select, case, func, literal, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, selectinload
+
+from app.modules.users.models import User, UserProfile
+
+
+def escape_like(value: str) -> str:
+  # пользовательские % и _ ищем буквально
+  return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_statement(q: str, limit: int) -> Select:
+  """
+  Поиск пользователей по username, email и display_name.
+
+  Отбор — ILIKE '%q%' и оператор `%` из pg_trgm, которые обслуживаются
+  GIN-индексами gin_trgm_ops, так что запрос не сканирует users целиком.
+  Сначала идут совпадения по префиксу, дальше — по убыванию similarity.
+  """
+  contains = f"%{escape_like(q)}%"
+  prefix = f"{escape_like(q)}%"
+  email = func.coalesce(User.email, "")
+  display_name = func.coalesce(UserProfile.display_name, "")
+
+  # OR по двум таблицам через JOIN планировщик индексами не покроет, поэтому
+  # кандидатов собираем UNION-ом: каждая ветка — BitmapOr по своим GIN-индексам
+  candidates = union(
+    select(User.id).where(
+      or_(
+        User.username.ilike(contains, escape="\\"),
+        User.email.ilike(contains, escape="\\"),
+        # опечатки: похожие, но не содержащие подстроку
+        User.username.op("%")(literal(q)),
+      )
+    ),
+    select(UserProfile.user_id).where(
+      or_(
+        UserProfile.display_name.ilike(contains, escape="\\"),
+        UserProfile.display_name.op("%")(literal(q)),
+      )
+    ),
+  )
+
+  is_prefix = case(
+    (
+      or_(
+        User.username.ilike(prefix, escape="\\"),
+        email.ilike(prefix, escape="\\"),
+        display_name.ilike(prefix, escape="\\"),
+      ),
+      1,
+    ),
+    else_=0,
+  )
+  score = func.greatest(
+    func.similarity(User.username, q),
+    func.similarity(email, q),
+    func.similarity(display_name, q),
+  )
+
+  return (
+    select(User)
+    .outerjoin(User.profile)
+    .options(contains_eager(User.profile), selectinload(User.role))
+    .where(User.id.in_(candidates))
+    .order_by(is_prefix.desc(), score.desc(), User.username.asc())
+    .limit(limit)
+  )
+
+
+async def search_users(db: AsyncSession, q: str, limit: int) -> list[User]:
+  return list((await db.execute(search_statement(q, limit))).scalars().all())
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.modules.auth.models import TokenRevocation
+from app.modules.auth.revocation import watermark
+from app.modules.roles.models import Role
+from app.modules.users.models import User
+
+
+@dataclass(frozen=True)
+class UserStatus:
+  user_id: uuid.UUID
+  is_active: bool
+  role_id: uuid.UUID | None
+  role_slug: str | None
+  updated_at: datetime | None
+  # водяной знак отзыва (секунды с долями): токены с iat < not_before недействительны
+  not_before: float | None = None
+
+
+class UserStatusCache:
+  """
+  Снимок (is_active, роль, updated_at, not_before) пользователя для AuthMiddleware.
+
+  Живёт в памяти процесса не дольше ttl; ручки, меняющие пользователя или
+  роль, сбрасывают записи сразу после commit.
+  """
+
+  def __init__(self, maxsize: int, ttl: float):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self._entries: OrderedDict[uuid.UUID, tuple[float, UserStatus]] = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+
+  def get(self, user_id: uuid.UUID) -> UserStatus | None:
+    entry = self._entries.get(user_id)
+    if entry is None or entry[0] <= time.monotonic():
+      if entry is not None:
+        del self._entries[user_id]
+      self.misses += 1
+      return None
+
+    self._entries.move_to_end(user_id)
+    self.hits += 1
+    return entry[1]
+
+  def set(self, status: UserStatus) -> None:
+    if self.maxsize <= 0:
+      return
+    self._entries[status.user_id] = (time.monotonic() + self.ttl, status)
+    self._entries.move_to_end(status.user_id)
+    while len(self._entries) > self.maxsize:
+      self._entries.popitem(last=False)
+
+  def invalidate_user(self, user_id: uuid.UUID) -> None:
+    self._entries.pop(user_id, None)
+
+  def invalidate_role(self, role_id: uuid.UUID) -> None:
+    stale = [uid for uid, (_, status) in self._entries.items() if status.role_id == role_id]
+    for uid in stale:
+      del self._entries[uid]
+
+  def clear(self) -> None:
+    self._entries.clear()
+
+  def stats(self) -> dict:
+    return {
+      "size": len(self._entries),
+      "maxsize": self.maxsize,
+      "ttl": self.ttl,
+      "hits": self.hits,
+      "misses": self.misses,
+    }
+
+
+async def load_user_status(db: AsyncSession, user_id: uuid.UUID) -> UserStatus | None:
+  row = (
+    await db.execute(
+      select(User.is_active, User.updated_at, Role.id, Role.slug, TokenRevocation.not_before)
+      .outerjoin(Role, Role.id == User.role_id)
+      .outerjoin(TokenRevocation, TokenRevocation.user_id == User.id)
+      .where(User.id == user_id)
+    )
+  ).first()
+  if row is None:
+    return None
+
+  is_active, updated_at, role_id, role_slug, not_before = row
+  return UserStatus(
+    user_id=user_id,
+    is_active=is_active,
+    role_id=role_id,
+    role_slug=role_slug,
+    updated_at=updated_at,
+    not_before=watermark(not_before) if not_before is not None else None,
+  )
+
+
+user_status_cache = UserStatusCache(
+  maxsize=settings.user_status_cache_size,
+  ttl=settings.user_status_cache_ttl,
+)
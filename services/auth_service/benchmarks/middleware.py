@@ -0,0 +1,123 @@
+"""
+Накладные расходы AuthMiddleware: BaseHTTPMiddleware против чистого ASGI.
+
+Оба варианта вызывают одну и ту же проверку `authenticate`, разница только
+в обёртке. Запросы подаются прямо в ASGI-приложение (без сети и httpx),
+статус пользователя лежит в кэше, так что база не нужна.
+
+Запуск из services/auth_service:
+    PYTHONPATH=.:../../shared python -m benchmarks.middleware
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+import uuid
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.security import make_access_jwt
+from app.middleware.auth import AuthMiddleware, _is_public, _normalize_path, authenticate
+from app.modules.users.status_cache import UserStatus, user_status_cache
+
+REQUESTS = 5_000
+CONCURRENCY = 32
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """Прежняя обёртка: та же проверка внутри BaseHTTPMiddleware.dispatch."""
+
+    async def dispatch(self, request, call_next):
+        if not _is_public(_normalize_path(request.url.path), request.method.upper()):
+            denied = await authenticate(request)
+            if denied is not None:
+                return denied
+        return await call_next(request)
+
+
+def make_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def call(app, headers: list[tuple[bytes, bytes]]) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    assert status == 200, status
+    return time.perf_counter() - started
+
+
+async def measure(app, headers) -> tuple[float, float]:
+    latencies: list[float] = []
+    queue = iter(range(REQUESTS))
+
+    async def worker():
+        for _ in queue:
+            latencies.append(await call(app, headers))
+
+    for _ in range(200):
+        await call(app, headers)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    return REQUESTS / elapsed, p99
+
+
+async def main() -> None:
+    user_id = uuid.uuid4()
+    user_status_cache.set(
+        UserStatus(
+            user_id=user_id, is_active=True, role_id=uuid.uuid4(), role_slug="student", updated_at=None
+        )
+    )
+    token = make_access_jwt(str(user_id), "student")
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+
+    print(f"auth_service: {REQUESTS} requests, concurrency {CONCURRENCY}")
+    results = {}
+    for name, middleware in (("base_http", LegacyAuthMiddleware), ("pure_asgi", AuthMiddleware)):
+        results[name] = await measure(make_app(middleware), headers)
+        rps, p99 = results[name]
+        print(f"{name:<10} {rps:10.0f} req/s   p99 {p99:7.2f} ms")
+
+    print(f"speedup    x{results['pure_asgi'][0] / results['base_http'][0]:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
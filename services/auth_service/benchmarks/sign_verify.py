@@ -0,0 +1,71 @@
+"""
+Микробенчмарк подписи и проверки JWT по алгоритмам связки ключей.
+
+Для каждого алгоритма (RS256, ES256, EdDSA) меряет:
+  - sign/pem — как было: PEM-строка в jwt.encode, разбор ключа на каждый токен;
+  - sign     — готовый объект ключа из KeyEntry;
+  - verify   — проверка готовым объектом открытого ключа.
+
+Запуск из services/auth_service:
+    PYTHONPATH=.:../../shared python -m benchmarks.sign_verify
+"""
+
+from __future__ import annotations
+
+import tempfile
+import time
+from pathlib import Path
+
+import jwt
+
+from app.core.keyring import SUPPORTED_ALGS, KeyEntry, KeyRing, _private_pem
+
+ITERATIONS = 2_000
+# разбор приватного RSA-ключа из PEM стоит десятки миллисекунд — меньше повторов
+PEM_ITERATIONS = 100
+CLAIMS = {"sub": "user", "type": "access", "iss": "auth-service", "role": "student"}
+
+
+def make_entry(alg: str, directory: Path) -> KeyEntry:
+    ring = KeyRing(
+        directory=directory / alg / "keyring",
+        legacy_private_path=directory / alg / "jwt.key",
+        legacy_public_path=directory / alg / "jwt.key.pub",
+        alg=alg,
+    )
+    ring.load()
+    ring.ensure_algorithm()
+    return ring.active
+
+
+def per_second(fn, iterations: int = ITERATIONS) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - started)
+
+
+def main() -> None:
+    now = int(time.time())
+    claims = {**CLAIMS, "iat": now, "exp": now + 900}
+
+    print(f"{'alg':<6} {'sign/pem':>12} {'sign':>12} {'verify':>12}   ops/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        for alg in SUPPORTED_ALGS:
+            entry = make_entry(alg, Path(tmp))
+            pem = _private_pem(entry.private_key)
+            headers = {"kid": entry.kid}
+            token = jwt.encode(claims, entry.private_key, algorithm=alg, headers=headers)
+
+            sign_pem = per_second(
+                lambda: jwt.encode(claims, pem, algorithm=alg, headers=headers), PEM_ITERATIONS
+            )
+            sign = per_second(
+                lambda: jwt.encode(claims, entry.private_key, algorithm=alg, headers=headers)
+            )
+            verify = per_second(lambda: jwt.decode(token, entry.public_key, algorithms=[alg]))
+            print(f"{alg:<6} {sign_pem:12.0f} {sign:12.0f} {verify:12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Бенчмарк массового импорта пользователей.
+
+Без базы меряет потолок, который задаёт хэширование: N паролей через
+пул потоков импорта при разном числе потоков (argon2 отпускает GIL, так
+что рост почти линейный до числа ядер). С `--db` дополнительно
+импортирует N синтетических строк `import_bench_*` через UserImporter
+(нужна база с миграциями) и удаляет их после замера.
+
+Для сравнения: /auth/register на строку — хэш в общем пуле логина,
+три запроса и отдельный commit.
+
+Запуск из services/auth_service:
+        PYTHONPATH=.:../../shared python -m benchmarks.user_import --rows 200
+        PYTHONPATH=.:../../shared python -m benchmarks.user_import --rows 5000 --db
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete
+
+from app.common.db.session import SessionLocal
+from app.core.security import hash_password
+from app.modules.users.bulk_import import import_users
+from app.modules.users.models import User
+
+PREFIX = "import_bench_"
+
+
+def hashing_rate(rows: int, workers: int) -> float:
+    passwords = [f"bench-password-{i}" for i in range(rows)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(workers) as executor:
+        list(executor.map(hash_password, passwords))
+    return rows / (time.perf_counter() - started)
+
+
+async def ndjson_chunks(rows: int, chunk_rows: int = 500):
+    for start in range(0, rows, chunk_rows):
+        lines = (
+            json.dumps(
+                {
+                    "username": f"{PREFIX}{i}",
+                    "password": f"bench-password-{i}",
+                    "first_name": "Ivan",
+                    "last_name": f"Bench{i}",
+                    "email": f"{PREFIX}{i}@example.org",
+                }
+            )
+            for i in range(start, min(start + chunk_rows, rows))
+        )
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def db_import(rows: int, workers: int) -> dict:
+    try:
+        async with SessionLocal() as db:
+            report = await import_users(db, ndjson_chunks(rows), "ndjson", hash_workers=workers)
+        return report.summary()
+    finally:
+        async with SessionLocal() as db:
+            await db.execute(delete(User).where(User.username.like(f"{PREFIX}%")))
+            await db.commit()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Пропускная способность массового импорта")
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--db", action="store_true", help="полный импорт в базу")
+    args = parser.parse_args(argv)
+
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus})
+    print(f"hashing {args.rows} passwords, {cpus} CPUs")
+    for workers in worker_counts:
+        print(f"  {workers:>2} workers: {hashing_rate(args.rows, workers):8.1f} users/s")
+
+    if args.db:
+        summary = asyncio.run(db_import(args.rows, cpus))
+        print(f"full import on {cpus} workers: {json.dumps(summary)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Бенчмарк поиска пользователей в админке на синтетической базе.
+
+Сравнивает:
+    - legacy — прежний фильтр list_users: ILIKE по email/username + count(distinct);
+    - search — /users/search: UNION кандидатов по GIN-триграммам, ранжирование.
+
+Засев (`--seed N`) добавляет пользователей с username `bench_*` одним
+INSERT ... SELECT generate_series на стороне базы; `--cleanup` их удаляет.
+Нужна база с применёнными миграциями (pg_trgm и индексы из e4a7c1f9b305).
+
+Запуск из services/auth_service:
+        PYTHONPATH=.:../../shared python -m benchmarks.user_search --seed 1000000
+        PYTHONPATH=.:../../shared python -m benchmarks.user_search --cleanup
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import func, or_, select, text
+
+from app.common.db.session import SessionLocal
+from app.modules.users.models import User
+from app.modules.users.search import search_statement
+
+QUERIES = ("bench_4242", "ivanov", "petrva", "example.org", "zzz_nothing")
+REPEATS = 20
+
+SEED_SQL = """
+WITH role AS (SELECT id FROM roles WHERE slug = 'student')
+INSERT INTO users (id, username, email, hashed_password, role_id)
+SELECT gen_random_uuid(), 'bench_' || g, 'user' || g || '@example.org', 'x', role.id
+FROM generate_series(1, :n) AS g, role
+ON CONFLICT (username) DO NOTHING
+"""
+
+SEED_PROFILES_SQL = """
+INSERT INTO user_profiles (id, user_id, first_name, last_name, display_name)
+SELECT gen_random_uuid(), u.id, f, l, f || ' ' || l
+FROM (
+    SELECT id,
+        (ARRAY['Ivan','Petr','Anna','Olga','Sergey','Maria'])[1 + abs(hashtext(username)) % 6] AS f,
+        (ARRAY['Ivanov','Petrova','Sidorov','Smirnova','Kuznetsov'])[1 + abs(hashtext(email)) % 5] AS l
+    FROM users WHERE username LIKE 'bench\\_%'
+) AS u (id, f, l)
+ON CONFLICT (user_id) DO NOTHING
+"""
+
+
+def legacy_statements(q: str):
+    like_expr = f"%{q}%"
+    cond = or_(User.email.ilike(like_expr), User.username.ilike(like_expr))
+    return (
+        select(User).where(cond).order_by(User.created_at.desc()).limit(20),
+        select(func.count(func.distinct(User.id))).select_from(User).where(cond),
+    )
+
+
+async def timed(db, stmt) -> float:
+    started = time.perf_counter()
+    await db.execute(stmt)
+    return (time.perf_counter() - started) * 1000
+
+
+async def run() -> None:
+    async with SessionLocal() as db:
+        total = await db.scalar(select(func.count()).select_from(User))
+        print(f"users: {total}")
+        print(f"{'query':<14} {'legacy p50':>12} {'search p50':>12}   ms")
+        for q in QUERIES:
+            legacy, search = [], []
+            for _ in range(REPEATS):
+                page, count = legacy_statements(q)
+                legacy.append(await timed(db, page) + await timed(db, count))
+                search.append(await timed(db, search_statement(q, 20)))
+            print(f"{q:<14} {statistics.median(legacy):12.1f} {statistics.median(search):12.1f}")
+
+
+async def seed(n: int) -> None:
+    async with SessionLocal() as db:
+        started = time.perf_counter()
+        await db.execute(text(SEED_SQL), {"n": n})
+        await db.execute(text(SEED_PROFILES_SQL))
+        await db.commit()
+        await db.execute(text("ANALYZE users"))
+        await db.execute(text("ANALYZE user_profiles"))
+        print(f"seeded {n} users in {time.perf_counter() - started:.1f}s")
+
+
+async def cleanup() -> None:
+    async with SessionLocal() as db:
+        await db.execute(text("DELETE FROM users WHERE username LIKE 'bench\\_%'"))
+        await db.commit()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска пользователей")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="сколько синтетических пользователей добавить"
+    )
+    parser.add_argument("--cleanup", action="store_true", help="удалить bench_* пользователей")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        await cleanup()
+        return
+    if args.seed:
+        await seed(args.seed)
+    await run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""refresh tokens lookup indexes
+
+Revision ID: a3f1c9d2e7b4
+Revises: 5b05cdc443b8
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c9d2e7b4'
+down_revision: Union[str, Sequence[str], None] = '5b05cdc443b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY нельзя внутри транзакции; таблица живая — не блокируем логины
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            op.f('ix_refresh_tokens_expires_at'), 'refresh_tokens', ['expires_at'],
+            unique=False, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_refresh_tokens_revoked_at', 'refresh_tokens', ['revoked_at'],
+            unique=False, postgresql_where=sa.text('revoked_at IS NOT NULL'),
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_refresh_tokens_revoked_at', table_name='refresh_tokens',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            op.f('ix_refresh_tokens_expires_at'), table_name='refresh_tokens',
+            postgresql_concurrently=True, if_exists=True,
+        )
+        op.drop_index(
+            op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""token revocations feed
+
+Revision ID: b92d4e6f1a37
+Revises: e4a7c1f9b305
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b92d4e6f1a37'
+down_revision: Union[str, Sequence[str], None] = 'e4a7c1f9b305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('token_revocations_seq')))
+    op.create_table(
+        'token_revocations',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('not_before', sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            'seq', sa.BigInteger(),
+            server_default=sa.text("nextval('token_revocations_seq')"), nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    op.create_index('ix_token_revocations_seq', 'token_revocations', ['seq'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_token_revocations_seq', table_name='token_revocations')
+    op.drop_table('token_revocations')
+    op.execute(sa.schema.DropSequence(sa.Sequence('token_revocations_seq')))
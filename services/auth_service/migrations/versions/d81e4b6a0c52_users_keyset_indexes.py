@@ -0,0 +1,44 @@
+"""users keyset pagination indexes
+
+Revision ID: d81e4b6a0c52
+Revises: a3f1c9d2e7b4
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81e4b6a0c52'
+down_revision: Union[str, Sequence[str], None] = 'a3f1c9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # индексы (колонка сортировки, id) под keyset-пагинацию /users
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_id', 'users', ['created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_email_id', 'users', [sa.text("coalesce(email, '')"), 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.create_index(
+            'ix_users_is_verified_id', 'users', ['is_verified', 'id'],
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in ('ix_users_is_verified_id', 'ix_users_email_id', 'ix_users_created_at_id'):
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,44 @@
+"""users trigram search indexes
+
+Revision ID: e4a7c1f9b305
+Revises: d81e4b6a0c52
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7c1f9b305'
+down_revision: Union[str, Sequence[str], None] = 'd81e4b6a0c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRGM_INDEXES = (
+    ('ix_users_username_trgm', 'users', 'username'),
+    ('ix_users_email_trgm', 'users', 'email'),
+    ('ix_user_profiles_display_name_trgm', 'user_profiles', 'display_name'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # GIN по триграммам обслуживает ILIKE '%q%', % и similarity()
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TRGM_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
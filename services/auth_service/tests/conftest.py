@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import uuid
 from collections.abc import AsyncGenerator
 
@@ -10,11 +11,15 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.app import create_app
-from app.common.db.session import SessionLocal, get_db
-from app.core.security import hash_password, make_access_jwt
-from app.modules.roles.models import Role
-from app.modules.users.models import User, UserProfile
+# event_loop создаётся на каждый тест — соединения из пула между ними не переживут
+os.environ.setdefault("DB_NULL_POOL", "true")
+
+from app.app import create_app  # noqa: E402
+from app.common.db.session import SessionLocal, get_db  # noqa: E402
+from app.core.security import hash_password, make_access_jwt  # noqa: E402
+from app.modules.roles.catalog import role_catalog  # noqa: E402
+from app.modules.roles.models import Role  # noqa: E402
+from app.modules.users.models import User, UserProfile  # noqa: E402
 
 
 @pytest.fixture(scope="function")
@@ -25,6 +30,14 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def reset_role_catalog():
+    # фикстуры пишут роли мимо ручек, поэтому каталог сбрасываем на каждый тест
+    role_catalog.invalidate()
+    yield
+    role_catalog.invalidate()
+
+
 @pytest.fixture(scope="function")
 def app():
     return create_app()
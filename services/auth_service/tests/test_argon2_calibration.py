@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import security
+from app.core.argon2_calibration import calibrate, write_settings
+from app.core.config import settings
+
+
+def linear_cost(ms_per_mib_pass: float):
+    def measure(time_cost: int, memory_cost: int, parallelism: int) -> float:
+        return time_cost * memory_cost / 1024 * ms_per_mib_pass
+
+    return measure
+
+
+@pytest.mark.unit
+class TestArgon2Calibration:
+    def test_memory_respects_concurrency_ceiling(self):
+        result = calibrate(
+            target_ms=50, memory_ceiling_mib=512, concurrency=8, workers=4,
+            measure=linear_cost(0.1),
+        )
+
+        assert result.memory_cost * result.concurrency <= 512 * 1024
+        assert result.memory_cost == 64 * 1024
+
+    def test_time_cost_fills_latency_budget(self):
+        result = calibrate(
+            target_ms=50, memory_ceiling_mib=512, concurrency=8, workers=4,
+            measure=linear_cost(0.2),
+        )
+
+        # 64 MiB * 0.2 мс = 12.8 мс за проход -> 3 прохода = 38.4 мс, 4 — уже 51.2
+        assert result.time_cost == 3
+        assert result.p50_ms <= 50
+        assert result.logins_per_second == pytest.approx(4 * 1000 / 38.4, rel=0.01)
+
+    def test_memory_shrinks_on_slow_host(self):
+        result = calibrate(
+            target_ms=50, memory_ceiling_mib=512, concurrency=8, workers=1,
+            measure=linear_cost(2.0),
+        )
+
+        assert result.memory_cost == 16 * 1024
+        assert result.time_cost == 1
+
+    def test_pwd_ctx_uses_calibrated_file(self, tmp_path, monkeypatch):
+        result = calibrate(
+            target_ms=50, memory_ceiling_mib=64, concurrency=8, parallelism=1, workers=1,
+            measure=linear_cost(1.0),
+        )
+        path = tmp_path / "argon2.json"
+        write_settings(result, path)
+
+        monkeypatch.setattr(settings, "argon2_settings_file", str(path))
+        security.reset_password_context()
+        try:
+            hashed = security.hash_password("password123")
+            assert f"m={result.memory_cost},t={result.time_cost},p=1" in hashed
+            assert security.verify_password("password123", hashed)
+        finally:
+            monkeypatch.undo()
+            security.reset_password_context()
+
+    @pytest.mark.parametrize("content", ['{"time_cost": 2, "memory', '{"time_cost": "fast"}', "[]"])
+    def test_corrupt_file_falls_back_to_settings(self, tmp_path, monkeypatch, content: str):
+        path = tmp_path / "argon2.json"
+        path.write_text(content)
+
+        monkeypatch.setattr(settings, "argon2_settings_file", str(path))
+        security.reset_password_context()
+        try:
+            hashed = security.hash_password("password123")
+            assert security.verify_password("password123", hashed)
+        finally:
+            monkeypatch.undo()
+            security.reset_password_context()
+
+    def test_write_settings_leaves_no_temp_file(self, tmp_path):
+        result = calibrate(
+            target_ms=50, memory_ceiling_mib=64, concurrency=8, workers=1,
+            measure=linear_cost(1.0),
+        )
+        path = tmp_path / "argon2.json"
+
+        write_settings(result, path)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["argon2.json"]
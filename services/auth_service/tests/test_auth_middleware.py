@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import replace
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core.security import make_access_jwt
+from app.middleware.auth import AuthContext, current_auth, setup_auth_middleware
+from app.modules.users.status_cache import UserStatus, user_status_cache
+
+
+@pytest.fixture
+def active_user():
+    status = UserStatus(
+        user_id=uuid.uuid4(),
+        is_active=True,
+        role_id=uuid.uuid4(),
+        role_slug="teacher",
+        updated_at=None,
+    )
+    user_status_cache.set(status)
+    yield status
+    user_status_cache.invalidate_user(status.user_id)
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    setup_auth_middleware(app)
+
+    @app.get("/whoami")
+    async def whoami(request: Request, auth: AuthContext = Depends(current_auth)):
+        return {
+            "user_id": str(auth.user_id),
+            "role": auth.role,
+            "state_role": request.state.auth_user_role,
+            "sub": request.state.auth_claims["sub"],
+        }
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i};".encode()
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.mark.unit
+class TestAsgiAuthMiddleware:
+    async def test_state_is_visible_to_handlers(self, client: AsyncClient, active_user):
+        token = make_access_jwt(str(active_user.user_id), "teacher")
+
+        response = await client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "user_id": str(active_user.user_id),
+            "role": "teacher",
+            "state_role": "teacher",
+            "sub": str(active_user.user_id),
+        }
+
+    async def test_cookie_token(self, client: AsyncClient, active_user):
+        client.cookies.set("access_token", make_access_jwt(str(active_user.user_id)))
+
+        response = await client.get("/whoami")
+
+        assert response.status_code == 200
+
+    async def test_missing_token(self, client: AsyncClient):
+        response = await client.get("/whoami")
+
+        assert response.status_code == 401
+        assert response.json()["message"] == "access_required"
+
+    async def test_invalid_token(self, client: AsyncClient):
+        response = await client.get("/whoami", headers={"Authorization": "Bearer nope"})
+
+        assert response.status_code == 401
+        assert response.json()["message"] == "token_invalid"
+
+    async def test_streaming_response_passes_through(self, client: AsyncClient, active_user):
+        token = make_access_jwt(str(active_user.user_id))
+
+        response = await client.get("/stream", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
+        assert response.text == "chunk-0;chunk-1;chunk-2;"
+
+    async def test_public_path_skips_auth(self, client: AsyncClient):
+        response = await client.get("/openapi.json")
+
+        assert response.status_code == 200
+
+    async def test_token_issued_before_watermark_is_revoked(self, client: AsyncClient, active_user):
+        token = make_access_jwt(str(active_user.user_id))
+        user_status_cache.set(replace(active_user, not_before=time.time()))
+
+        response = await client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 401
+        assert response.json()["message"] == "token_revoked"
+
+    async def test_login_right_after_revocation_is_accepted(self, client: AsyncClient, active_user):
+        user_status_cache.set(replace(active_user, not_before=time.time()))
+        token = make_access_jwt(str(active_user.user_id))
+
+        response = await client.get("/whoami", headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == 200
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+import jwt
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.app import create_app
+from app.core import security
+from app.core.keyring import LEGACY_KID, KeyRing, KeyRingFullError
+
+
+@pytest.fixture
+def ring(tmp_path) -> KeyRing:
+    ring = KeyRing(
+        directory=tmp_path / "keyring",
+        legacy_private_path=tmp_path / "jwt.key",
+        legacy_public_path=tmp_path / "jwt.key.pub",
+        max_keys=3,
+        retain_seconds=3600,
+    )
+    ring.load()
+    return ring
+
+
+def sign(ring: KeyRing, claims: dict) -> str:
+    return jwt.encode(
+        claims, ring.active.private_key, algorithm=ring.active.alg, headers={"kid": ring.active_kid}
+    )
+
+
+@pytest.mark.unit
+class TestKeyRing:
+    def test_starts_with_legacy_key(self, ring: KeyRing):
+        assert ring.active_kid == LEGACY_KID
+        assert [k["kid"] for k in json.loads(ring.jwks_body)["keys"]] == [LEGACY_KID]
+
+    def test_rotation_keeps_old_tokens_valid(self, ring: KeyRing):
+        old_token = sign(ring, {"sub": "u"})
+        old_etag = ring.etag
+
+        entry = ring.rotate()
+
+        assert ring.active_kid == entry.kid != LEGACY_KID
+        assert ring.etag != old_etag
+        old_kid = jwt.get_unverified_header(old_token)["kid"]
+        old = ring.get(old_kid)
+        assert jwt.decode(old_token, old.public_key, algorithms=[old.alg])["sub"] == "u"
+
+    def test_full_ring_refuses_rotation(self, ring: KeyRing):
+        kids = [ring.rotate().kid for _ in range(2)]
+
+        with pytest.raises(KeyRingFullError):
+            ring.rotate()
+
+        # ни один ключ с живыми токенами не удалён
+        assert set(ring.keys) == {LEGACY_KID, *kids}
+        assert ring.active_kid == kids[-1]
+        assert all(Path(entry.path).exists() for entry in ring.keys.values())
+
+    def test_prunes_only_expired_keys(self, ring: KeyRing, monkeypatch):
+        kids = [ring.rotate().kid for _ in range(2)]
+        later = time.time() + ring.retain_seconds + 1
+        monkeypatch.setattr(time, "time", lambda: later)
+
+        entry = ring.rotate()
+
+        assert set(ring.keys) == {kids[-1], entry.kid}
+        assert (ring.directory / f"{kids[0]}.pem").exists() is False
+
+    def test_next_key_is_published_before_signing(self, tmp_path, monkeypatch):
+        ring = KeyRing(
+            directory=tmp_path / "keyring",
+            legacy_private_path=tmp_path / "jwt.key",
+            legacy_public_path=tmp_path / "jwt.key.pub",
+            retain_seconds=3600,
+            publish_delay=300,
+        )
+        ring.load()
+        now = time.time()
+
+        entry = ring.rotate()
+
+        # потребители успевают увидеть kid в JWKS, пока подписывает прежний ключ
+        assert ring.active_kid == LEGACY_KID
+        assert ring.next_kid == entry.kid
+        assert [k["kid"] for k in json.loads(ring.jwks_body)["keys"]] == [LEGACY_KID, entry.kid]
+
+        other = KeyRing(
+            directory=ring.directory,
+            legacy_private_path=ring.legacy_private_path,
+            legacy_public_path=ring.legacy_public_path,
+        )
+        other.load()
+        monkeypatch.setattr(time, "time", lambda: now + 301)
+        for r in (ring, other):
+            r.maybe_reload()
+            assert r.active_kid == entry.kid
+            assert r.next_kid is None
+            assert r.get(LEGACY_KID).retired_at == entry.activate_at
+        assert other.etag == ring.etag
+
+    def test_other_process_sees_rotation(self, ring: KeyRing, tmp_path):
+        entry = ring.rotate()
+        other = KeyRing(
+            directory=ring.directory,
+            legacy_private_path=ring.legacy_private_path,
+            legacy_public_path=ring.legacy_public_path,
+        )
+        other.load()
+
+        assert other.active_kid == entry.kid
+        assert other.etag == ring.etag
+
+    @pytest.mark.parametrize(("alg", "kty"), [("ES256", "EC"), ("EdDSA", "OKP")])
+    def test_switching_algorithm_keeps_legacy_key(self, tmp_path, alg: str, kty: str):
+        ring = KeyRing(
+            directory=tmp_path / "keyring",
+            legacy_private_path=tmp_path / "jwt.key",
+            legacy_public_path=tmp_path / "jwt.key.pub",
+            retain_seconds=3600,
+            alg=alg,
+        )
+        ring.load()
+        legacy_token = sign(ring, {"sub": "old"})
+
+        ring.ensure_algorithm()
+        token = sign(ring, {"sub": "new"})
+
+        jwks = json.loads(ring.jwks_body)["keys"]
+        assert [(k["kty"], k["alg"]) for k in jwks] == [(kty, alg), ("RSA", "RS256")]
+        published = {k["kid"]: jwt.PyJWK.from_dict(k) for k in jwks}
+        for raw, sub in ((token, "new"), (legacy_token, "old")):
+            key = published[jwt.get_unverified_header(raw)["kid"]]
+            assert jwt.decode(raw, key.key, algorithms=[key.algorithm_name])["sub"] == sub
+
+    def test_switching_algorithm_is_staged(self, tmp_path):
+        def make() -> KeyRing:
+            ring = KeyRing(
+                directory=tmp_path / "keyring",
+                legacy_private_path=tmp_path / "jwt.key",
+                legacy_public_path=tmp_path / "jwt.key.pub",
+                retain_seconds=3600,
+                alg="ES256",
+                publish_delay=300,
+            )
+            ring.load()
+            ring.ensure_algorithm()
+            return ring
+
+        ring = make()
+        staged = ring.next_kid
+
+        assert ring.active_kid == LEGACY_KID
+        assert ring.next.alg == "ES256"
+        # перезапуск до переключения не выпускает ещё один ключ
+        assert make().next_kid == staged
+        assert len(make().keys) == 2
+
+    def test_readers_see_consistent_snapshot_during_rotation(self, ring: KeyRing):
+        ring.max_keys = 50
+        stop = threading.Event()
+
+        def rotate() -> None:
+            for _ in range(5):
+                ring.rotate()
+            stop.set()
+
+        worker = threading.Thread(target=rotate)
+        worker.start()
+        while not stop.is_set():
+            state = ring.state
+            # ETag и тело JWKS из одного снимка, а ключи в нём не меняются на ходу
+            assert state.etag == f'"{hashlib.sha256(state.jwks_body).hexdigest()[:32]}"'
+            assert [k["kid"] for k in json.loads(state.jwks_body)["keys"]][0] == state.active_kid
+            assert all(entry.kid == kid for kid, entry in state.keys.items())
+        worker.join()
+
+        assert len(ring.keys) == 6
+
+
+@pytest.mark.unit
+class TestJWKSEndpoint:
+    async def test_etag_and_revalidation(self, ring: KeyRing, monkeypatch):
+        monkeypatch.setattr(security, "keyring", ring)
+        app = create_app()
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            first = await ac.get("/auth/.well-known/jwks.json")
+            assert first.status_code == 200
+            assert first.headers["etag"] == ring.etag
+            assert "max-age=" in first.headers["cache-control"]
+            assert first.json()["keys"][0]["kid"] == LEGACY_KID
+
+            cached = await ac.get(
+                "/auth/.well-known/jwks.json", headers={"If-None-Match": ring.etag}
+            )
+            assert cached.status_code == 304
+            assert cached.content == b""
+
+            ring.rotate()
+            changed = await ac.get(
+                "/auth/.well-known/jwks.json", headers={"If-None-Match": first.headers["etag"]}
+            )
+            assert changed.status_code == 200
+            assert [k["kid"] for k in changed.json()["keys"]][1] == LEGACY_KID
+
+    def test_tokens_carry_active_kid(self, ring: KeyRing, monkeypatch):
+        monkeypatch.setattr(security, "keyring", ring)
+        ring.rotate()
+
+        token = security.make_access_jwt("user-1", "admin")
+
+        assert jwt.get_unverified_header(token)["kid"] == ring.active_kid
+        assert security.verify_access_token(token)["sub"] == "user-1"
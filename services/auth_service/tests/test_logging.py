@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import sys
+
+import pytest
+from learning_platform_common import logging as common_logging
+from learning_platform_common.logging import (
+    DroppingQueueHandler,
+    JsonFormatter,
+    RequestContextMiddleware,
+    bind_request_context,
+    get_request_context,
+    reset_request_context,
+    update_request_context,
+)
+
+
+def make_record(msg: str = "hello %s", args: tuple = ("world",), **extra) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    common_logging.stop_logging()
+    root.handlers = handlers
+    root.setLevel(level)
+
+
+@pytest.mark.unit
+class TestJsonFormatter:
+    def test_renders_message_service_and_context(self):
+        record = make_record(request_id="r-1", user_id="u-1", path="/users", method="GET")
+
+        data = json.loads(JsonFormatter("auth_service").format(record))
+
+        assert data["msg"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["service"] == "auth_service"
+        assert data["request_id"] == "r-1"
+        assert data["user_id"] == "u-1"
+        assert data["path"] == "/users"
+        assert data["method"] == "GET"
+
+    def test_non_serializable_values_fall_back_to_str(self):
+        record = make_record(user_id=object())
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert data["user_id"].startswith("<object object")
+        assert "service" not in data
+
+
+@pytest.mark.unit
+class TestDroppingQueueHandler:
+    def test_counts_records_dropped_on_full_queue(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+
+        for _ in range(5):
+            handler.handle(make_record())
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_prepare_freezes_message_and_traceback(self):
+        handler = DroppingQueueHandler(queue.Queue())
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(msg="failed %d", args=(42,))
+            record.exc_info = sys.exc_info()
+
+        handler.handle(record)
+        queued = handler.queue.get_nowait()
+
+        assert queued.msg == "failed 42"
+        assert queued.args is None
+        assert queued.exc_info is None
+        assert "ValueError: boom" in queued.exc_text
+        assert "ValueError: boom" in json.loads(JsonFormatter().format(queued))["exc_info"]
+
+    def test_injects_request_context_without_overriding_extra(self):
+        handler = DroppingQueueHandler(queue.Queue())
+        token = bind_request_context(request_id="r-1", path="/roles", method="GET")
+        try:
+            update_request_context(user_id="u-1")
+            handler.handle(make_record(path="/explicit"))
+        finally:
+            reset_request_context(token)
+
+        queued = handler.queue.get_nowait()
+        assert queued.request_id == "r-1"
+        assert queued.user_id == "u-1"
+        assert queued.path == "/explicit"
+        assert get_request_context() == {}
+
+
+@pytest.mark.unit
+class TestSetupLogging:
+    def test_pipeline_writes_json_through_listener(self, restore_logging, capsys):
+        common_logging.setup_logging("auth_service", "INFO", json_logs=True, queue_size=100)
+
+        logging.getLogger("app.test").info("queued %s", "line")
+        common_logging.stop_logging()
+
+        lines = [json.loads(line) for line in capsys.readouterr().err.splitlines() if line]
+        assert any(line["msg"] == "queued line" and line["service"] == "auth_service" for line in lines)
+
+        stats = common_logging.logging_stats()
+        assert stats["queue_size"] == 100
+        assert stats["dropped"] == 0
+        assert stats["running"] is False
+
+
+@pytest.mark.unit
+class TestRequestContextMiddleware:
+    async def _call(self, headers: list[tuple[bytes, bytes]]) -> dict:
+        seen: dict = {}
+
+        async def app(scope, receive, send):
+            seen.update(get_request_context())
+
+        scope = {"type": "http", "path": "/users", "method": "POST", "headers": headers}
+        await RequestContextMiddleware(app)(scope, None, None)
+        return seen
+
+    async def test_uses_incoming_request_id(self):
+        seen = await self._call([(b"x-request-id", b"abc-123")])
+
+        assert seen == {"request_id": "abc-123", "path": "/users", "method": "POST"}
+        assert get_request_context() == {}
+
+    async def test_generates_request_id(self):
+        first = await self._call([])
+        second = await self._call([])
+
+        assert len(first["request_id"]) == 32
+        assert first["request_id"] != second["request_id"]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.password_pool import PasswordHasherPool, PasswordPoolBusyError
+from app.core.security import hash_password_async, verify_password_async
+
+
+def slow(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.mark.unit
+class TestPasswordHasherPool:
+    async def test_hash_and_verify_off_loop(self):
+        hashed = await hash_password_async("password123")
+
+        assert await verify_password_async("password123", hashed)
+        assert not await verify_password_async("wrong", hashed)
+
+    async def test_event_loop_keeps_running_during_burst(self):
+        pool = PasswordHasherPool(workers=2, queue_limit=16)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(pool.run(slow, 0.05) for _ in range(6)))
+        task.cancel()
+        pool.shutdown()
+
+        # 6 задач по 50 мс на 2 потоках ~ 150 мс; loop всё это время свободен
+        assert ticks >= 10
+        assert pool.stats()["completed"] == 6
+        assert pool.stats()["max_queue_depth"] >= 4
+
+    async def test_concurrency_is_bounded(self):
+        pool = PasswordHasherPool(workers=2, queue_limit=16)
+        peak = 0
+
+        def probe():
+            nonlocal peak
+            peak = max(peak, pool.in_flight)
+            time.sleep(0.01)
+
+        await asyncio.gather(*(pool.run(probe) for _ in range(8)))
+        pool.shutdown()
+
+        assert peak <= 2
+
+    async def test_rejects_when_queue_is_full(self):
+        pool = PasswordHasherPool(workers=1, queue_limit=1)
+
+        results = await asyncio.gather(
+            *(pool.run(slow, 0.05) for _ in range(4)), return_exceptions=True
+        )
+        pool.shutdown()
+
+        rejected = [r for r in results if isinstance(r, PasswordPoolBusyError)]
+        assert len(rejected) == 2
+        assert pool.stats()["rejected"] == 2
+        assert pool.stats()["hash"]["max_ms"] >= 50
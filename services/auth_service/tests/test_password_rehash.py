@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from passlib.hash import bcrypt
+
+from app.core.security import hash_password
+from app.modules.auth import rehash
+from app.modules.auth.rehash import PasswordRehashWorker, current_hash_prefix
+
+
+def fake_session_factory(rowcount: int):
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(rowcount=rowcount)
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    return factory, session
+
+
+@pytest.mark.unit
+class TestPasswordRehashWorker:
+    async def test_current_hash_is_not_queued(self):
+        worker = PasswordRehashWorker()
+
+        assert worker.submit(uuid.uuid4(), "password123", hash_password("password123")) is False
+        assert worker.stats()["queued"] == 0
+
+    async def test_outdated_hash_is_upgraded_conditionally(self, monkeypatch):
+        factory, session = fake_session_factory(rowcount=1)
+        monkeypatch.setattr(rehash, "SessionLocal", factory)
+        worker = PasswordRehashWorker()
+        old_hash = bcrypt.using(rounds=4).hash("password123")
+
+        assert worker.submit(uuid.uuid4(), "password123", old_hash) is True
+        await worker.drain()
+        await worker.stop()
+
+        stmt = session.execute.await_args.args[0]
+        params = stmt.compile().params
+        assert old_hash in params.values()
+        new_hash = next(v for k, v in params.items() if k == "hashed_password")
+        assert new_hash.startswith(current_hash_prefix())
+        assert worker.stats()["upgraded"] == 1
+
+    async def test_concurrent_password_change_wins(self, monkeypatch):
+        factory, _ = fake_session_factory(rowcount=0)
+        monkeypatch.setattr(rehash, "SessionLocal", factory)
+        worker = PasswordRehashWorker()
+
+        worker.submit(uuid.uuid4(), "password123", bcrypt.using(rounds=4).hash("password123"))
+        await worker.drain()
+        await worker.stop()
+
+        assert worker.stats()["conflicts"] == 1
+        assert worker.stats()["upgraded"] == 0
+
+    async def test_full_queue_drops(self, monkeypatch):
+        factory, _ = fake_session_factory(rowcount=1)
+        monkeypatch.setattr(rehash, "SessionLocal", factory)
+        worker = PasswordRehashWorker(queue_size=1)
+        old_hash = bcrypt.using(rounds=4).hash("password123")
+
+        results = [worker.submit(uuid.uuid4(), "password123", old_hash) for _ in range(3)]
+        await worker.drain()
+        await worker.stop()
+
+        assert results == [True, False, False]
+        assert worker.stats()["dropped"] == 2
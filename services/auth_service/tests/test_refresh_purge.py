@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.auth import purge
+from app.modules.auth.purge import RefreshTokenPurgeWorker
+
+
+def fake_session_factory(*rowcounts: int):
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(rowcount=count) for count in rowcounts]
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = session
+    return factory, session
+
+
+@pytest.mark.unit
+class TestRefreshTokenPurge:
+    def test_statement_uses_skip_locked_batches(self):
+        worker = RefreshTokenPurgeWorker(batch_size=500)
+        stmt = worker.purge_statement(dt.datetime(2026, 1, 1, tzinfo=dt.UTC))
+
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("DELETE FROM refresh_tokens")
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "LIMIT" in sql
+        assert "refresh_tokens.expires_at <" in sql
+        assert "refresh_tokens.revoked_at <" in sql
+
+    async def test_purges_until_partial_batch(self, monkeypatch):
+        factory, session = fake_session_factory(100, 100, 42)
+        monkeypatch.setattr(purge, "SessionLocal", factory)
+        worker = RefreshTokenPurgeWorker(batch_size=100, throttle=0)
+
+        assert await worker.purge() == 242
+
+        assert session.execute.await_count == 3
+        assert session.commit.await_count == 3
+        stats = worker.stats()
+        assert stats["purged"] == 242
+        assert stats["batches"] == 3
+        assert stats["last_run_purged"] == 242
+        assert stats["runs"] == 1
+
+    async def test_throttles_between_full_batches(self, monkeypatch):
+        factory, _ = fake_session_factory(10, 10, 0)
+        monkeypatch.setattr(purge, "SessionLocal", factory)
+        sleep = AsyncMock()
+        monkeypatch.setattr(purge.asyncio, "sleep", sleep)
+        worker = RefreshTokenPurgeWorker(batch_size=10, throttle=0.25)
+
+        await worker.purge()
+
+        assert [call.args[0] for call in sleep.await_args_list] == [0.25, 0.25]
+
+    async def test_failed_run_is_counted_and_loop_survives(self, monkeypatch):
+        worker = RefreshTokenPurgeWorker(interval=5)
+        monkeypatch.setattr(worker, "purge", AsyncMock(side_effect=RuntimeError("db is down")))
+        sleep = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+        monkeypatch.setattr(purge.asyncio, "sleep", sleep)
+
+        with pytest.raises(asyncio.CancelledError):
+            await worker._run()
+
+        assert worker.purge.await_count == 2
+        assert worker.stats()["failed"] == 2
+        sleep.assert_awaited_with(5)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import datetime as dt
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.common.db.session import get_db
+from app.core.config import settings
+from app.modules.auth.revocation import (
+    feed_statement,
+    prune_statement,
+    revocation_feed,
+    revoke_statement,
+    watermark,
+)
+
+NOW = dt.datetime(2026, 1, 1, 12, 0, tzinfo=dt.UTC)
+
+
+def compile_sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def fake_db(*rows) -> AsyncMock:
+    db = AsyncMock()
+    db.execute.return_value = MagicMock(all=MagicMock(return_value=list(rows)))
+    return db
+
+
+def row(seq: int, minutes_ago: int = 1):
+    return SimpleNamespace(
+        user_id=uuid.uuid4(), not_before=NOW - dt.timedelta(minutes=minutes_ago), seq=seq
+    )
+
+
+@pytest.mark.unit
+class TestRevocationStatements:
+    def test_revoke_is_upsert_with_monotonic_watermark(self):
+        sql = compile_sql(revoke_statement(uuid.uuid4(), NOW))
+
+        assert sql.startswith("INSERT INTO token_revocations")
+        assert "ON CONFLICT (user_id) DO UPDATE" in sql
+        assert "greatest(token_revocations.not_before, excluded.not_before)" in sql
+        assert "nextval('token_revocations_seq')" in sql
+
+    def test_feed_reads_after_cursor_within_access_ttl(self):
+        sql = compile_sql(feed_statement(since=10, limit=100, now=NOW))
+
+        assert "token_revocations.seq >" in sql
+        assert "token_revocations.not_before >" in sql
+        assert "ORDER BY token_revocations.seq" in sql
+        assert "LIMIT" in sql
+
+    def test_prune_drops_expired_watermarks(self):
+        sql = compile_sql(prune_statement(NOW))
+
+        assert sql.startswith("DELETE FROM token_revocations")
+        assert "token_revocations.not_before <" in sql
+
+    def test_watermark_keeps_sub_second_precision(self):
+        at = NOW + dt.timedelta(milliseconds=400)
+
+        # iat < not_before: токен, выданный до отзыва, отозван; новый вход в ту же секунду — нет
+        assert (NOW + dt.timedelta(milliseconds=399)).timestamp() < watermark(at)
+        assert (NOW + dt.timedelta(milliseconds=401)).timestamp() > watermark(at)
+
+
+@pytest.mark.unit
+class TestRevocationFeed:
+    async def test_page_reports_cursor_and_has_more(self):
+        rows = [row(5), row(7), row(9)]
+
+        feed = await revocation_feed(fake_db(*rows), since=3, limit=2)
+
+        assert feed["cursor"] == 7
+        assert feed["has_more"] is True
+        assert feed["ttl"] == settings.jwt_access_ttl_min * 60
+        assert feed["entries"] == [
+            {"user_id": str(r.user_id), "not_before": watermark(r.not_before)} for r in rows[:2]
+        ]
+
+    async def test_empty_page_keeps_cursor(self):
+        feed = await revocation_feed(fake_db(), since=42, limit=100)
+
+        assert feed == {
+            "entries": [],
+            "cursor": 42,
+            "has_more": False,
+            "ttl": settings.jwt_access_ttl_min * 60,
+        }
+
+    async def test_endpoint_is_closed_without_configured_token(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "revocation_feed_token", None)
+
+        async def override_get_db():
+            yield fake_db(row(3))
+
+        app.dependency_overrides[get_db] = override_get_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            anonymous = await ac.get("/auth/revocations")
+            with_header = await ac.get("/auth/revocations", headers={"X-Feed-Token": ""})
+        app.dependency_overrides.clear()
+
+        assert anonymous.status_code == 403
+        assert with_header.status_code == 403
+
+    async def test_endpoint_requires_feed_token(self, app, monkeypatch):
+        monkeypatch.setattr(settings, "revocation_feed_token", "secret")
+        entry = row(3)
+
+        async def override_get_db():
+            yield fake_db(entry)
+
+        app.dependency_overrides[get_db] = override_get_db
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            denied = await ac.get("/auth/revocations")
+            allowed = await ac.get(
+                "/auth/revocations", params={"since": 1}, headers={"X-Feed-Token": "secret"}
+            )
+        app.dependency_overrides.clear()
+
+        assert denied.status_code == 403
+        assert allowed.status_code == 200
+        assert allowed.headers["cache-control"] == "no-store"
+        body = allowed.json()
+        assert body["result"] is True
+        assert body["cursor"] == 3
+        assert body["entries"][0]["user_id"] == str(entry.user_id)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import AsyncClient
+
+from app.modules.roles.catalog import RoleCatalog
+from app.modules.roles.models import Role
+
+
+def fake_db(*roles: Role) -> AsyncMock:
+    db = AsyncMock()
+    db.scalars.return_value = MagicMock(all=MagicMock(return_value=list(roles)))
+    return db
+
+
+def make_role(slug: str, name: str | None = None) -> Role:
+    now = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+    return Role(
+        id=uuid.uuid4(),
+        slug=slug,
+        name=name or slug.title(),
+        description=None,
+        is_system=True,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.mark.unit
+class TestRoleCatalog:
+    async def test_body_is_built_once_until_invalidated(self):
+        student = make_role("student")
+        db = fake_db(student, make_role("teacher"))
+        catalog = RoleCatalog(ttl=60)
+
+        await catalog.ensure(db)
+        assert await catalog.role_id(db, "student") == student.id
+        assert db.scalars.await_count == 1
+
+        body = json.loads(catalog.body)
+        assert body["result"] is True
+        assert body["total"] == 2
+        assert [r["slug"] for r in body["roles"]] == ["student", "teacher"]
+
+        catalog.invalidate()
+        await catalog.ensure(db)
+        assert db.scalars.await_count == 2
+
+    async def test_etag_follows_content(self):
+        catalog = RoleCatalog(ttl=60)
+        role = make_role("student")
+
+        await catalog.ensure(fake_db(role))
+        first = catalog.etag
+        catalog.invalidate()
+        await catalog.ensure(fake_db(role))
+        assert catalog.etag == first
+
+        role.name = "Learner"
+        catalog.invalidate()
+        await catalog.ensure(fake_db(role))
+        assert catalog.etag != first
+        assert not catalog.etag.startswith("W/")
+
+    async def test_unknown_slug(self):
+        catalog = RoleCatalog(ttl=60)
+        assert await catalog.role_id(fake_db(), "student") is None
+
+
+@pytest.mark.roles
+class TestRoleCatalogEndpoint:
+    async def test_not_modified(self, client: AsyncClient, admin_role: Role):
+        first = await client.get("/roles/")
+        etag = first.headers["etag"]
+
+        cached = await client.get("/roles/", headers={"If-None-Match": etag})
+
+        assert cached.status_code == 304
+        assert cached.headers["cache-control"] == "private, no-cache"
+
+    async def test_create_role_changes_etag(
+        self, client: AsyncClient, auth_headers_admin: dict
+    ):
+        before = (await client.get("/roles/")).headers["etag"]
+
+        response = await client.post(
+            "/roles/",
+            json={"slug": f"r{uuid.uuid4().hex[:8]}", "name": "Reviewer"},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 201
+
+        after = await client.get("/roles/", headers={"If-None-Match": before})
+        assert after.status_code == 200
+        assert after.headers["etag"] != before
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.common.db.session import get_db
+from app.core.security import make_access_jwt, verify_password
+from app.modules.roles.catalog import role_catalog
+from app.modules.users import bulk_import
+from app.modules.users.bulk_import import (
+    ImportFormatError,
+    UserImporter,
+    iter_lines,
+    iter_records,
+)
+from app.modules.users.status_cache import UserStatus, user_status_cache
+
+STUDENT_ID = uuid.uuid4()
+
+
+async def chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+async def collect(fmt: str, *parts: bytes) -> list:
+    return [record async for record in iter_records(iter_lines(chunks(*parts)), fmt)]
+
+
+def fake_db(taken: tuple[str, ...] = (), conflicts: tuple[str, ...] = ()) -> AsyncMock:
+    """users INSERT ... RETURNING отдаёт все имена, кроме conflicts (их занял кто-то параллельно)."""
+    db = AsyncMock()
+    db.scalars.return_value = list(taken)
+
+    async def execute(stmt):
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        names = [v for k, v in params.items() if k.startswith("username_m")]
+        rows = [(name, uuid.uuid4()) for name in names if name not in conflicts]
+        return MagicMock(all=MagicMock(return_value=rows))
+
+    db.execute.side_effect = execute
+    return db
+
+
+def row(username: str, **extra) -> dict:
+    return {
+        "username": username,
+        "password": "secret-pass-1",
+        "first_name": "Ivan",
+        "last_name": "Ivanov",
+        **extra,
+    }
+
+
+@pytest.fixture
+def student_role(monkeypatch):
+    async def role_id(db, slug):
+        return STUDENT_ID if slug == "student" else None
+
+    monkeypatch.setattr(role_catalog, "role_id", role_id)
+
+
+@pytest.mark.unit
+class TestParsing:
+    async def test_lines_survive_chunk_boundaries_and_multibyte(self):
+        text = "username,password\r\nиван,p1\nпётр,p2".encode()
+
+        lines = [line async for line in iter_lines(chunks(text[:20], text[20:23], text[23:]))]
+
+        assert lines == ["username,password", "иван,p1", "пётр,p2"]
+
+    async def test_csv_rows_and_errors(self):
+        records = await collect(
+            "csv",
+            b"\xef\xbb\xbfusername,password,first_name\n",
+            b"ivan,p1,Ivan\n\nbroken,row\n\"petr\",p2,\n",
+        )
+
+        assert records == [
+            (1, {"username": "ivan", "password": "p1", "first_name": "Ivan"}, None),
+            (2, None, "column_count_mismatch"),
+            (3, {"username": "petr", "password": "p2"}, None),
+        ]
+
+    async def test_csv_requires_header(self):
+        with pytest.raises(ImportFormatError):
+            await collect("csv", b"ivan,p1\n")
+
+    async def test_ndjson_rows_and_errors(self):
+        records = await collect("ndjson", b'{"username": "ivan"}\nnot json\n[1]\n')
+
+        assert records == [
+            (1, {"username": "ivan"}, None),
+            (2, None, "invalid_json"),
+            (3, None, "invalid_json"),
+        ]
+
+
+@pytest.mark.unit
+class TestUserImporter:
+    async def test_report_covers_every_row(self, student_role):
+        db = fake_db(taken=("taken",), conflicts=("raced",))
+        lines = [
+            row("ivan"),
+            row("taken"),
+            row("ivan"),
+            row("xx"),
+            row("raced"),
+            row("olga", role="wizard"),
+            row("petr", email="petr@example.org", role="student"),
+        ]
+        data = "".join(json.dumps(item) + "\n" for item in lines).encode()
+
+        importer = UserImporter(db, batch_size=3, hash_workers=2)
+        report = await importer.run(iter_records(iter_lines(chunks(data)), "ndjson"))
+
+        statuses = [(r["row"], r["status"], r.get("username")) for r in report.rows]
+        assert statuses == [
+            (1, "created", "ivan"),
+            (2, "exists", "taken"),
+            (3, "duplicate", "ivan"),
+            (4, "invalid", "xx"),
+            (5, "exists", "raced"),
+            (6, "invalid", "olga"),
+            (7, "created", "petr"),
+        ]
+        assert report.summary()["created"] == 2
+        assert report.summary()["total"] == 7
+        # пачки по три валидные строки: ivan/taken/raced, olga/petr
+        assert db.commit.await_count == 2
+
+    async def test_batch_is_two_multirow_inserts(self, student_role):
+        db = fake_db()
+        data = "".join(json.dumps(row(f"user{i}")) + "\n" for i in range(4)).encode()
+
+        await UserImporter(db, batch_size=10, hash_workers=2).run(
+            iter_records(iter_lines(chunks(data)), "ndjson")
+        )
+
+        users_stmt, profiles_stmt = (call.args[0] for call in db.execute.await_args_list)
+        users_sql = str(users_stmt.compile(dialect=postgresql.dialect()))
+        assert users_sql.startswith("INSERT INTO users")
+        assert "ON CONFLICT (username) DO NOTHING" in users_sql
+        assert "RETURNING users.username, users.id" in users_sql
+        params = users_stmt.compile(dialect=postgresql.dialect()).params
+        assert verify_password("secret-pass-1", params["hashed_password_m0"])
+        assert str(profiles_stmt.compile(dialect=postgresql.dialect())).startswith(
+            "INSERT INTO user_profiles"
+        )
+
+    async def test_failed_batch_is_rolled_back_and_import_continues(self, student_role):
+        db = fake_db()
+        inserted = db.execute.side_effect
+
+        async def execute(stmt):
+            params = stmt.compile(dialect=postgresql.dialect()).params
+            if "boom" in params.values():
+                raise ConnectionError("connection reset")
+            return await inserted(stmt)
+
+        db.execute.side_effect = execute
+        data = "".join(
+            json.dumps(row(name)) + "\n" for name in ("ivan", "boom", "olga", "petr")
+        ).encode()
+
+        report = await UserImporter(db, batch_size=2, hash_workers=1).run(
+            iter_records(iter_lines(chunks(data)), "ndjson")
+        )
+
+        statuses = [(r["row"], r["status"]) for r in report.rows]
+        assert statuses == [(1, "failed"), (2, "failed"), (3, "created"), (4, "created")]
+        assert report.summary()["failed"] == 2
+        db.rollback.assert_awaited_once()
+        assert db.commit.await_count == 1
+
+    async def test_hashing_goes_through_shared_pool(self, student_role, monkeypatch):
+        calls = []
+
+        async def run(fn, *args):
+            calls.append(fn)
+            return fn(*args)
+
+        monkeypatch.setattr(bulk_import.password_pool, "run", run)
+        data = "".join(json.dumps(row(f"user{i}")) + "\n" for i in range(3)).encode()
+
+        importer = UserImporter(fake_db(), hash_workers=100)
+        await importer.run(iter_records(iter_lines(chunks(data)), "ndjson"))
+
+        assert calls == [bulk_import.hash_password] * 3
+        assert importer.hash_workers == bulk_import.password_pool.workers
+
+    async def test_rows_beyond_limit_are_truncated(self, student_role):
+        data = "".join(json.dumps(row(f"user{i}")) + "\n" for i in range(5)).encode()
+
+        report = await UserImporter(fake_db(), max_rows=3, hash_workers=1).run(
+            iter_records(iter_lines(chunks(data)), "ndjson")
+        )
+
+        assert report.summary()["total"] == 3
+        assert report.truncated is True
+
+
+@pytest.mark.unit
+class TestImportEndpoint:
+    @pytest.fixture
+    def admin_token(self):
+        status = UserStatus(
+            user_id=uuid.uuid4(),
+            is_active=True,
+            role_id=uuid.uuid4(),
+            role_slug="admin",
+            updated_at=None,
+        )
+        user_status_cache.set(status)
+        yield make_access_jwt(str(status.user_id), "admin")
+        user_status_cache.invalidate_user(status.user_id)
+
+    async def test_csv_body(self, app, admin_token, student_role, monkeypatch):
+        monkeypatch.setattr(bulk_import.settings, "user_import_hash_workers", 1)
+
+        async def override_get_db():
+            yield fake_db()
+
+        app.dependency_overrides[get_db] = override_get_db
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            response = await ac.post(
+                "/users/import",
+                content=b"username,password,first_name,last_name\nivan,secret-pass-1,Ivan,Ivanov\n",
+                headers={**headers, "Content-Type": "text/csv"},
+            )
+            unknown = await ac.post("/users/import", content=b"x", headers=headers)
+        app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["summary"]["created"] == 1
+        assert body["rows"][0]["status"] == "created"
+        assert unknown.status_code == 415
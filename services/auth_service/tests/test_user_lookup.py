@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from learning_platform_common.http import etag_matches
+from starlette.requests import Request
+
+from app.modules.users.models import User
+
+
+def request_with(if_none_match: str | None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+@pytest.mark.unit
+class TestEtagMatches:
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            (None, False),
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"zzz", W/"abc"', True),
+            ("*", True),
+            ('"zzz"', False),
+        ],
+    )
+    def test_weak_comparison(self, header: str | None, expected: bool):
+        assert etag_matches(request_with(header), 'W/"abc"') is expected
+
+
+@pytest.mark.users
+class TestUserLookup:
+    async def test_returns_compact_profiles_in_request_order(
+        self,
+        client: AsyncClient,
+        auth_headers_student: dict,
+        admin_user: User,
+        student_user: User,
+    ):
+        unknown = uuid.uuid4()
+        response = await client.post(
+            "/users/lookup",
+            json={"ids": [str(student_user.id), str(unknown), str(admin_user.id)]},
+            headers=auth_headers_student,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [u["id"] for u in data["users"]] == [str(student_user.id), str(admin_user.id)]
+        assert set(data["users"][0]) == {"id", "display_name", "role", "is_active"}
+        assert data["users"][1]["role"] == "admin"
+        assert data["missing"] == [str(unknown)]
+
+    async def test_conditional_request(
+        self, client: AsyncClient, auth_headers_student: dict, student_user: User
+    ):
+        body = {"ids": [str(student_user.id)]}
+        first = await client.post("/users/lookup", json=body, headers=auth_headers_student)
+        etag = first.headers["etag"]
+
+        cached = await client.post(
+            "/users/lookup", json=body, headers={**auth_headers_student, "If-None-Match": etag}
+        )
+        wildcard = await client.post(
+            "/users/lookup", json=body, headers={**auth_headers_student, "If-None-Match": "*"}
+        )
+
+        # POST — небезопасный метод: совпадение предусловия даёт 412, а не 304
+        assert cached.status_code == 412
+        assert cached.headers["etag"] == etag
+        assert cached.content == b""
+        assert wildcard.status_code == 412
+
+    async def test_too_many_ids_rejected(self, client: AsyncClient, auth_headers_student: dict):
+        ids = [str(uuid.uuid4()) for _ in range(501)]
+        response = await client.post(
+            "/users/lookup", json={"ids": ids}, headers=auth_headers_student
+        )
+        assert response.status_code == 422
+
+    async def test_requires_authentication(self, client: AsyncClient):
+        response = await client.post("/users/lookup", json={"ids": [str(uuid.uuid4())]})
+        assert response.status_code == 401
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.modules.users.search import escape_like, search_statement
+
+
+@pytest.mark.unit
+class TestUserSearchStatement:
+    def test_like_wildcards_are_literal(self):
+        assert escape_like("50%_off\\") == "50\\%\\_off\\\\"
+
+    def test_candidates_use_trigram_friendly_predicates(self):
+        compiled = search_statement("alice", 20).compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        assert "UNION" in sql
+        assert "users.username ILIKE" in sql
+        assert "user_profiles.display_name ILIKE" in sql
+        assert "users.username %%" in sql
+        assert "%alice%" in compiled.params.values()
+
+    def test_prefix_matches_rank_first(self):
+        compiled = search_statement("ali", 20).compile(dialect=postgresql.dialect())
+        order_by = str(compiled).split("ORDER BY", 1)[1]
+
+        assert order_by.lstrip().startswith("CASE WHEN")
+        assert "similarity(users.username" in order_by
+        assert "ali%" in compiled.params.values()
+
+
+@pytest.mark.users
+class TestUserSearchEndpoint:
+    async def test_short_query_rejected(self, client, auth_headers_admin: dict):
+        response = await client.get("/users/search?q=al", headers=auth_headers_admin)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "query_too_short"
+
+    async def test_prefix_match_first(self, client, auth_headers_admin: dict, admin_user):
+        response = await client.get(
+            f"/users/search?q={admin_user.username[:4]}", headers=auth_headers_admin
+        )
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert items[0]["login"].startswith(admin_user.username[:4])
+
+    async def test_requires_admin(self, client, auth_headers_student: dict):
+        response = await client.get("/users/search?q=alice", headers=auth_headers_student)
+
+        assert response.status_code == 403
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.modules.users import status_cache as status_cache_module
+from app.modules.users.status_cache import UserStatus, UserStatusCache
+
+
+def make_status(role_id: uuid.UUID | None = None, is_active: bool = True) -> UserStatus:
+    return UserStatus(
+        user_id=uuid.uuid4(),
+        is_active=is_active,
+        role_id=role_id or uuid.uuid4(),
+        role_slug="student",
+        updated_at=None,
+    )
+
+
+@pytest.mark.unit
+class TestUserStatusCache:
+    def test_hit_and_miss_counters(self):
+        cache = UserStatusCache(maxsize=10, ttl=60)
+        status = make_status()
+
+        assert cache.get(status.user_id) is None
+        cache.set(status)
+        assert cache.get(status.user_id) == status
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        now = [10.0]
+        monkeypatch.setattr(status_cache_module.time, "monotonic", lambda: now[0])
+        cache = UserStatusCache(maxsize=10, ttl=5)
+        status = make_status()
+        cache.set(status)
+
+        now[0] += 6
+
+        assert cache.get(status.user_id) is None
+        assert cache.stats()["size"] == 0
+
+    def test_lru_bound(self):
+        cache = UserStatusCache(maxsize=2, ttl=60)
+        first, second, third = make_status(), make_status(), make_status()
+        for status in (first, second, third):
+            cache.set(status)
+
+        assert cache.get(first.user_id) is None
+        assert cache.get(third.user_id) == third
+
+    def test_invalidate_user(self):
+        cache = UserStatusCache(maxsize=10, ttl=60)
+        status, other = make_status(), make_status()
+        cache.set(status)
+        cache.set(other)
+
+        cache.invalidate_user(status.user_id)
+
+        assert cache.get(status.user_id) is None
+        assert cache.get(other.user_id) == other
+
+    def test_invalidate_role(self):
+        cache = UserStatusCache(maxsize=10, ttl=60)
+        role_id = uuid.uuid4()
+        teachers = [make_status(role_id) for _ in range(3)]
+        student = make_status()
+        for status in (*teachers, student):
+            cache.set(status)
+
+        cache.invalidate_role(role_id)
+
+        assert all(cache.get(status.user_id) is None for status in teachers)
+        assert cache.get(student.user_id) == student
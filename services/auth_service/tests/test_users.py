@@ -177,6 +177,65 @@ class TestUsersList:
         )
         assert response.status_code == 422
 
+    @pytest.mark.parametrize("order_by", ["email", "created_at", "verified"])
+    async def test_list_users_cursor_walks_all_pages(
+        self,
+        client: AsyncClient,
+        auth_headers_admin: dict,
+        admin_user: User,
+        student_user: User,
+        order_by: str,
+    ):
+        full = await client.get(
+            f"/users/?order_by={order_by}&order=asc&limit=100", headers=auth_headers_admin
+        )
+        expected = [u["id"] for u in full.json()["items"]]
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            url = f"/users/?order_by={order_by}&order=asc&limit=1&count=none"
+            if cursor:
+                url += f"&cursor={cursor}"
+            data = (await client.get(url, headers=auth_headers_admin)).json()
+            assert data["total"] is None
+            seen += [u["id"] for u in data["items"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == expected
+
+    async def test_list_users_cursor_from_other_order_rejected(
+        self,
+        client: AsyncClient,
+        auth_headers_admin: dict,
+        admin_user: User,
+        student_user: User,
+    ):
+        first = await client.get("/users/?limit=1", headers=auth_headers_admin)
+        cursor = first.json()["next_cursor"]
+
+        response = await client.get(
+            f"/users/?order_by=email&cursor={cursor}", headers=auth_headers_admin
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "cursor_order_mismatch"
+
+    async def test_list_users_estimated_count(
+        self,
+        client: AsyncClient,
+        auth_headers_admin: dict,
+        admin_user: User,
+    ):
+        response = await client.get(
+            f"/users/?count=estimate&q={admin_user.username}", headers=auth_headers_admin
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == "estimate"
+        assert isinstance(data["total"], int)
+
     async def test_list_users_includes_profile_data(
         self,
         client: AsyncClient,
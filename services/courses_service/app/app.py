@@ -1,14 +1,18 @@
+import logging
 import os
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from learning_platform_common.logging import setup_logging
 
 from app.api.main_router import main_router
 from app.common.db.base import Base
 from app.common.db.session import engine
 from app.middleware.auth import setup_auth_middleware
 
+logger = logging.getLogger(__name__)
+
 
 def try_pycharm_attach() -> None:
   if os.getenv("PYCHARM_ATTACH", "0").lower() in ("1", "true", "yes"):
@@ -23,12 +27,13 @@ def try_pycharm_attach() -> None:
         suspend=False,
         trace_only_current_thread=False,
       )
-      print(f"[debug] ✅ Attached to PyCharm at {host}:{port}")
+      logger.info("PyCharm debugger attached at %s:%s", host, port)
     except Exception as e:
-      print(f"[debug] ❌ Failed to attach to PyCharm: {e}")
+      logger.warning("Failed to attach to PyCharm: %s", e)
 
 
 def create_app() -> FastAPI:
+  setup_logging("courses_service")
   try_pycharm_attach()
 
   app = FastAPI(
@@ -48,7 +53,7 @@ def create_app() -> FastAPI:
     async with engine.begin() as conn:
       #await conn.run_sync(Base.metadata.drop_all)
       await conn.run_sync(Base.metadata.create_all)
-    print("[DB] ✅ Tables created or already exist.")
+    logger.info("Tables created or already exist")
 
   async def course_validation_handler(request, exc: RequestValidationError):
     errors = exc.errors()
@@ -16,6 +16,15 @@ class Settings(BaseSettings):
   auth_issuer: str | None = Field(alias="AUTH_ISSUER", default=None)
   auth_audience: str | None = Field(alias="AUTH_AUDIENCE", default=None)
 
+  access_cache_maxsize: int = Field(alias="ACCESS_CACHE_MAXSIZE", default=10_000)
+  access_cache_ttl: float = Field(alias="ACCESS_CACHE_TTL", default=30.0)
+
+  course_tree_cache_maxsize: int = Field(alias="COURSE_TREE_CACHE_MAXSIZE", default=500)
+  course_tree_cache_ttl: float = Field(alias="COURSE_TREE_CACHE_TTL", default=60.0)
+
+  # одна пачка — один INSERT; держим число параметров далеко от лимита Postgres (65535)
+  bulk_insert_max_rows: int = Field(alias="BULK_INSERT_MAX_ROWS", default=1000)
+
   model_config = {
     "env_file": "courses_service.env",
     "case_sensitive": True,
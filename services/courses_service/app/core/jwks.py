@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSUnavailableError(Exception):
+  """Ключи ещё ни разу не были получены, а auth-сервис недоступен."""
+
+
+class AsyncJWKSProvider:
+  """
+  Асинхронный поставщик ключей подписи из JWKS auth-сервиса.
+
+  Ключи хранятся уже разобранными (PyJWK), поэтому запрос к защищённому
+  эндпоинту не делает ни сетевых вызовов, ни парсинга. Набор обновляется
+  фоновой задачей незадолго до истечения ttl; параллельные промахи
+  (неизвестный kid, пустой кэш) ждут одну общую загрузку. Если auth-сервис
+  недоступен, продолжаем отдавать последний полученный набор.
+  """
+
+  def __init__(
+    self,
+    url: str,
+    ttl: float = 300.0,
+    refresh_margin: float = 30.0,
+    min_refresh_interval: float = 10.0,
+    timeout: float = 5.0,
+    fetch: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+  ):
+    self.url = url
+    self.ttl = ttl
+    self.refresh_margin = refresh_margin
+    self.min_refresh_interval = min_refresh_interval
+    self.timeout = timeout
+    self._fetch = fetch or self._fetch_http
+
+    self._keys: dict[str | None, jwt.PyJWK] = {}
+    self._fetched_at = 0.0
+    self._expires_at = 0.0
+    self._last_attempt = 0.0
+    self._inflight: asyncio.Task | None = None
+    self._refresher: asyncio.Task | None = None
+
+  @property
+  def is_stale(self) -> bool:
+    return time.monotonic() >= self._expires_at
+
+  async def get_signing_key(self, kid: str | None) -> Any:
+    return (await self.get_jwk(kid)).key
+
+  async def get_jwk(self, kid: str | None) -> jwt.PyJWK:
+    """Разобранный JWK: объект ключа плюс алгоритм, которым им подписывают."""
+    if not self._keys:
+      await self.refresh()
+    elif kid is not None and kid not in self._keys:
+      # ключи могли ротировать — перечитываем, но не чаще min_refresh_interval
+      if time.monotonic() - self._last_attempt >= self.min_refresh_interval:
+        await self.refresh()
+    elif self.is_stale:
+      self._refresh_in_background()
+
+    key = self._keys.get(kid) if kid is not None else None
+    if key is None:
+      if not self._keys:
+        raise jwt.InvalidTokenError("No signing keys available")
+      key = next(iter(self._keys.values()))
+    return key
+
+  async def refresh(self) -> None:
+    """Загрузить JWKS; одновременные вызовы разделяют одну загрузку."""
+    if self._inflight is None or self._inflight.done():
+      self._inflight = asyncio.create_task(self._load())
+    try:
+      await asyncio.shield(self._inflight)
+    except Exception as err:
+      if not self._keys:
+        raise JWKSUnavailableError(str(err)) from err
+      logger.warning("JWKS refresh failed, serving stale keys: %s", err)
+
+  def start(self) -> None:
+    if self._refresher is None or self._refresher.done():
+      self._refresher = asyncio.create_task(self._refresh_loop())
+
+  async def stop(self) -> None:
+    for task in (self._refresher, self._inflight):
+      if task is not None and not task.done():
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+          await task
+    self._refresher = None
+    self._inflight = None
+
+  def _refresh_in_background(self) -> None:
+    if self._inflight is None or self._inflight.done():
+      self._inflight = asyncio.create_task(self._load())
+      self._inflight.add_done_callback(_consume_exception)
+
+  async def _refresh_loop(self) -> None:
+    failures = 0
+    while True:
+      if self._keys:
+        delay = max(self._expires_at - self.refresh_margin - time.monotonic(), 0.0)
+      else:
+        delay = 0.0
+      if failures:
+        delay = min(2.0**failures, self.ttl)
+      await asyncio.sleep(delay)
+
+      fetched_at = self._fetched_at
+      with contextlib.suppress(JWKSUnavailableError):
+        await self.refresh()
+      failures = 0 if self._fetched_at != fetched_at else failures + 1
+
+  async def _load(self) -> None:
+    self._last_attempt = time.monotonic()
+    data = await self._fetch()
+    keys = _parse_jwks(data)
+    if not keys:
+      raise jwt.InvalidTokenError("JWKS contains no usable signing keys")
+
+    self._keys = keys
+    self._fetched_at = time.monotonic()
+    self._expires_at = self._fetched_at + self.ttl
+
+  async def _fetch_http(self) -> dict[str, Any]:
+    async with httpx.AsyncClient(timeout=self.timeout) as client:
+      response = await client.get(self.url)
+      response.raise_for_status()
+      return response.json()
+
+
+def _parse_jwks(data: dict[str, Any]) -> dict[str | None, jwt.PyJWK]:
+  keys: dict[str | None, jwt.PyJWK] = {}
+  for jwk in data.get("keys", []) or []:
+    try:
+      key = jwt.PyJWK.from_dict(jwk)
+    except jwt.exceptions.PyJWKError:
+      continue
+    keys[key.key_id] = key
+  return keys
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+  if not task.cancelled() and task.exception() is not None:
+    logger.warning("Background JWKS refresh failed: %s", task.exception())
@@ -1,15 +1,11 @@
 # app/core/security.py
 from __future__ import annotations
 
-import base64
 import time
 from typing import Any
 
 import httpx
 import jwt
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyCookie
 
@@ -20,12 +16,16 @@ class _JWKS:
     keys: dict[str, Any] | None = None
     exp_at: float = 0.0
     ttl: int = 300  # 5 минут
+    # внеочередное перечитывание при неизвестном kid — не чаще раза в столько секунд
+    min_refresh_interval: int = 10
+    fetched_at: float = 0.0
 
 
-async def _get_jwks() -> dict[str, Any]:
+async def _get_jwks(force: bool = False) -> dict[str, Any]:
     now = time.time()
     if _JWKS.keys is not None and now < _JWKS.exp_at:
-        return _JWKS.keys  # type: ignore[return-value]
+        if not force or now - _JWKS.fetched_at < _JWKS.min_refresh_interval:
+            return _JWKS.keys  # type: ignore[return-value]
 
     async with httpx.AsyncClient(timeout=5) as c:
         r = await c.get(settings.auth_jwks_url)
@@ -33,18 +33,18 @@ async def _get_jwks() -> dict[str, Any]:
         data = r.json()
 
     _JWKS.keys = data
+    _JWKS.fetched_at = now
     _JWKS.exp_at = now + _JWKS.ttl
     return data
 
 
-def _rsa_pub_from_n_e(n_b64: str, e_b64: str) -> bytes:
-    n = int.from_bytes(base64.urlsafe_b64decode(n_b64 + "=="), "big")
-    e = int.from_bytes(base64.urlsafe_b64decode(e_b64 + "=="), "big")
-    pub = rsa.RSAPublicNumbers(e, n).public_key(default_backend())
-    return pub.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
+def _public_key_from_jwk(key: dict[str, Any]) -> tuple[Any, str]:
+    # RSA, EC (ES256) и OKP (EdDSA) — алгоритм берём из самого JWK
+    try:
+        jwk = jwt.PyJWK.from_dict(key)
+    except jwt.exceptions.PyJWKError as err:
+        raise jwt.InvalidTokenError("bad_jwk") from err
+    return jwk.key, jwk.algorithm_name
 
 
 async def verify_jwt(token: str) -> dict[str, Any]:
@@ -60,6 +60,10 @@ async def verify_jwt(token: str) -> dict[str, Any]:
 
   if kid:
     key = next((k for k in keys if k.get("kid") == kid), None)
+    if not key:
+      # ключ могли ротировать после того, как мы закэшировали JWKS
+      keys = (await _get_jwks(force=True)).get("keys", []) or []
+      key = next((k for k in keys if k.get("kid") == kid), None)
     if not key:
       raise jwt.InvalidTokenError("kid_not_found")
   else:
@@ -69,12 +73,12 @@ async def verify_jwt(token: str) -> dict[str, Any]:
     else:
       raise jwt.InvalidTokenError("missing_kid")
 
-  pub_pem = _rsa_pub_from_n_e(key["n"], key["e"])
+  public_key, alg = _public_key_from_jwk(key)
 
   payload = jwt.decode(
     token,
-    pub_pem,
-    algorithms=[key.get("alg", "RS256")],
+    public_key,
+    algorithms=[alg],
     issuer=settings.auth_issuer,
     options={"require": ["exp", "iat", "iss"]},
   )
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
 import os
-from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Annotated
 
 import jwt
 from fastapi import Depends, HTTPException, Request
+from learning_platform_common.logging import RequestContextMiddleware, update_request_context
+from learning_platform_common.revocations import RevocationFeed
 from learning_platform_common.utils import ResponseUtils
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import HTTPConnection
 from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.jwks import AsyncJWKSProvider, JWKSUnavailableError
 
 AUTH_JWKS_URL = os.getenv("AUTH_JWKS_URL")
 AUTH_ISSUER = os.getenv("AUTH_ISSUER")
 AUTH_AUDIENCE = os.getenv("AUTH_AUDIENCE")
-AUTH_ALG = os.getenv("AUTH_ALG", "RS256")
+# алгоритмы, которые принимаем от auth-сервиса; конкретный берётся из JWK ключа
+AUTH_ALGORITHMS = frozenset(
+  alg.strip() for alg in os.getenv("AUTH_ALGORITHMS", "RS256,ES256,EdDSA").split(",") if alg.strip()
+)
+# лента отзыва auth-сервиса: токены, выданные до смены пароля/роли, отклоняем без запроса в auth
+AUTH_REVOCATIONS_URL = os.getenv("AUTH_REVOCATIONS_URL")
+REVOCATION_FEED_TOKEN = os.getenv("REVOCATION_FEED_TOKEN")
+REVOCATION_POLL_INTERVAL = float(os.getenv("REVOCATION_POLL_INTERVAL", "5"))
 
 PUBLIC_PATHS = {
   "/",
@@ -25,78 +36,106 @@ PUBLIC_PATHS = {
 "/courses",
 }
 
-_jwks_client: jwt.PyJWKClient | None = None
+_jwks_provider: AsyncJWKSProvider | None = None
+_revocation_feed: RevocationFeed | None = None
 
 
-def _get_jwks_client() -> jwt.PyJWKClient:
-  global _jwks_client
-  if _jwks_client is None:
+def _get_jwks_provider() -> AsyncJWKSProvider:
+  global _jwks_provider
+  if _jwks_provider is None:
     if not AUTH_JWKS_URL:
       raise RuntimeError("AUTH_JWKS_URL is not configured")
-    _jwks_client = jwt.PyJWKClient(AUTH_JWKS_URL)
-  return _jwks_client
+    _jwks_provider = AsyncJWKSProvider(AUTH_JWKS_URL)
+  return _jwks_provider
+
+
+def _get_revocation_feed() -> RevocationFeed | None:
+  global _revocation_feed
+  if _revocation_feed is None and AUTH_REVOCATIONS_URL:
+    _revocation_feed = RevocationFeed(
+      AUTH_REVOCATIONS_URL,
+      interval=REVOCATION_POLL_INTERVAL,
+      token=REVOCATION_FEED_TOKEN,
+    )
+  return _revocation_feed
 
 
-def _extract_bearer_token(request: Request) -> str | None:
-  auth_header = request.headers.get("authorization")
+def _extract_bearer_token(conn: HTTPConnection) -> str | None:
+  auth_header = conn.headers.get("authorization")
   if auth_header:# and auth_header.lower().startswith("bearer "):
-    res = auth_header#.split(" ", 1)[1].strip()
-    print(res)
-    return res
-  return request.cookies.get("access_token")
+    return auth_header#.split(" ", 1)[1].strip()
+  return conn.cookies.get("access_token")
 
 
-def _is_public(request: Request) -> bool:
-  if request.method.upper() == "OPTIONS":
+def _is_public(scope: Scope) -> bool:
+  if scope["method"].upper() == "OPTIONS":
     return True
-  path = request.url.path.rstrip("/") or "/"
+  path = scope["path"].rstrip("/") or "/"
   return path in PUBLIC_PATHS
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-  async def dispatch(
-    self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-  ) -> Response:
-    if _is_public(request):
-      return await call_next(request)
-
-    token = _extract_bearer_token(request)
-    if not token:
-      return JSONResponse(ResponseUtils.error("access_required"), status_code=401)
-
-    try:
-      jwks_client = _get_jwks_client()
-      try:
-        signing_key = jwks_client.get_signing_key_from_jwt(token).key
-      except jwt.exceptions.PyJWKClientError:
-        signing_keys = jwks_client.get_signing_keys()
-        if not signing_keys:
-          raise jwt.InvalidTokenError("No signing keys available")
-        signing_key = signing_keys[0].key
-
-      payload = jwt.decode(
-        token,
-        key=signing_key,
-        algorithms=[AUTH_ALG],
-        issuer=AUTH_ISSUER,
-      )
-    except jwt.ExpiredSignatureError:
-      return JSONResponse(ResponseUtils.error("token_expired"), status_code=401)
-    except jwt.InvalidTokenError:
-      return JSONResponse(ResponseUtils.error("token_invalid"), status_code=401)
-    except jwt.exceptions.PyJWKClientConnectionError:
-      return JSONResponse(
-        ResponseUtils.error("auth_service_unavailable"), status_code=503
-      )
-
-    if payload.get("type") != "access":
-      return JSONResponse(ResponseUtils.error("not_access"), status_code=401)
-
-    request.state.auth_payload = payload
-    request.state.auth_role = payload.get("role")
-    request.state.auth_user_id = payload.get("sub")
-
-    return await call_next(request)
+def _deny(message: str, status_code: int = 401) -> JSONResponse:
+  return JSONResponse(ResponseUtils.error(message), status_code=status_code)
+
+
+async def authenticate(conn: HTTPConnection) -> Response | None:
+  """Проверить токен и заполнить conn.state (scope["state"]); вернуть отказ или None."""
+  token = _extract_bearer_token(conn)
+  if not token:
+    return _deny("access_required")
+
+  try:
+    kid = jwt.get_unverified_header(token).get("kid")
+    jwk = await _get_jwks_provider().get_jwk(kid)
+    if jwk.algorithm_name not in AUTH_ALGORITHMS:
+      raise jwt.InvalidAlgorithmError(jwk.algorithm_name)
+
+    payload = jwt.decode(
+      token,
+      key=jwk.key,
+      algorithms=[jwk.algorithm_name],
+      issuer=AUTH_ISSUER,
+    )
+  except jwt.ExpiredSignatureError:
+    return _deny("token_expired")
+  except jwt.InvalidTokenError:
+    return _deny("token_invalid")
+  except JWKSUnavailableError:
+    return _deny("auth_service_unavailable", status_code=503)
+
+  if payload.get("type") != "access":
+    return _deny("not_access")
+
+  feed = _get_revocation_feed()
+  if feed is not None and feed.is_revoked(payload.get("sub"), payload.get("iat")):
+    return _deny("token_revoked")
+
+  conn.state.auth_payload = payload
+  conn.state.auth_role = payload.get("role")
+  conn.state.auth_user_id = payload.get("sub")
+  # без sub в логи не пишем строку "None"
+  if payload.get("sub") is not None:
+    update_request_context(user_id=str(payload["sub"]))
+  return None
+
+
+class AuthMiddleware:
+  """Чистый ASGI-middleware: без обёрток BaseHTTPMiddleware вокруг каждого запроса."""
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http" or _is_public(scope):
+      await self.app(scope, receive, send)
+      return
+
+    denied = await authenticate(HTTPConnection(scope))
+    if denied is not None:
+      await denied(scope, receive, send)
+      return
+
+    await self.app(scope, receive, send)
 
 
 @dataclass
@@ -126,5 +165,24 @@ def require_roles(*roles: str):
   return _checker
 
 
+async def _start_background_refresh() -> None:
+  if AUTH_JWKS_URL:
+    _get_jwks_provider().start()
+  feed = _get_revocation_feed()
+  if feed is not None:
+    feed.start()
+
+
+async def _stop_background_refresh() -> None:
+  if _jwks_provider is not None:
+    await _jwks_provider.stop()
+  if _revocation_feed is not None:
+    await _revocation_feed.stop()
+
+
 def setup_auth_middleware(app) -> None:
   app.add_middleware(AuthMiddleware)
+  # добавлен последним => внешний: контекст логов есть и у отказов авторизации
+  app.add_middleware(RequestContextMiddleware)
+  app.router.add_event_handler("startup", _start_background_refresh)
+  app.router.add_event_handler("shutdown", _stop_background_refresh)
@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from app.core.config import settings
+
+AccessKey = tuple[UUID, UUID, str]
+
+
+class AccessCache:
+    """
+    Кэш решений о доступе пользователя к курсу в памяти процесса.
+
+    Ключ — (user_id, course_id, role), значение — разрешён ли доступ.
+    Размер ограничен (LRU), записи живут не дольше ttl секунд. Репозитории
+    курсов и назначений сбрасывают затронутые записи сразу после commit.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[AccessKey, tuple[float, bool]] = OrderedDict()
+        self._by_course: dict[UUID, set[AccessKey]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: UUID, course_id: UUID, role: str) -> bool | None:
+        key = (user_id, course_id, role)
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user_id: UUID, course_id: UUID, role: str, allowed: bool) -> None:
+        if self.maxsize <= 0:
+            return
+
+        key = (user_id, course_id, role)
+        self._entries[key] = (time.monotonic() + self.ttl, allowed)
+        self._entries.move_to_end(key)
+        self._by_course.setdefault(course_id, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def invalidate_user_course(self, user_id: UUID, course_id: UUID) -> None:
+        for key in [key for key in self._by_course.get(course_id, ()) if key[0] == user_id]:
+            self._drop(key)
+
+    def invalidate_course(self, course_id: UUID) -> None:
+        for key in list(self._by_course.get(course_id, ())):
+            self._drop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_course.clear()
+        # статистика относится к сброшенному содержимому
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def _drop(self, key: AccessKey) -> None:
+        self._entries.pop(key, None)
+        keys = self._by_course.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_course[key[1]]
+
+
+access_cache = AccessCache(
+    maxsize=settings.access_cache_maxsize,
+    ttl=settings.access_cache_ttl,
+)
@@ -0,0 +1,278 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from app.core.config import settings
+from app.modules.courses.models_import import Course
+from app.modules.courses.schemas.CourseTreeScheme import (
+    AnswerTreeNode,
+    CourseTreeResponse,
+    LessonTreeNode,
+    QuestionTreeNode,
+    TestTreeNode,
+)
+
+FULL = "full"
+STUDENT = "student"
+
+# студенту не отдаём правильные ответы
+STUDENT_EXCLUDE = {
+    "lessons": {"__all__": {"test": {"questions": {"__all__": {"answers": {"__all__": {"is_correct"}}}}}}}
+}
+
+
+@dataclass(frozen=True)
+class TreeSnapshot:
+    """
+    Готовые тела ответа дерева курса.
+
+    id / author_id / delete_flg повторяют поля курса, чтобы снимок можно было
+    передать в check_course_access вместо Course и не ходить в базу на попадании.
+    """
+
+    id: UUID
+    author_id: UUID
+    version: int
+    # вариант (FULL / STUDENT) -> (тело, ETag)
+    bodies: dict[str, tuple[bytes, str]]
+    # id всех уроков/тестов/вопросов/ответов дерева
+    members: frozenset[UUID]
+    delete_flg: bool = False
+
+    def body(self, variant: str) -> tuple[bytes, str]:
+        return self.bodies[variant]
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _by_order(items):
+    return sorted(items, key=lambda item: item.order_index)
+
+
+def build_tree(course: Course) -> tuple[CourseTreeResponse, set[UUID]]:
+    """
+    Дерево из курса, загруженного CourseRepository.get_tree: удалённые узлы
+    отфильтрованы запросом, здесь только сортировка по order_index.
+    """
+    members: set[UUID] = set()
+    lessons = []
+
+    for lesson in _by_order(course.lesson):
+        members.add(lesson.id)
+        test_node = None
+
+        # lesson_id у теста уникален, связь объявлена списком
+        for test in lesson.test[:1]:
+            members.add(test.id)
+            questions = []
+
+            for question in _by_order(test.question):
+                members.add(question.id)
+                answers = []
+
+                for answer in _by_order(question.answer):
+                    members.add(answer.id)
+                    answers.append(AnswerTreeNode.model_validate(answer))
+
+                questions.append(
+                    QuestionTreeNode(
+                        id=question.id,
+                        text=question.text,
+                        question_type=question.question_type,
+                        order_index=question.order_index,
+                        score=question.score,
+                        answers=answers,
+                    )
+                )
+
+            test_node = TestTreeNode(
+                id=test.id,
+                title=test.title,
+                description=test.description,
+                is_active=test.is_active,
+                questions=questions,
+            )
+
+        lessons.append(
+            LessonTreeNode(
+                id=lesson.id,
+                title=lesson.title,
+                short_description=lesson.short_description,
+                content_type=lesson.content_type,
+                order_index=lesson.order_index,
+                text_content=lesson.text_content,
+                content_url=lesson.content_url,
+                test=test_node,
+            )
+        )
+
+    tree = CourseTreeResponse(
+        id=course.id,
+        title=course.title,
+        description=course.description,
+        level=course.level,
+        author_id=course.author_id,
+        is_published=course.is_published,
+        update_at=course.update_at,
+        lessons=lessons,
+    )
+    return tree, members
+
+
+def build_snapshot(course: Course, version: int) -> TreeSnapshot:
+    tree, members = build_tree(course)
+
+    full = tree.model_dump_json().encode()
+
+    # студент видит только активные тесты и не видит is_correct
+    student_tree = tree.model_copy(
+        update={
+            "lessons": [
+                lesson if lesson.test is None or lesson.test.is_active
+                else lesson.model_copy(update={"test": None})
+                for lesson in tree.lessons
+            ]
+        }
+    )
+    student = student_tree.model_dump_json(exclude=STUDENT_EXCLUDE).encode()
+
+    return TreeSnapshot(
+        id=course.id,
+        author_id=course.author_id,
+        version=version,
+        bodies={FULL: (full, make_etag(full)), STUDENT: (student, make_etag(student))},
+        members=frozenset(members),
+    )
+
+
+class CourseTreeCache:
+    """
+    Сериализованное дерево курса (уроки → тест → вопросы → ответы) в памяти процесса.
+
+    Хранятся уже готовые тела ответа, поэтому повторное открытие курса не
+    делает ни запросов, ни сериализации. Записи живут не дольше ttl (другие
+    воркеры пишут мимо этого кэша) и сбрасываются репозиториями курсов,
+    уроков, тестов, вопросов и ответов сразу после commit: по id затронутой
+    сущности или её родителя курс находится через обратный индекс.
+
+    Каждый сброс увеличивает generation и запоминает его у сброшенных id
+    (_changed). Снимок помнит generation на начало загрузки и не попадает в
+    кэш, только если за время загрузки менялся сам курс или один из его
+    узлов, — правки других курсов параллельную загрузку не отбрасывают.
+    _changed ограничен log_size: снимок старше вытесненной записи считается
+    устаревшим.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, log_size: int = 10_000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.log_size = log_size
+        self._entries: OrderedDict[UUID, tuple[float, TreeSnapshot]] = OrderedDict()
+        self._owner: dict[UUID, UUID] = {}
+        # id курса или узла -> generation его последнего сброса
+        self._changed: OrderedDict[UUID, int] = OrderedDict()
+        self._floor = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_fills = 0
+
+    def get(self, course_id: UUID) -> TreeSnapshot | None:
+        entry = self._entries.get(course_id)
+
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._drop(course_id)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(course_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, snapshot: TreeSnapshot) -> None:
+        if self.maxsize <= 0:
+            return
+
+        if self._changed_since(snapshot):
+            self.stale_fills += 1
+            return
+
+        self._drop(snapshot.id)
+        self._entries[snapshot.id] = (time.monotonic() + self.ttl, snapshot)
+        self._owner[snapshot.id] = snapshot.id
+        for member in snapshot.members:
+            self._owner[member] = snapshot.id
+
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def invalidate(self, *ids: UUID | None) -> None:
+        """Сбросить деревья, в которых есть хоть один из ids (курс, урок, тест, вопрос, ответ)."""
+        self.generation += 1
+
+        for i in ids:
+            if i is not None:
+                self._changed[i] = self.generation
+                self._changed.move_to_end(i)
+        while len(self._changed) > self.log_size:
+            _, dropped = self._changed.popitem(last=False)
+            self._floor = max(self._floor, dropped)
+
+        for course_id in {self._owner.get(i) for i in ids if i is not None} - {None}:
+            self._drop(course_id)
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._floor = self.generation
+        self._entries.clear()
+        self._owner.clear()
+        self._changed.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "indexed_ids": len(self._owner),
+            "changed_ids": len(self._changed),
+            "generation": self.generation,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stale_fills": self.stale_fills,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+    def _changed_since(self, snapshot: TreeSnapshot) -> bool:
+        # новые узлы сбрасываются по id родителя, а он уже есть в members
+        if snapshot.version < self._floor:
+            return True
+        changed = self._changed
+        return any(
+            changed.get(i, 0) > snapshot.version for i in (snapshot.id, *snapshot.members)
+        )
+
+    def _drop(self, course_id: UUID) -> None:
+        entry = self._entries.pop(course_id, None)
+
+        if entry is None:
+            return
+
+        self._owner.pop(course_id, None)
+        for member in entry[1].members:
+            if self._owner.get(member) == course_id:
+                del self._owner[member]
+
+
+course_tree_cache = CourseTreeCache(
+    maxsize=settings.course_tree_cache_maxsize,
+    ttl=settings.course_tree_cache_ttl,
+)
@@ -32,7 +32,7 @@ class Question(Base):
   update_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
   test = relationship("Test", back_populates="question")
-  answer = relationship("Answer", back_populates="question", cascade="all, delete-orphan")
+  answer = relationship("Answer", back_populates="question", cascade="all, delete-orphan", order_by="Answer.order_index")
 
   __table_args__ = (
     UniqueConstraint('test_id', 'order_index', name='uq_question_order_per_test'),
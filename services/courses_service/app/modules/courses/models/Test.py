@@ -24,4 +24,4 @@ class Test(Base):
     update_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     lesson = relationship("Lesson", back_populates="test", uselist=False)
-    question = relationship("Question", back_populates="test", cascade="all, delete-orphan")
+    question = relationship("Question", back_populates="test", cascade="all, delete-orphan", order_by="Question.order_index")
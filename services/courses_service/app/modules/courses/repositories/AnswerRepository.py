@@ -1,3 +1,4 @@
+from collections.abc import Iterable
 from datetime import datetime
 from uuid import UUID
 
@@ -6,6 +7,7 @@ from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.db.session import get_session
+from app.modules.courses.course_tree import course_tree_cache
 from app.modules.courses.models.Answer import Answer
 from app.modules.courses.models.Course import Course
 from app.modules.courses.models.CourseUser import CourseUser
@@ -13,26 +15,26 @@ from app.modules.courses.models.Lesson import Lesson
 from app.modules.courses.models.Question import Question
 from app.modules.courses.models.Test import Test
 
+from .BulkInsertRepository import BulkInsertRepository, BulkInsertResult
+
 class AnswerRepository:
   def __init__(self, db: AsyncSession):
     self.db = db
+    self.bulk_insert = BulkInsertRepository(db)
 
   async def create(self, answer_data: dict) -> Answer:
     answer = Answer(**answer_data)
     self.db.add(answer)
     await self.db.commit()
+    course_tree_cache.invalidate(answer.question_id)
     await self.db.refresh(answer)
     return answer
 
-  async def create_bulk(self, answers_data: list[dict]) -> list[Answer]:
-    answers = [Answer(**data) for data in answers_data]
-    self.db.add_all(answers)
-    await self.db.commit()
-
-    for answer in answers:
-      await self.db.refresh(answer)
-
-    return answers
+  async def create_bulk(self, answers_data: list[dict]) -> BulkInsertResult:
+    # order_index ответов задаёт автор; совпавшие с существующими — в conflicts
+    result = await self.bulk_insert.insert(Answer, answers_data)
+    course_tree_cache.invalidate(*{answer.question_id for answer in result.inserted})
+    return result
 
   async def get_by_id(self, id: UUID, delete_flg: bool) -> Answer | None:
     query = select(Answer).where(Answer.id == id)
@@ -114,6 +116,7 @@ class AnswerRepository:
 
     answer.update_at = datetime.utcnow()
     await self.db.commit()
+    course_tree_cache.invalidate(answer_id, answer.question_id)
     await self.db.refresh(answer)
     return answer
 
@@ -126,6 +129,7 @@ class AnswerRepository:
     answer.delete_flg = True
     answer.update_at = datetime.utcnow()
     await self.db.commit()
+    course_tree_cache.invalidate(answer_id)
     return True
 
   async def hard_delete(self, answer_id: UUID) -> bool:
@@ -136,6 +140,7 @@ class AnswerRepository:
 
     await self.db.delete(answer)
     await self.db.commit()
+    course_tree_cache.invalidate(answer_id)
     return True
 
   async def get_assigned_to_create_by_user(self, user_id: UUID, question_id: UUID, type: str):
@@ -174,9 +179,9 @@ class AnswerRepository:
       )
     return query
 
-  async def get_assigned_to_user(self, user_id: UUID, answer_id: UUID, type: str):
-    query = (
-      select(Answer)
+  def assigned_query(self, columns, condition):
+    return (
+      select(columns)
       .join(Question, Question.id == Answer.question_id)
       .join(Test, Test.id == Question.test_id)
       .join(Lesson, Lesson.id == Test.lesson_id)
@@ -189,16 +194,30 @@ class AnswerRepository:
           Test.is_active == True,
           Test.delete_flg == False,
           Question.delete_flg == False,
-          Answer.id == answer_id,
+          condition,
           Answer.delete_flg == False,
         )
       )
     )
 
+  async def get_assigned_to_user(self, user_id: UUID, answer_id: UUID, type: str):
+    query = self.assigned_query(Answer, Answer.id == answer_id)
+
     query = await self.subquery(query, user_id, type)
     result = await self.db.execute(query)
     return result.scalar_one_or_none()
 
+  async def get_assigned_ids_to_user(self, user_id: UUID, answer_ids: Iterable[UUID], type: str) -> set[UUID]:
+    query = self.assigned_query(Answer.id, Answer.id.in_(list(answer_ids)))
+
+    query = await self.subquery(query, user_id, type)
+    result = await self.db.execute(query)
+    return set(result.scalars().all())
+
+  async def get_by_ids(self, ids: Iterable[UUID]) -> list[Answer]:
+    result = await self.db.execute(select(Answer).where(Answer.id.in_(list(ids))))
+    return result.scalars().all()
+
   async def count_by_question(self, question_id: UUID, delete_flg: bool | None) -> int:
     query = select(func.count(Answer.id)).where(Answer.question_id == question_id)
 
@@ -0,0 +1,76 @@
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class BulkInsertResult:
+  # вставленные объекты в порядке входных строк
+  inserted: list = field(default_factory=list)
+  # строки, упёршиеся в уникальное ограничение; если не пусто — пачка не вставлена
+  conflicts: list[dict] = field(default_factory=list)
+
+
+class BulkInsertRepository:
+  """
+  Пакетная вставка содержимого курса: одна пачка — один
+  INSERT ... VALUES (...), (...) ON CONFLICT DO NOTHING RETURNING и один commit,
+  без refresh на каждую строку.
+
+  Если передан order_by (внешний ключ на родителя), order_index назначается
+  в том же INSERT: подзапрос max(order_index) родителя + позиция строки во
+  входе, как при одиночном create. Пачка вставляется целиком или никак:
+  если RETURNING вернул не все строки, транзакция откатывается. При
+  назначаемом порядке это обычно гонка с параллельной вставкой в того же
+  родителя — пачка повторяется с новым max (до max_attempts раз).
+  """
+
+  max_attempts = 3
+
+  def __init__(self, db: AsyncSession):
+    self.db = db
+
+  def build_statement(self, model: type, rows: list[dict], order_by=None):
+    values = []
+    position: Counter = Counter()
+
+    for row in rows:
+      row = dict(row)
+      if order_by is not None:
+        parent_id = row[order_by.key]
+        position[parent_id] += 1
+        row["order_index"] = (
+          select(func.coalesce(func.max(model.order_index), -1) + position[parent_id])
+          .where(order_by == parent_id)
+          .scalar_subquery()
+        )
+      values.append(row)
+
+    return insert(model).values(values).on_conflict_do_nothing().returning(model)
+
+  async def insert(self, model: type, rows: list[dict], order_by=None) -> BulkInsertResult:
+    if not rows:
+      return BulkInsertResult()
+
+    attempts = self.max_attempts if order_by is not None else 1
+    for _ in range(attempts):
+      # id задаём сами, чтобы сопоставить RETURNING со входом
+      batch = [{**row, "id": uuid.uuid4()} for row in rows]
+      result = await self.db.scalars(
+        self.build_statement(model, batch, order_by),
+        execution_options={"populate_existing": True},
+      )
+      inserted = {obj.id: obj for obj in result.all()}
+
+      if len(inserted) == len(batch):
+        await self.db.commit()
+        return BulkInsertResult(inserted=[inserted[row["id"]] for row in batch])
+
+      await self.db.rollback()
+
+    conflicts = [row for row, sent in zip(rows, batch) if sent["id"] not in inserted]
+    return BulkInsertResult(conflicts=conflicts)
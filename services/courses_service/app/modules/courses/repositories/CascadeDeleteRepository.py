@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select, update
+from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.courses.models.Answer import Answer
@@ -11,89 +11,93 @@ from app.modules.courses.models.CourseUser import CourseUser
 from app.modules.courses.models.Lesson import Lesson
 from app.modules.courses.models.Question import Question
 from app.modules.courses.models.Test import Test
-from app.modules.courses.models_import import *
 
 
 class CascadeDeleteRepository:
+  """
+  Каскадное мягкое удаление (и восстановление) дерева курса.
+
+  Каждый уровень иерархии обновляется одним UPDATE с условием
+  `fk IN (SELECT id ...)` по родительскому уровню, поэтому число запросов
+  зависит только от глубины дерева, а не от количества уроков/вопросов.
+  Все строки одного каскада получают одинаковый update_at — по нему
+  restore отличает их от записей, удалённых раньше по отдельности.
+  """
+
+  # (модель, внешний ключ на предыдущий уровень)
+  hierarchy: tuple[tuple[type, object], ...] = (
+    (Course, None),
+    (Lesson, Lesson.course_id),
+    (Test, Test.lesson_id),
+    (Question, Question.test_id),
+    (Answer, Answer.question_id),
+  )
+  leaf_dependencies: dict[type, tuple[tuple[type, object], ...]] = {
+    Course: (
+      (CourseUser, CourseUser.course_id),
+      (CourseReview, CourseReview.course_id),
+    ),
+  }
+
   def __init__(self, db: AsyncSession):
     self.db = db
-    self.course_dependencies: dict[type, object] = {
-      CourseUser: CourseUser.course_id,
-      CourseReview: CourseReview.course_id,
-      Lesson: Lesson.course_id,
-    }
-    self.lesson_dependencies: dict[type, object] = {
-      Test: Test.lesson_id,
-    }
-    self.test_dependencies: dict[type, object] = {
-      Question: Question.test_id,
-    }
-    self.question_dependencies: dict[type, object] = {
-      Answer: Answer.question_id,
-    }
-
-  async def _soft_delete_by_id(
-    self,
-    model: type,
-    obj_id: UUID,
-    delete_flg: bool = True,
-  ):
-    stmt = (
-      update(model)
-      .where(model.id == obj_id)
-      .values(delete_flg=delete_flg, update_at=datetime.utcnow())
-    )
-    await self.db.execute(stmt)
-
-  async def _soft_delete_by_fk(self, model, fk_column, fk_id: UUID, delete_flg: bool = True):
-    stmt = (
-      update(model)
-      .where(fk_column == fk_id)
-      .values(delete_flg=delete_flg, update_at=datetime.utcnow())
-    )
-
-    await self.db.execute(stmt)
 
-  async def delete_question(self, question_id: UUID):
-    await self._soft_delete_by_id(Question, question_id)
+  def _build_statements(self, root: type, root_id: UUID, matches) -> list:
+    level = next(i for i, (model, _) in enumerate(self.hierarchy) if model is root)
 
-    for model, fk in self.question_dependencies.items():
-      await self._soft_delete_by_fk(model, fk, question_id)
+    root_cond = and_(root.id == root_id, matches(root))
+    statements = [update(root).where(root_cond)]
+    parent_ids = select(root.id).where(root_cond)
 
-  async def delete_test(self, test_id: UUID):
-    await self._soft_delete_by_id(Test, test_id)
+    for model, fk in self.hierarchy[level + 1 :]:
+      cond = and_(fk.in_(parent_ids), matches(model))
+      statements.append(update(model).where(cond))
+      parent_ids = select(model.id).where(cond)
 
-    question_ids = await self.db.scalars(
-      select(Question.id).where(Question.test_id == test_id, Question.delete_flg == False)
-    )
+    for model, fk in self.leaf_dependencies.get(root, ()):
+      statements.append(update(model).where(fk == root_id, matches(model)))
 
-    for question_id in question_ids:
-      await self.delete_question(question_id)
+    return statements
 
-  async def delete_lesson(self, lesson_id: UUID):
-    await self._soft_delete_by_id(Lesson, lesson_id)
+  async def _cascade(self, root: type, root_id: UUID, delete_flg: bool):
+    if delete_flg:
+
+      def matches(model):
+        return model.delete_flg.is_(False)
 
-    test_ids = await self.db.scalars(
-      select(Test.id).where(Test.lesson_id == lesson_id, Test.delete_flg == False)
-    )
+    else:
+      stamp = select(root.update_at).where(root.id == root_id).scalar_subquery()
 
-    for test_id in test_ids:
-      await self.delete_test(test_id)
+      def matches(model):
+        return and_(model.delete_flg.is_(True), model.update_at == stamp)
+
+    now = datetime.utcnow()
+
+    # снизу вверх: родители меняются последними, пока дочерние уровни
+    # ещё отбираются по их текущему состоянию
+    for stmt in reversed(self._build_statements(root, root_id, matches)):
+      await self.db.execute(stmt.values(delete_flg=delete_flg, update_at=now))
+
+  async def delete_question(self, question_id: UUID):
+    await self._cascade(Question, question_id, delete_flg=True)
+
+  async def delete_test(self, test_id: UUID):
+    await self._cascade(Test, test_id, delete_flg=True)
+
+  async def delete_lesson(self, lesson_id: UUID):
+    await self._cascade(Lesson, lesson_id, delete_flg=True)
 
   async def delete_course(self, course_id: UUID):
-    # курс
-    await self._soft_delete_by_id(Course, course_id)
-
-    # простые зависимости курса
-    for model, fk in self.course_dependencies.items():
-      if model is Lesson:
-        continue
-      await self._soft_delete_by_fk(model, fk, course_id)
-
-    # уроки курса (глубокий каскад)
-    lesson_ids = await self.db.scalars(
-      select(Lesson.id).where(Lesson.course_id == course_id, Lesson.delete_flg == False)
-    )
-
-    for lesson_id in lesson_ids:
-      await self.delete_lesson(lesson_id)
+    await self._cascade(Course, course_id, delete_flg=True)
+
+  async def restore_question(self, question_id: UUID):
+    await self._cascade(Question, question_id, delete_flg=False)
+
+  async def restore_test(self, test_id: UUID):
+    await self._cascade(Test, test_id, delete_flg=False)
+
+  async def restore_lesson(self, lesson_id: UUID):
+    await self._cascade(Lesson, lesson_id, delete_flg=False)
+
+  async def restore_course(self, course_id: UUID):
+    await self._cascade(Course, course_id, delete_flg=False)
@@ -0,0 +1,115 @@
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.db.session import get_session
+from app.modules.courses import search
+from app.modules.courses.models_import import Course, CourseReview, CourseUser, Lesson, Question, Test
+
+SEARCH_TYPES = ("course", "lesson", "test", "question", "review")
+SNIPPET_LENGTH = 200
+
+
+class CatalogSearchRepository:
+  """
+  Поиск по каталогу сразу по всем типам содержимого.
+
+  Один UNION ALL по таблицам из search.SEARCH_DOCUMENTS, каждая ветка идёт
+  по своему GIN-индексу; общая сортировка по ts_rank и LIMIT — в том же
+  запросе. Доступ проверяется не после выборки, а в самом запросе:
+  каждая ветка ограничена подзапросом курсов, доступных пользователю, по
+  тем же правилам, что get_assigned_ids_to_user у CourseRepository.
+  """
+
+  def __init__(self, db: AsyncSession):
+    self.db = db
+
+  def accessible_courses(self, user_id: UUID, role: str):
+    query = select(Course.id).where(Course.delete_flg == False)
+
+    if role == "admin":
+      return query
+
+    if role == "teacher":
+      return query.where(Course.author_id == user_id)
+
+    return query.join(CourseUser, CourseUser.course_id == Course.id).where(
+      and_(
+        CourseUser.user_id == user_id,
+        CourseUser.is_active == True,
+        CourseUser.delete_flg == False,
+        Course.is_published == True,
+      )
+    )
+
+  def _branch(self, type_: str, model, course_id, title, tsquery, *joins, conditions=()):
+    query = select(
+      literal(type_).label("type"),
+      model.id.label("id"),
+      course_id.label("course_id"),
+      func.left(title, SNIPPET_LENGTH).label("title"),
+      search.rank(model, tsquery).label("rank"),
+    ).select_from(model)
+
+    for target, on in joins:
+      query = query.join(target, on)
+
+    return query.where(search.matches(model, tsquery), model.delete_flg == False, *conditions)
+
+  def build_statement(self, user_id: UUID, role: str, search_term: str, types, limit: int):
+    tsquery = search.to_tsquery(search_term)
+    courses = self.accessible_courses(user_id, role)
+    student = role not in ("admin", "teacher")
+
+    branches = {
+      "course": lambda: self._branch(
+        "course", Course, Course.id, Course.title, tsquery,
+        conditions=(Course.id.in_(courses),),
+      ),
+      "lesson": lambda: self._branch(
+        "lesson", Lesson, Lesson.course_id, Lesson.title, tsquery,
+        conditions=(Lesson.course_id.in_(courses),),
+      ),
+      "test": lambda: self._branch(
+        "test", Test, Lesson.course_id, Test.title, tsquery,
+        (Lesson, Lesson.id == Test.lesson_id),
+        conditions=(
+          Lesson.course_id.in_(courses),
+          Lesson.delete_flg == False,
+          *((Test.is_active == True,) if student else ()),
+        ),
+      ),
+      "question": lambda: self._branch(
+        "question", Question, Lesson.course_id, Question.text, tsquery,
+        (Test, Test.id == Question.test_id),
+        (Lesson, Lesson.id == Test.lesson_id),
+        conditions=(
+          Lesson.course_id.in_(courses),
+          Lesson.delete_flg == False,
+          Test.delete_flg == False,
+          *((Test.is_active == True,) if student else ()),
+        ),
+      ),
+      "review": lambda: self._branch(
+        "review", CourseReview, CourseReview.course_id, CourseReview.comment, tsquery,
+        conditions=(
+          CourseReview.course_id.in_(courses),
+          *((CourseReview.is_published == True,) if student else ()),
+        ),
+      ),
+    }
+
+    hits = union_all(*(branches[type_]() for type_ in types)).subquery()
+    return select(hits).order_by(hits.c.rank.desc(), hits.c.type, hits.c.id).limit(limit)
+
+  async def search(self, user_id: UUID, role: str, search_term: str, types, limit: int) -> list[dict]:
+    result = await self.db.execute(self.build_statement(user_id, role, search_term, types, limit))
+    return [dict(row) for row in result.mappings().all()]
+
+
+async def get_catalog_search_repository(
+  db: AsyncSession = Depends(get_session),
+) -> CatalogSearchRepository:
+  return CatalogSearchRepository(db)
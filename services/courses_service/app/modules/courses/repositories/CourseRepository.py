@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from datetime import datetime
 
 from fastapi import Depends
@@ -7,9 +7,11 @@ from sqlalchemy import select, update,and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.courses.models_import import Course, CourseUser,Lesson,CourseReview
+from app.modules.courses.models_import import Course, CourseUser,Lesson,CourseReview,Test,Question,Answer
 from app.modules.courses.enums import CourseLevel
 from app.common.db.session import get_session
+from app.modules.courses.access_cache import access_cache
+from app.modules.courses.course_tree import course_tree_cache
 from .CascadeDeleteRepository import CascadeDeleteRepository
 
 
@@ -88,24 +90,85 @@ class CourseRepository:
 
       return result.scalars().all()
 
-  async def get_assigned_to_user(self, user_id: UUID, course_id:UUID, type:str = None):
+  async def get_assigned_to_user(self, user_id: UUID, course_id:UUID, type:str = None) -> bool:
+      # доступ студента к курсу; type оставлен для совместимости с другими репозиториями
+      allowed = await self.get_assigned_ids_to_user(user_id, [course_id], "student")
+      return course_id in allowed
+
+  async def get_assigned_ids_to_user(self, user_id: UUID, course_ids: Iterable[UUID], type: str) -> set[UUID]:
+      role = "teacher" if type == "teacher" else "student"
+      allowed, missing = set(), []
+
+      for course_id in set(course_ids):
+          cached = access_cache.get(user_id, course_id, role)
+          if cached is None:
+              missing.append(course_id)
+          elif cached:
+              allowed.add(course_id)
+
+      if not missing:
+          return allowed
+
+      query = select(Course.id).where(Course.id.in_(missing))
+
+      if role == "teacher":
+          query = query.where(
+              and_(
+                  Course.author_id == user_id,
+                  Course.delete_flg == False,
+              )
+          )
+      else:
+          query = (
+              query
+              .join(CourseUser, CourseUser.course_id == Course.id)
+              .where(
+                  and_(
+                      CourseUser.user_id == user_id,
+                      CourseUser.is_active == True,
+                      Course.delete_flg == False,
+                      CourseUser.delete_flg == False,
+                      Course.is_published == True,
+                  )
+              )
+          )
+
+      result = await self.db.execute(query)
+      found = set(result.scalars().all())
+
+      for course_id in missing:
+          access_cache.set(user_id, course_id, role, course_id in found)
+
+      return allowed | found
+
+  async def get_tree(self, course_id: UUID) -> Optional[Course]:
+      # курс и всё содержимое за пять запросов при любом размере курса:
+      # по одному SELECT ... IN на уровень, удалённые узлы отсекаются в запросе
       query = (
           select(Course)
-          .join(CourseUser, CourseUser.course_id == Course.id)
           .where(
               and_(
-                  CourseUser.user_id == user_id,
-                  CourseUser.is_active == True,
+                  Course.id == course_id,
                   Course.delete_flg == False,
-                  CourseUser.delete_flg == False,
-                  Course.is_published == True,
-                  Course.id == course_id
               )
           )
+          .options(
+              selectinload(Course.lesson.and_(Lesson.delete_flg == False))
+              .selectinload(Lesson.test.and_(Test.delete_flg == False))
+              .selectinload(Test.question.and_(Question.delete_flg == False))
+              .selectinload(Question.answer.and_(Answer.delete_flg == False))
+          )
+          # коллекции уже загруженных в сессию объектов без фильтра перечитываются
+          .execution_options(populate_existing=True)
       )
+
       result = await self.db.execute(query)
       return result.scalar_one_or_none()
 
+  async def get_by_ids(self, ids: Iterable[UUID]) -> List[Course]:
+      result = await self.db.execute(select(Course).where(Course.id.in_(list(ids))))
+      return result.scalars().all()
+
   async def update(self, course_id: UUID, course_data: dict) -> Optional[Course]:
       course = await self.get_by_id(course_id,False)
 
@@ -118,6 +181,8 @@ class CourseRepository:
 
       course.update_at = datetime.utcnow()
       await self.db.commit()
+      access_cache.invalidate_course(course_id)
+      course_tree_cache.invalidate(course_id)
       await self.db.refresh(course)
       return course
 
@@ -130,11 +195,29 @@ class CourseRepository:
       try:
         await self.cascade_delete.delete_course(course_id)
         await self.db.commit()
+        access_cache.invalidate_course(course_id)
+        course_tree_cache.invalidate(course_id)
         return True
       except Exception as e:
         await self.db.rollback()
         raise
 
+  async def restore(self, course_id: UUID) -> bool:
+      course = await self.get_by_id(course_id, delete_flg=True)
+
+      if not course:
+          return False
+
+      try:
+        await self.cascade_delete.restore_course(course_id)
+        await self.db.commit()
+        access_cache.invalidate_course(course_id)
+        course_tree_cache.invalidate(course_id)
+        return True
+      except Exception:
+        await self.db.rollback()
+        raise
+
   async def hard_delete(self, course_id: UUID) -> bool:
       course = await self.get_by_id(course_id, None)
 
@@ -143,6 +226,8 @@ class CourseRepository:
 
       await self.db.delete(course)
       await self.db.commit()
+      access_cache.invalidate_course(course_id)
+      course_tree_cache.invalidate(course_id)
       return True
 
   async def unpublish(self, course_id: UUID) -> Optional[Course]:
@@ -153,6 +238,8 @@ class CourseRepository:
 
       course.is_published = False
       await self.db.commit()
+      access_cache.invalidate_course(course_id)
+      course_tree_cache.invalidate(course_id)
       return course
 
 
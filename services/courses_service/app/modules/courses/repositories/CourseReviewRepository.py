@@ -3,11 +3,12 @@ from datetime import datetime
 
 from uuid import UUID
 from fastapi import Depends
-from sqlalchemy import select, and_, or_, func, case
+from sqlalchemy import select, and_, func, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.courses.models_import import CourseReview
 from app.common.db.session import get_session
+from app.modules.courses import search
 
 
 class CourseReviewRepository:
@@ -190,10 +191,11 @@ class CourseReviewRepository:
         return distribution
 
     async def search_in_comments(self, course_id: UUID, search_term: str, delete_flg: bool | None, skip: int = 0, limit: int = 100) -> List[CourseReview]:
+        tsquery = search.to_tsquery(search_term)
         query = select(CourseReview).where(
             and_(
                 CourseReview.course_id == course_id,
-                CourseReview.comment.ilike(f"%{search_term}%")
+                search.matches(CourseReview, tsquery)
             )
         )
 
@@ -213,7 +215,7 @@ class CourseReviewRepository:
             )
 
         query = (
-            query.order_by(CourseReview.create_at.desc())
+            query.order_by(search.rank(CourseReview, tsquery).desc(), CourseReview.create_at.desc())
             .offset(skip)
             .limit(limit)
         )
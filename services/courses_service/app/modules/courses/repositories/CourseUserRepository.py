@@ -9,6 +9,7 @@ from fastapi import Depends
 
 from app.modules.courses.models_import import CourseUser,Course
 from app.common.db.session import get_session
+from app.modules.courses.access_cache import access_cache
 
 
 
@@ -20,6 +21,7 @@ class CourseUserRepository:
         course_student = CourseUser(**course_data_data)
         self.db.add(course_student)
         await self.db.commit()
+        access_cache.invalidate_user_course(course_student.user_id, course_student.course_id)
         await self.db.refresh(course_student)
         return course_student
 
@@ -125,12 +127,15 @@ class CourseUserRepository:
         if not course_student:
             return None
 
+        old_key = (course_student.user_id, course_student.course_id)
         for key, value in course_student_data.items():
             if hasattr(course_student, key):
               setattr(course_student, key, value)
 
         course_student.update_at = datetime.utcnow()
         await self.db.commit()
+        access_cache.invalidate_user_course(*old_key)
+        access_cache.invalidate_user_course(course_student.user_id, course_student.course_id)
         await self.db.refresh(course_student)
         return course_student
 
@@ -145,6 +150,7 @@ class CourseUserRepository:
         course_student.update_at = datetime.utcnow()
 
         await self.db.commit()
+        access_cache.invalidate_user_course(course_student.user_id, course_student.course_id)
         return True
 
     async def hard_delete(self, course_student_id: UUID) -> bool:
@@ -153,8 +159,10 @@ class CourseUserRepository:
         if not course_student:
             return False
 
+        user_id, course_id = course_student.user_id, course_student.course_id
         await self.db.delete(course_student)
         await self.db.commit()
+        access_cache.invalidate_user_course(user_id, course_id)
         return True
 
     async def activate(self, id: UUID) -> Optional[CourseUser]:
@@ -165,6 +173,7 @@ class CourseUserRepository:
 
         course_student.is_active = True
         await self.db.commit()
+        access_cache.invalidate_user_course(course_student.user_id, course_student.course_id)
         return course_student
 
     async def deactivate(self, id: UUID) -> Optional[CourseUser]:
@@ -175,6 +184,7 @@ class CourseUserRepository:
 
         course_student.is_active = False
         await self.db.commit()
+        access_cache.invalidate_user_course(course_student.user_id, course_student.course_id)
         return course_student
 
     async def get_all(self, delete_flg: bool | None, skip: int, limit: int) -> List[CourseUser]:
@@ -1,14 +1,17 @@
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from datetime import datetime
 
 from uuid import UUID
 from fastapi import Depends
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.modules.courses.models_import import Lesson
 from app.modules.courses.enums import ContentType
 from app.common.db.session import get_session
+from app.modules.courses import search
+from app.modules.courses.course_tree import course_tree_cache
+from .BulkInsertRepository import BulkInsertRepository, BulkInsertResult
 from .CascadeDeleteRepository import CascadeDeleteRepository
 
 
@@ -16,14 +19,22 @@ class LessonRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.cascade_delete = CascadeDeleteRepository(db)
+        self.bulk_insert = BulkInsertRepository(db)
 
     async def create(self, lesson_data: dict) -> Lesson:
         lesson = Lesson(**lesson_data)
         self.db.add(lesson)
         await self.db.commit()
+        course_tree_cache.invalidate(lesson.course_id)
         await self.db.refresh(lesson)
         return lesson
 
+    async def create_bulk(self, lessons_data: List[dict]) -> BulkInsertResult:
+        # order_index — следом за последним уроком курса, в порядке входа
+        result = await self.bulk_insert.insert(Lesson, lessons_data, order_by=Lesson.course_id)
+        course_tree_cache.invalidate(*{lesson.course_id for lesson in result.inserted})
+        return result
+
     async def get_by_id(self, id: UUID,  delete_flg: bool | None) -> Optional[Lesson]:
         query = select(Lesson).where(Lesson.id == id)
 
@@ -34,6 +45,10 @@ class LessonRepository:
 
         return result.scalar_one_or_none()
 
+    async def get_by_ids(self, ids: Iterable[UUID]) -> List[Lesson]:
+        result = await self.db.execute(select(Lesson).where(Lesson.id.in_(list(ids))))
+        return result.scalars().all()
+
     async def get_by_course_id(self, course_id: UUID, delete_flg: bool | None, skip: int, limit: int) -> List[Lesson]:
         query = select(Lesson).where(Lesson.course_id == course_id)
 
@@ -110,6 +125,7 @@ class LessonRepository:
 
         lesson.update_at = datetime.utcnow()
         await self.db.commit()
+        course_tree_cache.invalidate(lesson_id, lesson.course_id)
         await self.db.refresh(lesson)
         return lesson
 
@@ -122,11 +138,27 @@ class LessonRepository:
         try:
           await self.cascade_delete.delete_lesson(lesson_id)
           await self.db.commit()  # ⬅ один commit
+          course_tree_cache.invalidate(lesson_id)
           return True
         except Exception as e:
           await self.db.rollback()
           raise
 
+    async def restore(self, lesson_id: UUID) -> bool:
+        lesson = await self.get_by_id(lesson_id, delete_flg=True)
+
+        if not lesson:
+            return False
+
+        try:
+          await self.cascade_delete.restore_lesson(lesson_id)
+          await self.db.commit()
+          course_tree_cache.invalidate(lesson.course_id)
+          return True
+        except Exception:
+          await self.db.rollback()
+          raise
+
     async def hard_delete(self, lesson_id: UUID) -> bool:
         lesson = await self.get_by_id(lesson_id,None)
 
@@ -135,24 +167,22 @@ class LessonRepository:
 
         await self.db.delete(lesson)
         await self.db.commit()
+        course_tree_cache.invalidate(lesson_id)
         return True
 
     async def search_in_course(self, course_id: UUID, search_term: str, delete_flg: bool | None,skip: int, limit: int) -> List[Lesson]:
+        tsquery = search.to_tsquery(search_term)
         query = select(Lesson).where(
             and_(
                 Lesson.course_id == course_id,
-                or_(
-                    Lesson.title.ilike(f"%{search_term}%"),
-                    Lesson.short_description.ilike(f"%{search_term}%"),
-                    Lesson.text_content.ilike(f"%{search_term}%")
-                )
+                search.matches(Lesson, tsquery)
             )
         )
         if delete_flg is not None:
             query = query.where(Lesson.delete_flg == delete_flg)
 
         query = (
-            query.order_by(Lesson.order_index)
+            query.order_by(search.rank(Lesson, tsquery).desc(), Lesson.order_index)
             .offset(skip)
             .limit(limit)
         )
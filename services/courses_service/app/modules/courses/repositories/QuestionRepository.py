@@ -3,12 +3,16 @@ from datetime import datetime
 
 from uuid import UUID
 from fastapi import Depends
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, func
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.courses.models_import import Question,Test
+from app.modules.courses.models_import import Question,Test,Answer
 from app.modules.courses.enums import QuestionType
 from app.common.db.session import get_session
+from app.modules.courses import search
+from app.modules.courses.course_tree import course_tree_cache
+from .BulkInsertRepository import BulkInsertRepository, BulkInsertResult
 from .CascadeDeleteRepository import CascadeDeleteRepository
 
 
@@ -16,23 +20,21 @@ class QuestionRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.cascade_delete = CascadeDeleteRepository(db)
+        self.bulk_insert = BulkInsertRepository(db)
 
     async def create(self, question_data: dict) -> Question:
         question = Question(**question_data)
         self.db.add(question)
         await self.db.commit()
+        course_tree_cache.invalidate(question.test_id)
         await self.db.refresh(question)
         return question
 
-    async def create_bulk(self, questions_data: List[dict]) -> List[Question]:
-        questions = [Question(**data) for data in questions_data]
-        self.db.add_all(questions)
-        await self.db.commit()
-
-        for question in questions:
-          await self.db.refresh(question)
-
-        return questions
+    async def create_bulk(self, questions_data: List[dict]) -> BulkInsertResult:
+        # order_index — следом за последним вопросом теста, в порядке входа
+        result = await self.bulk_insert.insert(Question, questions_data, order_by=Question.test_id)
+        course_tree_cache.invalidate(*{question.test_id for question in result.inserted})
+        return result
 
     async def get_by_id(self, id: UUID, delete_flg: bool) -> Optional[Question]:
         query = select(Question).where(Question.id == id)
@@ -44,6 +46,26 @@ class QuestionRepository:
 
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def with_answers_query(question_id: UUID, delete_flg: bool | None):
+        # вопрос и ответы — два запроса при любом числе ответов
+        query = select(Question).where(Question.id == question_id)
+        answers = Question.answer
+
+        if delete_flg is not None:
+            query = query.where(Question.delete_flg == delete_flg)
+            answers = answers.and_(Answer.delete_flg == delete_flg)
+
+        return (
+            query
+            .options(selectinload(answers))
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_with_answers(self, question_id: UUID, delete_flg: bool | None) -> Optional[Question]:
+        result = await self.db.execute(self.with_answers_query(question_id, delete_flg))
+        return result.scalar_one_or_none()
+
     async def get_by_test_id(self, test_id: UUID, delete_flg: bool | None, skip: int = 0, limit: int = 100) -> List[Question]:
         query = select(Question).where(Question.test_id == test_id)
 
@@ -109,17 +131,18 @@ class QuestionRepository:
         return max_order if max_order is not None else -1
 
     async def search_in_test(self, test_id: UUID, search_term: str, delete_flg: bool | None,skip: int, limit: int ) -> List[Question]:
+        tsquery = search.to_tsquery(search_term)
         query = select(Question).where(
             and_ (
                 Question.test_id == test_id,
-                Question.text.ilike(f"%{search_term}%")
+                search.matches(Question, tsquery)
             )
         )
 
         if delete_flg is not None:
             query = query.where(Question.delete_flg == delete_flg)
+        query = query.order_by(search.rank(Question, tsquery).desc(), Question.order_index)
         query = query.offset(skip).limit(limit)
-        query = query.order_by(Question.order_index)
 
         result = await self.db.execute(query)
         return result.scalars().all()
@@ -147,6 +170,7 @@ class QuestionRepository:
 
         question.update_at = datetime.utcnow()
         await self.db.commit()
+        course_tree_cache.invalidate(question_id, question.test_id)
         await self.db.refresh(question)
         return question
 
@@ -159,11 +183,27 @@ class QuestionRepository:
         try:
           await self.cascade_delete.delete_question(question_id)
           await self.db.commit()  # ⬅ один commit
+          course_tree_cache.invalidate(question_id)
           return True
         except Exception as e:
           await self.db.rollback()
           raise
 
+    async def restore(self, question_id: UUID) -> bool:
+        question = await self.get_by_id(question_id, delete_flg=True)
+
+        if not question:
+            return False
+
+        try:
+          await self.cascade_delete.restore_question(question_id)
+          await self.db.commit()
+          course_tree_cache.invalidate(question.test_id)
+          return True
+        except Exception:
+          await self.db.rollback()
+          raise
+
     async def hard_delete(self, question_id: UUID) -> bool:
         question = await self.get_by_id(question_id, None)
 
@@ -172,6 +212,7 @@ class QuestionRepository:
 
         await self.db.delete(question)
         await self.db.commit()
+        course_tree_cache.invalidate(question_id)
         return True
 
 
@@ -1,13 +1,17 @@
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from datetime import datetime
 
 from uuid import UUID
 from fastapi import Depends
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_
+from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.modules.courses.models_import import Test,Lesson,Course,CourseUser
+from app.modules.courses.models_import import Test,Lesson,Course,CourseUser,Question,Answer
 from app.common.db.session import get_session
+from app.modules.courses import search
+from app.modules.courses.course_tree import course_tree_cache
+from .BulkInsertRepository import BulkInsertRepository, BulkInsertResult
 from .CascadeDeleteRepository import CascadeDeleteRepository
 
 
@@ -15,11 +19,13 @@ class TestRepository:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.cascade_delete = CascadeDeleteRepository(db)
+        self.bulk_insert = BulkInsertRepository(db)
 
     async def create(self, test_data: dict) -> Test:
         test = Test(**test_data)
         self.db.add(test)
         await self.db.commit()
+        course_tree_cache.invalidate(test.lesson_id)
         await self.db.refresh(test)
         return test
 
@@ -33,6 +39,35 @@ class TestRepository:
 
         return result.scalar_one_or_none()
 
+    async def create_bulk(self, tests_data: List[dict]) -> BulkInsertResult:
+        # у урока один тест: занятые lesson_id возвращаются в conflicts
+        result = await self.bulk_insert.insert(Test, tests_data)
+        course_tree_cache.invalidate(*{test.lesson_id for test in result.inserted})
+        return result
+
+    @staticmethod
+    def with_questions_query(test_id: UUID, delete_flg: bool | None):
+        # тест, вопросы и ответы — три запроса при любом размере теста
+        # (по SELECT ... IN на уровень), порядок задан order_by связей
+        query = select(Test).where(Test.id == test_id)
+        questions = Test.question
+        answers = Question.answer
+
+        if delete_flg is not None:
+            query = query.where(Test.delete_flg == delete_flg)
+            questions = questions.and_(Question.delete_flg == delete_flg)
+            answers = answers.and_(Answer.delete_flg == delete_flg)
+
+        return (
+            query
+            .options(selectinload(questions).selectinload(answers))
+            .execution_options(populate_existing=True)
+        )
+
+    async def get_with_questions(self, test_id: UUID, delete_flg: bool | None) -> Optional[Test]:
+        result = await self.db.execute(self.with_questions_query(test_id, delete_flg))
+        return result.scalar_one_or_none()
+
     async def get_by_lesson_id(self, lesson_id: UUID, delete_flg: bool | None, skip: int = 0, limit: int = 100) -> List[Test]:
         query = select(Test).where(Test.lesson_id == lesson_id)
 
@@ -66,6 +101,7 @@ class TestRepository:
 
         test.is_active = True
         await self.db.commit()
+        course_tree_cache.invalidate(test_id)
         return test
 
     async def deactivate(self, test_id: UUID) -> Optional[Test]:
@@ -76,6 +112,7 @@ class TestRepository:
 
         test.is_active = False
         await self.db.commit()
+        course_tree_cache.invalidate(test_id)
         return test
 
     async def get_all_active(self, delete_flg: bool, skip: int = 0, limit: int = 100) -> List[Test]:
@@ -121,6 +158,7 @@ class TestRepository:
 
         test.update_at = datetime.utcnow()
         await self.db.commit()
+        course_tree_cache.invalidate(test_id, test.lesson_id)
         await self.db.refresh(test)
         return test
 
@@ -133,11 +171,27 @@ class TestRepository:
         try:
           await self.cascade_delete.delete_test(test_id)
           await self.db.commit()
+          course_tree_cache.invalidate(test_id)
           return True
         except Exception as e:
           await self.db.rollback()
           raise
 
+    async def restore(self, test_id: UUID) -> bool:
+        test = await self.get_by_id(test_id, delete_flg=True)
+
+        if not test:
+            return False
+
+        try:
+          await self.cascade_delete.restore_test(test_id)
+          await self.db.commit()
+          course_tree_cache.invalidate(test.lesson_id)
+          return True
+        except Exception:
+          await self.db.rollback()
+          raise
+
     async def hard_delete(self, test_id: UUID) -> bool:
         test = await self.get_by_id(test_id,None)
 
@@ -146,20 +200,19 @@ class TestRepository:
 
         await self.db.delete(test)
         await self.db.commit()
+        course_tree_cache.invalidate(test_id)
         return True
 
     async def search(self, search_term: str,delete_flg: bool | None, skip: int = 0, limit: int = 100) -> List[Test]:
-        query = select(Test).where(
-            or_(
-                Test.title.ilike(f"%{search_term}%"),
-                Test.description.ilike(f"%{search_term}%")
-            )
-        )
+        tsquery = search.to_tsquery(search_term)
+        query = select(Test).where(search.matches(Test, tsquery))
+
         if delete_flg is not None:
             query = query.where(Test.delete_flg == delete_flg)
 
         query = (
-            query.offset(skip)
+            query.order_by(search.rank(Test, tsquery).desc())
+            .offset(skip)
             .limit(limit)
         )
 
@@ -185,6 +238,25 @@ class TestRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_assigned_ids_to_create_by_user(self, user_id: UUID, lesson_ids: Iterable[UUID], type: str) -> set[UUID]:
+        query = (
+            select(Lesson.id)
+            .join(Course, Course.id == Lesson.course_id)
+            .where(
+                and_(
+                    Course.delete_flg == False,
+                    Course.is_published == True,
+
+                    Lesson.delete_flg == False,
+                    Lesson.id.in_(list(lesson_ids))
+                )
+            )
+        )
+
+        query = await self.subquery(query, user_id, type)
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
     async def subquery(self, query, user_id: UUID, type: str):
         if type == "teacher":
             query = query.where(Course.author_id == user_id)
@@ -202,9 +274,9 @@ class TestRepository:
             )
         return query
 
-    async def get_assigned_to_user(self,user_id: UUID,test_id: UUID,type:str)-> Optional[Test]:
-        query = (
-            select(Test)
+    def assigned_query(self, columns, condition):
+        return (
+            select(columns)
             .join(Lesson, Lesson.id == Test.lesson_id)
             .join(Course, Course.id == Lesson.course_id)
             .where(
@@ -214,17 +286,31 @@ class TestRepository:
 
                   Lesson.delete_flg == False,
 
-                  Test.id == test_id,
+                  condition,
                   Test.is_active == True,
                   Test.delete_flg == False,
                 )
             )
         )
+
+    async def get_assigned_to_user(self,user_id: UUID,test_id: UUID,type:str)-> Optional[Test]:
+        query = self.assigned_query(Test, Test.id == test_id)
         query = await self.subquery(query, user_id, type)
 
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_assigned_ids_to_user(self, user_id: UUID, test_ids: Iterable[UUID], type: str) -> set[UUID]:
+        query = self.assigned_query(Test.id, Test.id.in_(list(test_ids)))
+        query = await self.subquery(query, user_id, type)
+
+        result = await self.db.execute(query)
+        return set(result.scalars().all())
+
+    async def get_by_ids(self, ids: Iterable[UUID]) -> List[Test]:
+        result = await self.db.execute(select(Test).where(Test.id.in_(list(ids))))
+        return result.scalars().all()
+
 
 async def get_test_repository(
     db: AsyncSession = Depends(get_session),
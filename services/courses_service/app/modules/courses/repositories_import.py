@@ -5,6 +5,7 @@ from  .repositories.QuestionRepository import QuestionRepository, get_question_r
 from  .repositories.AnswerRepository import AnswerRepository, get_answer_repository
 from  .repositories.CourseReviewRepository import CourseReviewRepository, get_course_review_repository
 from  .repositories.CourseUserRepository import CourseUserRepository, get_course_user_repository
+from  .repositories.CatalogSearchRepository import CatalogSearchRepository, get_catalog_search_repository
 
 
 __all__ = [
@@ -14,5 +15,6 @@ __all__ = [
 "QuestionRepository", "get_question_repository",
 "AnswerRepository", "get_answer_repository",
 "CourseReviewRepository", "get_course_review_repository",
-"CourseUserRepository", "get_course_user_repository"
+"CourseUserRepository", "get_course_user_repository",
+"CatalogSearchRepository", "get_catalog_search_repository"
 ]
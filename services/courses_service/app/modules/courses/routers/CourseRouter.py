@@ -1,11 +1,21 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Security
+from fastapi import APIRouter, Depends, Query, Request, Response, Security
+from learning_platform_common.http import etag_matches
 
 from app.common.deps.auth import CurrentUser, get_current_user
+from app.modules.courses.access_cache import access_cache
+from app.modules.courses.course_tree import course_tree_cache
 from app.modules.courses.enums import CourseLevel
 from app.modules.courses.exceptions import handle_errors
-from app.modules.courses.schemas_import import CourseCreate, CourseResponse, CourseUpdate
+from app.modules.courses.schemas.CatalogSearchScheme import SearchType
+from app.modules.courses.schemas_import import (
+  CatalogSearchHit,
+  CourseCreate,
+  CourseResponse,
+  CourseTreeResponse,
+  CourseUpdate,
+)
 from app.modules.courses.services_import import CourseService, get_course_service
 
 from .requre import require_roles
@@ -55,6 +65,42 @@ async def get_course(
   return await handle_errors(lambda: service.get_by_title(user, title, delete_flg))
 
 
+@router.get(
+  "/tree",
+  response_model=CourseTreeResponse,
+  dependencies=[Depends(require_roles("admin", "teacher", "student"))],
+)
+async def get_course_tree(
+  request: Request,
+  course_id: UUID,
+  hide_answers: bool = False,
+  user: CurrentUser = Security(get_current_user),
+  service: CourseService = Depends(get_course_service),
+):
+  # тело уже сериализовано в кэше — отдаём байты как есть, без response_model
+  body, etag = await handle_errors(lambda: service.get_course_tree(user, course_id, hide_answers))
+  headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+  if etag_matches(request, etag):
+    return Response(status_code=304, headers=headers)
+  return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+  "/search",
+  response_model=list[CatalogSearchHit],
+  dependencies=[Depends(require_roles("admin", "teacher", "student"))],
+)
+async def search_catalog(
+  q: str = Query(..., min_length=2, max_length=200),
+  types: list[SearchType] | None = Query(None),
+  limit: int = Query(20, ge=1, le=100),
+  user: CurrentUser = Security(get_current_user),
+  service: CourseService = Depends(get_course_service),
+):
+  return await handle_errors(lambda: service.search_catalog(user, q, types, limit))
+
+
 @router.get(
   "/list", response_model=list[CourseResponse], dependencies=[Depends(require_roles("admin"))]
 )
@@ -115,6 +161,24 @@ async def soft_delete_course(
   return await handle_errors(lambda: service.soft_delete_course(user, course_id))
 
 
+@router.put("/restore", response_model=bool, dependencies=[Depends(require_roles("admin"))])
+async def restore_course(
+  course_id: UUID,
+  service: CourseService = Depends(get_course_service),
+):
+  return await handle_errors(lambda: service.restore(course_id))
+
+
 @router.delete("/hardDelete", response_model=bool, dependencies=[Depends(require_roles("admin"))])
 async def hard_delete_course(course_id: UUID, service: CourseService = Depends(get_course_service)):
   return await handle_errors(lambda: service.hard_delete(course_id))
+
+
+@router.get("/accessCacheStats", response_model=dict, dependencies=[Depends(require_roles("admin"))])
+async def access_cache_stats():
+  return access_cache.stats()
+
+
+@router.get("/treeCacheStats", response_model=dict, dependencies=[Depends(require_roles("admin"))])
+async def course_tree_cache_stats():
+  return course_tree_cache.stats()
@@ -1,3 +1,4 @@
+import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Security
@@ -12,6 +13,8 @@ from app.modules.courses.services_import import CourseUserService, get_course_us
 
 from .requre import require_roles
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -166,7 +169,6 @@ async def get_with_course_and_course_user(
     return await handle_errors(
       lambda: service.get_with_courseUser_and_course(user, user_id, course_id, delete_flg)
     )
-  except Exception as e:
-    print(f"Error in router: {e}")
-    print(f"Result type: {type(result) if 'result' in locals() else 'N/A'}")
+  except Exception:
+    logger.exception("getWithCourse failed")
     raise
@@ -26,6 +26,19 @@ async def create_lesson(
   return await handle_errors(lambda: service.create_lesson(user, data))
 
 
+@router.post(
+  "/createBulk",
+  response_model=list[LessonResponse],
+  dependencies=[Depends(require_roles("admin", "teacher"))],
+)
+async def create_lessons_bulk(
+  data: list[LessonCreate],
+  service: LessonService = Depends(get_lesson_service),
+  user: CurrentUser = Security(get_current_user),
+):
+  return await handle_errors(lambda: service.create_bulk(user, data))
+
+
 @router.get(
   "/list", response_model=list[LessonResponse], dependencies=[Depends(require_roles("admin"))]
 )
@@ -143,6 +156,14 @@ async def soft_delete_course(
   return await handle_errors(lambda: service.soft_delete_lesson(user, lesson_id))
 
 
+@router.put("/restore", response_model=bool, dependencies=[Depends(require_roles("admin"))])
+async def restore_lesson(
+  lesson_id: UUID,
+  service: LessonService = Depends(get_lesson_service),
+):
+  return await handle_errors(lambda: service.restore(lesson_id))
+
+
 @router.delete("/hardDelete", dependencies=[Depends(require_roles("admin"))])
 async def hard_delete_course(
   lesson_id: UUID,
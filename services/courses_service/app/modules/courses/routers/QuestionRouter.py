@@ -1,11 +1,17 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Security
+from fastapi.responses import JSONResponse
 
 from app.common.deps.auth import CurrentUser, get_current_user
 from app.modules.courses.enums import QuestionType
 from app.modules.courses.exceptions import handle_errors
-from app.modules.courses.schemas_import import QuestionCreate, QuestionResponse, QuestionUpdate
+from app.modules.courses.schemas_import import (
+  QuestionCreate,
+  QuestionResponse,
+  QuestionUpdate,
+  QuestionWithAnswers,
+)
 from app.modules.courses.services_import import QuestionService, get_question_service
 
 from .requre import require_roles
@@ -66,6 +72,22 @@ async def get_by_id(
   return await handle_errors(lambda: service.get_by_id_question(user, question_id, delete_flg))
 
 
+@router.post(
+  "/getWithAnswers",
+  response_model=QuestionWithAnswers,
+  dependencies=[Depends(require_roles("admin", "teacher", "student"))],
+)
+async def get_with_answers(
+  question_id: UUID,
+  delete_flg: bool | None = None,
+  service: QuestionService = Depends(get_question_service),
+  user: CurrentUser = Security(get_current_user),
+):
+  question = await handle_errors(lambda: service.get_with_answers(user, question_id, delete_flg))
+  # тело уже отфильтровано по роли (без is_correct для студента) — мимо response_model
+  return JSONResponse(question)
+
+
 @router.post("/getByTestId", response_model=list[QuestionResponse])
 async def get_by_test_id(
   test_id: UUID,
@@ -173,6 +195,14 @@ async def delete_test(
   return await handle_errors(lambda: service.soft_delete_question(user, id))
 
 
+@router.put("/restore", response_model=bool, dependencies=[Depends(require_roles("admin"))])
+async def restore_question(
+  question_id: UUID,
+  service: QuestionService = Depends(get_question_service),
+):
+  return await handle_errors(lambda: service.restore(question_id))
+
+
 @router.delete("/hardDelete", dependencies=[Depends(require_roles("admin"))])
 async def hard_delete_test(test_id: UUID, service: QuestionService = Depends(get_question_service)):
   return await handle_errors(lambda: service.hard_delete(test_id))
@@ -1,10 +1,16 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Security
+from fastapi.responses import JSONResponse
 
 from app.common.deps.auth import CurrentUser, get_current_user
 from app.modules.courses.exceptions import handle_errors
-from app.modules.courses.schemas_import import TestCreate, TestResponse, TestUpdate
+from app.modules.courses.schemas_import import (
+  TestCreate,
+  TestResponse,
+  TestUpdate,
+  TestWithQuestions,
+)
 from app.modules.courses.services_import import TestService, get_test_service
 
 from .requre import require_roles
@@ -23,6 +29,19 @@ async def create_test(
   return await handle_errors(lambda: service.create_test(user, data))
 
 
+@router.post(
+  "/createBulk",
+  response_model=list[TestResponse],
+  dependencies=[Depends(require_roles("admin", "teacher"))],
+)
+async def create_tests_bulk(
+  data: list[TestCreate],
+  service: TestService = Depends(get_test_service),
+  user: CurrentUser = Security(get_current_user),
+):
+  return await handle_errors(lambda: service.create_bulk(user, data))
+
+
 @router.get(
   "/list", response_model=list[TestResponse], dependencies=[Depends(require_roles("admin"))]
 )
@@ -49,6 +68,22 @@ async def get_lesson_by_id(
   return await handle_errors(lambda: service.get_by_id_test(user, id, delete_flg))
 
 
+@router.post(
+  "/getWithQuestions",
+  response_model=TestWithQuestions,
+  dependencies=[Depends(require_roles("admin", "teacher", "student"))],
+)
+async def get_with_questions(
+  id: UUID,
+  delete_flg: bool | None = None,
+  service: TestService = Depends(get_test_service),
+  user: CurrentUser = Security(get_current_user),
+):
+  test = await handle_errors(lambda: service.get_with_questions(user, id, delete_flg))
+  # тело уже отфильтровано по роли (без is_correct для студента) — мимо response_model
+  return JSONResponse(test)
+
+
 @router.post(
   "/getByLesson",
   response_model=list[TestResponse],
@@ -147,6 +182,14 @@ async def delete_test(
   return await handle_errors(lambda: service.soft_delete_test(user, test_id))
 
 
+@router.put("/restore", response_model=bool, dependencies=[Depends(require_roles("admin"))])
+async def restore_test(
+  test_id: UUID,
+  service: TestService = Depends(get_test_service),
+):
+  return await handle_errors(lambda: service.restore(test_id))
+
+
 @router.delete("/hardDelete", dependencies=[Depends(require_roles("admin"))])
 async def hard_delete_test(test_id: UUID, service: TestService = Depends(get_test_service)):
   return await handle_errors(lambda: service.hard_delete(test_id))
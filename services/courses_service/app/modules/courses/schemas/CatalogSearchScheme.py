@@ -0,0 +1,17 @@
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field, ConfigDict
+
+
+SearchType = Literal["course", "lesson", "test", "question", "review"]
+
+
+class CatalogSearchHit(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  type: SearchType = Field(..., description="Тип найденного объекта")
+  id: UUID
+  course_id: UUID
+  title: str | None = Field(None, description="Заголовок или начало текста")
+  rank: float = Field(..., description="ts_rank, больше — релевантнее")
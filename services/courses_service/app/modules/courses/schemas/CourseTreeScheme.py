@@ -0,0 +1,63 @@
+from typing import Optional, List
+from datetime import datetime
+
+from uuid import UUID
+from pydantic import BaseModel, Field, ConfigDict
+
+from app.modules.courses.enums import ContentType, CourseLevel, QuestionType
+
+
+class AnswerTreeNode(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: UUID
+  text: str
+  is_correct: bool
+  order_index: int
+
+
+class QuestionTreeNode(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: UUID
+  text: str
+  question_type: QuestionType
+  order_index: int
+  score: int
+  answers: List[AnswerTreeNode] = Field(default_factory=list, description="Варианты ответов")
+
+
+class TestTreeNode(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: UUID
+  title: str
+  description: Optional[str]
+  is_active: bool
+  questions: List[QuestionTreeNode] = Field(default_factory=list, description="Вопросы теста")
+
+
+class LessonTreeNode(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: UUID
+  title: str
+  short_description: Optional[str]
+  content_type: ContentType
+  order_index: int
+  text_content: Optional[str]
+  content_url: Optional[str]
+  test: Optional[TestTreeNode] = Field(None, description="Тест урока")
+
+
+class CourseTreeResponse(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+
+  id: UUID
+  title: str
+  description: Optional[str]
+  level: CourseLevel
+  author_id: UUID
+  is_published: bool
+  update_at: datetime
+  lessons: List[LessonTreeNode] = Field(default_factory=list, description="Уроки по order_index")
@@ -2,7 +2,7 @@ from typing import Optional,List
 from datetime import datetime
 
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator, ConfigDict
 
 from app.modules.courses.enums import QuestionType
 
@@ -82,4 +82,9 @@ class QuestionWithTest(QuestionResponse):
 
 
 class QuestionWithAnswers(QuestionResponse):
-  answers: List['AnswerResponse'] = Field(default_factory=list, description="Варианты ответов")
+  # в модели связь называется answer
+  answers: List['AnswerResponse'] = Field(
+    default_factory=list,
+    validation_alias=AliasChoices("answers", "answer"),
+    description="Варианты ответов",
+  )
@@ -1,8 +1,8 @@
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 from uuid import UUID
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field, field_validator, model_validator, ConfigDict
 
 
 class TestBase(BaseModel):
@@ -51,3 +51,12 @@ class TestResponse(BaseModel):
   delete_flg:bool
   create_at: datetime
   update_at: datetime
+
+
+class TestWithQuestions(TestResponse):
+  # в модели связь называется question
+  questions: List['QuestionWithAnswers'] = Field(
+    default_factory=list,
+    validation_alias=AliasChoices("questions", "question"),
+    description="Вопросы с вариантами ответов",
+  )
@@ -5,6 +5,8 @@ from .schemas.QuestionScheme import *
 from .schemas.AnswerScheme import *
 from .schemas.CourseReviewScheme import *
 from .schemas.CourseUserScheme import *
+from .schemas.CourseTreeScheme import *
+from .schemas.CatalogSearchScheme import *
 
 course_schemas = [
     CourseBase, CourseCreate, CourseUpdate, CourseResponse
@@ -15,7 +17,7 @@ lesson_schemas = [
 ]
 
 test_schemas = [
-    TestBase, TestCreate, TestUpdate, TestResponse
+    TestBase, TestCreate, TestUpdate, TestResponse, TestWithQuestions
 ]
 
 question_schemas = [
@@ -34,9 +36,22 @@ course_user_schemas = [
     CourseUserCreate, CourseUserUpdate, CourseUserResponse, CourseUserWithCourseResponse, CourseUserListResponse
 ]
 
+course_tree_schemas = [
+    AnswerTreeNode, QuestionTreeNode, TestTreeNode, LessonTreeNode, CourseTreeResponse
+]
+
+catalog_search_schemas = [
+    CatalogSearchHit
+]
+
+# ссылки между модулями схем ('AnswerResponse', 'QuestionWithAnswers', ...) видны только здесь
+for schema in (QuestionWithTest, QuestionWithAnswers, AnswerWithQuestion, TestWithQuestions):
+    schema.model_rebuild()
+
 all_schemas = (
     course_schemas + lesson_schemas + test_schemas +
-    question_schemas + answer_schemas + review_schemas + course_user_schemas
+    question_schemas + answer_schemas + review_schemas + course_user_schemas +
+    course_tree_schemas + catalog_search_schemas
 )
 
 __all__ = [schema.__name__ for schema in all_schemas]
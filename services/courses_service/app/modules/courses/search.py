@@ -0,0 +1,102 @@
+"""
+Полнотекстовый поиск Postgres по содержимому курсов.
+
+У каждой таблицы из SEARCH_DOCUMENTS есть сгенерированная колонка
+search_vector (tsvector, STORED) с GIN-индексом; поиск — `search_vector @@
+websearch_to_tsquery(...)`, сортировка — ts_rank. Веса: заголовок A,
+описание B, текст C.
+
+Схемой сервиса управляет create_all, а он не добавляет колонки в уже
+существующие таблицы, поэтому колонки и индексы создаются отдельно —
+разовым скриптом, а не при старте сервиса. Первое добавление колонки
+переписывает таблицу целиком под ACCESS EXCLUSIVE, это делается в окно
+обслуживания; индексы строятся CONCURRENTLY вне транзакции и записи не
+блокируют. Если построение индекса прервалось, Postgres оставляет его
+INVALID — такой индекс нужно удалить (DROP INDEX CONCURRENTLY) и запустить
+скрипт ещё раз.
+
+Запуск из services/courses_service после create_all:
+    PYTHONPATH=.:../../shared python -m app.modules.courses.search
+"""
+
+import asyncio
+
+from sqlalchemy import cast, func, literal, literal_column
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+SEARCH_CONFIG = "russian"
+SEARCH_COLUMN = "search_vector"
+
+# таблица -> [(колонка, вес)]
+SEARCH_DOCUMENTS: dict[str, list[tuple[str, str]]] = {
+    "courses": [("title", "A"), ("description", "B")],
+    "lessons": [("title", "A"), ("short_description", "B"), ("text_content", "C")],
+    "tests": [("title", "A"), ("description", "B")],
+    "questions": [("text", "A")],
+    "course_reviews": [("comment", "A")],
+}
+
+
+def document_expression(fields: list[tuple[str, str]]) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({name}, '')), '{weight}')"
+        for name, weight in fields
+    )
+
+
+def search_schema_statements() -> list[str]:
+    statements = []
+
+    for table, fields in SEARCH_DOCUMENTS.items():
+        statements.append(
+            f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {SEARCH_COLUMN} tsvector "
+            f"GENERATED ALWAYS AS ({document_expression(fields)}) STORED"
+        )
+        statements.append(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_{SEARCH_COLUMN} "
+            f"ON {table} USING gin ({SEARCH_COLUMN})"
+        )
+
+    return statements
+
+
+async def apply_search_schema(engine: AsyncEngine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+
+    # CREATE INDEX CONCURRENTLY нельзя выполнять в транзакции: каждый оператор — отдельный autocommit
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for statement in search_schema_statements():
+            await conn.exec_driver_sql(statement)
+
+
+def search_vector(model):
+    return literal_column(f"{model.__tablename__}.{SEARCH_COLUMN}", TSVECTOR)
+
+
+def to_tsquery(search_term: str):
+    # websearch-синтаксис: слова, "фраза", -исключение, or; пользовательский ввод не ломает запрос
+    return func.websearch_to_tsquery(cast(literal(SEARCH_CONFIG), REGCONFIG), search_term)
+
+
+def matches(model, tsquery):
+    return search_vector(model).op("@@")(tsquery)
+
+
+def rank(model, tsquery):
+    return func.ts_rank(search_vector(model), tsquery)
+
+
+async def _main() -> None:
+    from app.common.db.session import engine
+
+    try:
+        await apply_search_schema(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -93,7 +93,7 @@ class AnswerService(BaseService,BaseAccessCheckerCourse):
         if not answers:
           raise NotFoundError("Ответы не найдены")
 
-        return res
+        return answers
 
     async def get_max_order_index(self, question_id: UUID, delete_flg: bool | None) -> int:
         await self.find_question(question_id, delete_flg)
@@ -119,18 +119,27 @@ class AnswerService(BaseService,BaseAccessCheckerCourse):
 
 
     async def create_bulk(self, user:CurrentUser, answers: list[AnswerCreate]) -> List[Answer]:
-      if not answers:
-        raise ConflictError("Список ответов пуст")
+      self.check_bulk_size(answers, "Список ответов пуст")
 
       question_id = answers[0].question_id
 
       if any(a.question_id != question_id for a in answers):
         raise ConflictError("Все ответы должны относиться к одному вопросу")
 
+      orders = [a.order_index for a in answers]
+      if len(set(orders)) != len(orders):
+        raise ConflictError("Порядковые номера ответов повторяются")
+
       await self.find_question(question_id, False)
       await self.check_course_access_to_create(user, question_id)
 
-      return await self.repo.create_bulk([a.model_dump() for a in answers])
+      result = await self.repo.create_bulk([a.model_dump() for a in answers])
+
+      if result.conflicts:
+        taken = ", ".join(str(row["order_index"]) for row in result.conflicts)
+        raise ConflictError(f"Ответы с порядковыми номерами {taken} уже существуют")
+
+      return result.inserted
 
 
     async def count_by_question(self, question_id: UUID, delete_flg: bool | None) -> int:
@@ -1,3 +1,4 @@
+import logging
 from typing import List,Optional
 from uuid import UUID
 from app.common.deps.auth import CurrentUser
@@ -6,11 +7,18 @@ from app.modules.courses.exceptions import (
     ForbiddenError
 )
 
+logger = logging.getLogger(__name__)
+
 
 class BaseAccessCheckerCourse:
     def __init__(self, course_base_repo):
         self.course_base_repo = course_base_repo
 
+    @staticmethod
+    def sees_answers(user: CurrentUser) -> bool:
+        """Правильные ответы и неактивные тесты видят только автор курса (teacher) и admin."""
+        return bool({"admin", "teacher"} & set(user.roles))
+
     async def check_course_access_to_create(self, user: CurrentUser, obj_id:UUID):
         roles = set(user.roles)
 
@@ -39,7 +47,7 @@ class BaseAccessCheckerCourse:
         if obj is None:
           obj = await self.course_base_repo.get_by_id(obj_id, delete_flg=None)
 
-        print(roles)
+        logger.debug("check_course_access roles=%s", roles)
         if "admin" in roles:
             return obj
 
@@ -64,22 +72,59 @@ class BaseAccessCheckerCourse:
         raise ForbiddenError()
 
 
+    async def get_accessible_ids(self, user: CurrentUser, objs_id) -> set[UUID]:
+        """
+        Пакетная проверка доступа: множество id из objs_id, доступных пользователю.
+
+        Вместо check_course_access на каждый объект — один запрос
+        get_assigned_ids_to_user на весь список для роли пользователя.
+        """
+        objs_id = set(objs_id or ())
+        if not objs_id:
+            return set()
+
+        roles = set(user.roles)
+
+        if "admin" in roles:
+            return objs_id
+
+        elif "teacher" in roles:
+            return await self.course_base_repo.get_assigned_ids_to_user(user.id, objs_id, "teacher")
+
+        elif "student" in roles:
+            return await self.course_base_repo.get_assigned_ids_to_user(user.id, objs_id, "student")
+
+        return set()
+
+    async def check_course_access_to_create_many(self, user: CurrentUser, objs_id) -> bool:
+        """check_course_access_to_create для списка родителей одним запросом."""
+        objs_id = set(objs_id)
+        roles = set(user.roles)
+
+        if "admin" in roles:
+            return True
+
+        elif "teacher" in roles:
+            assigned = await self.course_base_repo.get_assigned_ids_to_create_by_user(user.id, objs_id, "teacher")
+
+        elif "student" in roles:
+            assigned = await self.course_base_repo.get_assigned_ids_to_create_by_user(user.id, objs_id, "student")
+
+        else:
+            raise ForbiddenError()
+
+        if assigned != objs_id:
+            raise ForbiddenError()
+        return True
+
     async def filter_courses_access(self, user: CurrentUser, objs, objs_id):
         allowed = []
         if objs_id:
-          for obj_id in objs_id:
-              try:
-                  checked = await self.check_course_access(user, None, obj_id)
-                  allowed.append(checked)
-              except ForbiddenError:
-                  continue
+          allowed_ids = await self.get_accessible_ids(user, objs_id)
+          if allowed_ids:
+              allowed.extend(await self.course_base_repo.get_by_ids(allowed_ids))
         if objs:
-          for obj in objs:
-              try:
-                  checked = await self.check_course_access(user, obj,None)
-                  allowed.append(checked)
-              except ForbiddenError:
-                  continue
-
+          allowed_ids = await self.get_accessible_ids(user, [obj.id for obj in objs])
+          allowed.extend(obj for obj in objs if obj.id in allowed_ids)
 
         return allowed
@@ -1,6 +1,7 @@
 from uuid import UUID
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.modules.courses.exceptions import (
     NotFoundError,
     ConflictError
@@ -13,6 +14,12 @@ class BaseService:
     async def create(self, in_data):
         return await self.repo.create(in_data)
 
+    def check_bulk_size(self, items: list, empty_detail: str) -> None:
+        if not items:
+            raise ConflictError(empty_detail)
+        if len(items) > settings.bulk_insert_max_rows:
+            raise ConflictError(f"Не больше {settings.bulk_insert_max_rows} записей за один запрос")
+
     async def get_all(self, delete_flg:bool | None, skip: int, limit: int):
         res = await self.repo.get_all(delete_flg, skip, limit)
         if not res:
@@ -42,6 +49,14 @@ class BaseService:
 
         return await self.repo.soft_delete(id)
 
+    async def restore(self, id: UUID) -> bool:
+        obj = await self.get_by_id(id, None)
+
+        if not obj.delete_flg:
+            raise ConflictError("Объект не удалён")
+
+        return await self.repo.restore(id)
+
     async def hard_delete(self, id: UUID) -> bool:
         await self.get_by_id(id, None)
         res = await self.repo.hard_delete(id)
@@ -73,8 +73,7 @@ class CourseReviewService(BaseService,BaseAccessCheckerCourse):
           list_id = [review.course_id for review in res]
           reviews = [review for review in res]
 
-        courses = await self.filter_courses_access(user, None,list_id)
-        allowed_course_ids = [course.id for course in courses]
+        allowed_course_ids = await self.get_accessible_ids(user, list_id)
 
         filtered_reviews = [
           r for r in reviews if r.course_id in allowed_course_ids
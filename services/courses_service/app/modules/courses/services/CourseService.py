@@ -6,8 +6,15 @@ from uuid import UUID
 from .BaseService import BaseService
 from .BaseAccessCheckerCourse import BaseAccessCheckerCourse
 from app.modules.courses.models_import import Course
+from app.modules.courses.course_tree import FULL, STUDENT, build_snapshot, course_tree_cache
 from app.modules.courses.enums import CourseLevel
-from app.modules.courses.repositories_import import CourseRepository, get_course_repository
+from app.modules.courses.repositories_import import (
+    CourseRepository,
+    get_course_repository,
+    CatalogSearchRepository,
+    get_catalog_search_repository
+)
+from app.modules.courses.repositories.CatalogSearchRepository import SEARCH_TYPES
 from app.modules.courses.schemas.CourseScheme import (
     CourseCreate,
     CourseUpdate
@@ -15,17 +22,19 @@ from app.modules.courses.schemas.CourseScheme import (
 from app.modules.courses.exceptions import (
     NotFoundError,
     AlreadyExistsError,
-    ConflictError
+    ConflictError,
+    ForbiddenError
 )
 from app.common.deps.auth import CurrentUser
 
 
 
 class CourseService(BaseService, BaseAccessCheckerCourse):
-    def __init__(self, repo: CourseRepository):
+    def __init__(self, repo: CourseRepository, search_repo: CatalogSearchRepository | None = None):
         BaseService.__init__(self, repo)
         BaseAccessCheckerCourse.__init__(self, repo)
         self.repo: CourseRepository = repo
+        self.search_repo = search_repo
 
 
     async def create_course(self, author_id:UUID, in_data: CourseCreate) -> Course:
@@ -46,6 +55,55 @@ class CourseService(BaseService, BaseAccessCheckerCourse):
 
         return course
 
+    async def get_course_tree(self, user:CurrentUser, id: UUID, hide_answers: bool) -> tuple[bytes, str]:
+        """
+        Тело и ETag дерева курса. На попадании в course_tree_cache запросов нет:
+        снимок сам проходит check_course_access (студенту — через access_cache).
+        На промахе доступ проверяется до загрузки дерева: чужое дерево не
+        грузится и не попадает в кэш. Без ролей teacher / admin — вариант
+        без is_correct и неактивных тестов.
+        """
+        snapshot = course_tree_cache.get(id)
+
+        if snapshot is not None:
+            await self.check_course_access(user, snapshot, None)
+        else:
+            course = await self.repo.get_by_id(id, delete_flg=None)
+
+            if course is None:
+                raise NotFoundError("Курс не найден")
+
+            await self.check_course_access(user, course, None)
+
+            version = course_tree_cache.generation
+            course = await self.repo.get_tree(id)
+
+            if course is None:
+                raise NotFoundError("Курс не найден")
+
+            snapshot = build_snapshot(course, version)
+            course_tree_cache.set(snapshot)
+
+        if hide_answers or not self.sees_answers(user):
+            return snapshot.body(STUDENT)
+        return snapshot.body(FULL)
+
+    async def search_catalog(self, user:CurrentUser, query: str, types: list[str] | None, limit: int) -> list[dict]:
+        query = query.strip()
+
+        if not query:
+            raise ConflictError("Пустой поисковый запрос")
+
+        roles = set(user.roles)
+        role = next((r for r in ("admin", "teacher", "student") if r in roles), None)
+
+        if role is None:
+            raise ForbiddenError()
+
+        types = [t for t in SEARCH_TYPES if t in set(types)] if types else list(SEARCH_TYPES)
+
+        return await self.search_repo.search(user.id, role, query, types, limit)
+
     async def find_by_title(self, title: str, delete_flg: bool | None) -> Optional[Course]:
         return await self.repo.get_by_title(title, delete_flg)
 
@@ -111,6 +169,7 @@ class CourseService(BaseService, BaseAccessCheckerCourse):
 
 
 async def get_course_service(
-    repo: CourseRepository = Depends(get_course_repository)
+    repo: CourseRepository = Depends(get_course_repository),
+    search_repo: CatalogSearchRepository = Depends(get_catalog_search_repository)
 ) -> CourseService:
-    return CourseService(repo)
+    return CourseService(repo, search_repo)
@@ -14,7 +14,8 @@ from app.modules.courses.repositories_import import (
 )
 from app.modules.courses.schemas_import import LessonCreate, LessonUpdate
 from app.modules.courses.exceptions import (
-    NotFoundError
+    NotFoundError,
+    ConflictError
 )
 from app.common.deps.auth import CurrentUser
 
@@ -46,6 +47,23 @@ class LessonService(BaseService, BaseAccessCheckerCourse):
 
         return await super().create(in_data.model_dump())
 
+    async def create_bulk(self, user:CurrentUser, lessons: list[LessonCreate]) -> List[Lesson]:
+        self.check_bulk_size(lessons, "Список уроков пуст")
+
+        course_id = lessons[0].course_id
+
+        if any(l.course_id != course_id for l in lessons):
+            raise ConflictError("Все уроки должны относиться к одному курсу")
+
+        await self.find_course(user, course_id, False)
+
+        result = await self.repo.create_bulk([l.model_dump(exclude={"order_index"}) for l in lessons])
+
+        if result.conflicts:
+            raise ConflictError("Порядок уроков изменился во время вставки, повторите запрос")
+
+        return result.inserted
+
     async def get_by_id_lesson(self,user:CurrentUser, id: UUID, delete_flg:bool | None):
         if "teacher" in user.roles or "student" in user.roles:
             delete_flg = False
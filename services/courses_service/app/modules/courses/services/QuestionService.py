@@ -13,12 +13,16 @@ from app.modules.courses.repositories_import import (
     get_test_repository
 )
 from app.modules.courses.schemas.QuestionScheme import QuestionCreate,QuestionUpdate
+from app.modules.courses.schemas_import import QuestionWithAnswers
 from app.modules.courses.exceptions import (
     NotFoundError,
     ConflictError
 )
 from app.common.deps.auth import CurrentUser
 
+# студенту не отдаём правильные ответы
+STUDENT_EXCLUDE = {"answers": {"__all__": {"is_correct"}}}
+
 
 class QuestionService(BaseService, BaseAccessCheckerCourse):
 
@@ -108,8 +112,7 @@ class QuestionService(BaseService, BaseAccessCheckerCourse):
         return questions
 
     async def create_bulk(self, user:CurrentUser,questions: list[QuestionCreate]) -> List[Question]:
-        if not questions:
-            raise ConflictError("Список вопросов пуст")
+        self.check_bulk_size(questions, "Список вопросов пуст")
 
         test_id = questions[0].test_id
 
@@ -118,7 +121,12 @@ class QuestionService(BaseService, BaseAccessCheckerCourse):
 
         await self.find_test(user, test_id, False)
 
-        return await self.repo.create_bulk([q.model_dump() for q in questions])
+        result = await self.repo.create_bulk([q.model_dump(exclude={"order_index"}) for q in questions])
+
+        if result.conflicts:
+            raise ConflictError("Порядок вопросов изменился во время вставки, повторите запрос")
+
+        return result.inserted
 
     async def get_total_score_by_test(self, user:CurrentUser,test_id: UUID, delete_flg: bool | None ) -> int:
         if "student" in user.roles or "teacher" in user.roles:
@@ -131,11 +139,25 @@ class QuestionService(BaseService, BaseAccessCheckerCourse):
 
         return result
 
-    async def get_with_answers(self, id: UUID):
-        res = await self.repo.get_with_answers(id)
+    async def get_with_answers(self, user:CurrentUser, id: UUID, delete_flg: bool | None) -> dict:
+        """Вопрос с ответами; студент видит только вопросы активных тестов и без is_correct."""
+        if "teacher" in user.roles or "student" in user.roles:
+            delete_flg = False
+
+        res = await self.repo.get_with_answers(id, delete_flg)
         if not res:
             raise HTTPException(404, "Вопрос или ответы не найдены")
-        return res
+
+        # check_course_access возвращает загруженный тест вопроса
+        test = await self.check_course_access(user, None, res.test_id)
+
+        question = QuestionWithAnswers.model_validate(res)
+        if self.sees_answers(user):
+            return question.model_dump(mode="json")
+
+        if not test.is_active:
+            raise NotFoundError("Вопрос не найден")
+        return question.model_dump(mode="json", exclude=STUDENT_EXCLUDE)
 
     async def update_question(self, user:CurrentUser, id: UUID, in_data: QuestionUpdate) -> Question:
         await self.get_by_id_question(user, id, False)
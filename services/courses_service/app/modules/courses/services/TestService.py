@@ -13,12 +13,16 @@ from app.modules.courses.repositories_import import (
     get_lesson_repository
 )
 from app.modules.courses.schemas.TestScheme import TestCreate,TestUpdate
+from app.modules.courses.schemas_import import TestWithQuestions
 from app.modules.courses.exceptions import (
     NotFoundError,
     ConflictError
 )
 from app.common.deps.auth import CurrentUser
 
+# студенту не отдаём правильные ответы
+STUDENT_EXCLUDE = {"questions": {"__all__": {"answers": {"__all__": {"is_correct"}}}}}
+
 class TestService(BaseService,BaseAccessCheckerCourse):
     def __init__(self, repo: TestRepository, lesson_repo: LessonRepository):
         BaseService.__init__(self, repo)
@@ -42,6 +46,32 @@ class TestService(BaseService,BaseAccessCheckerCourse):
 
         return await super().create(in_data.model_dump())
 
+    async def create_bulk(self, user:CurrentUser, tests: list[TestCreate]) -> List[Test]:
+        self.check_bulk_size(tests, "Список тестов пуст")
+
+        lesson_ids = [t.lesson_id for t in tests]
+
+        if len(set(lesson_ids)) != len(lesson_ids):
+            raise ConflictError("У урока может быть только один тест")
+
+        # уроки и доступ к ним — по одному запросу на всю пачку
+        lessons = {lesson.id: lesson for lesson in await self.lesson_repo.get_by_ids(lesson_ids)}
+
+        if len(lessons) != len(lesson_ids):
+            raise NotFoundError("Урок не существует")
+        if any(lesson.delete_flg for lesson in lessons.values()):
+            raise NotFoundError("Урок не найден")
+
+        await self.check_course_access_to_create_many(user, lesson_ids)
+
+        result = await self.repo.create_bulk([t.model_dump() for t in tests])
+
+        if result.conflicts:
+            taken = ", ".join(str(row["lesson_id"]) for row in result.conflicts)
+            raise ConflictError(f"У уроков уже есть тест: {taken}")
+
+        return result.inserted
+
     async def get_by_id_test(self,user:CurrentUser, id: UUID, delete_flg:bool | None):
         if "teacher" in user.roles or "student" in user.roles:
             delete_flg = False
@@ -130,11 +160,24 @@ class TestService(BaseService,BaseAccessCheckerCourse):
         return tests
 
 
-    async def get_with_questions(self, test_id: UUID):
-        res = await self.repo.get_with_questions(test_id)
+    async def get_with_questions(self, user:CurrentUser, test_id: UUID, delete_flg: bool | None) -> dict:
+        """Тест с вопросами и ответами; студент видит только активный тест и без is_correct."""
+        if "teacher" in user.roles or "student" in user.roles:
+            delete_flg = False
+
+        res = await self.repo.get_with_questions(test_id, delete_flg)
         if not res:
             raise HTTPException(404, "Тест или вопросы не найдены")
-        return res
+
+        await self.check_course_access(user, res, None)
+
+        test = TestWithQuestions.model_validate(res)
+        if self.sees_answers(user):
+            return test.model_dump(mode="json")
+
+        if not test.is_active:
+            raise NotFoundError("Тест не найден")
+        return test.model_dump(mode="json", exclude=STUDENT_EXCLUDE)
 
 
 async def get_test_service(
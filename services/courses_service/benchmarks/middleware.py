@@ -0,0 +1,142 @@
+"""
+Накладные расходы AuthMiddleware: BaseHTTPMiddleware против чистого ASGI.
+
+Оба варианта вызывают одну и ту же проверку `authenticate`, разница только
+в обёртке. Запросы подаются прямо в ASGI-приложение (без сети и httpx),
+JWKS отдаёт подставной поставщик, так что auth-сервис не нужен.
+
+Запуск из services/courses_service:
+    PYTHONPATH=.:../../shared python -m benchmarks.middleware
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import statistics
+import time
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.jwks import AsyncJWKSProvider
+from app.middleware import auth as auth_module
+from app.middleware.auth import AuthMiddleware, _is_public, authenticate
+
+REQUESTS = 5_000
+CONCURRENCY = 32
+
+
+class LegacyAuthMiddleware(BaseHTTPMiddleware):
+    """Прежняя обёртка: та же проверка внутри BaseHTTPMiddleware.dispatch."""
+
+    async def dispatch(self, request, call_next):
+        if not _is_public(request.scope):
+            denied = await authenticate(request)
+            if denied is not None:
+                return denied
+        return await call_next(request)
+
+
+def make_app(middleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def call(app, headers: list[tuple[bytes, bytes]]) -> float:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": headers,
+        "client": ("127.0.0.1", 1234),
+        "server": ("test", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    assert status == 200, status
+    return time.perf_counter() - started
+
+
+async def measure(app, headers) -> tuple[float, float]:
+    latencies: list[float] = []
+    queue = iter(range(REQUESTS))
+
+    async def worker():
+        for _ in queue:
+            latencies.append(await call(app, headers))
+
+    for _ in range(200):
+        await call(app, headers)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    return REQUESTS / elapsed, p99
+
+
+async def main() -> None:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid="k1", alg="RS256", use="sig")
+
+    async def fetch():
+        return {"keys": [jwk]}
+
+    auth_module._jwks_provider = AsyncJWKSProvider("http://auth", fetch=fetch)
+    auth_module.AUTH_ISSUER = "auth-service"
+
+    now = int(time.time())
+    token = jwt.encode(
+        {
+            "sub": "user",
+            "role": "student",
+            "type": "access",
+            "iss": "auth-service",
+            "iat": now,
+            "exp": now + 3600,
+        },
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "k1"},
+    )
+    headers = [(b"authorization", token.encode())]
+
+    print(f"courses_service: {REQUESTS} requests, concurrency {CONCURRENCY}")
+    results = {}
+    for name, middleware in (("base_http", LegacyAuthMiddleware), ("pure_asgi", AuthMiddleware)):
+        results[name] = await measure(make_app(middleware), headers)
+        rps, p99 = results[name]
+        print(f"{name:<10} {rps:10.0f} req/s   p99 {p99:7.2f} ms")
+
+    print(f"speedup    x{results['pure_asgi'][0] / results['base_http'][0]:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+"""
+Поиск по содержимому курсов: ILIKE '%...%' против tsvector + GIN.
+
+Синтетический корпус генерируется прямо в Postgres через generate_series
+(1 000 курсов × 100 уроков = 100 000 уроков и 1 000 000 отзывов), затем
+apply_search_schema добавляет колонки search_vector и индексы. Для каждого
+запроса замеряется медиана по нескольким прогонам: прежний ILIKE с
+сортировкой по order_index / create_at и полнотекстовый поиск с ts_rank.
+В конце бенчмарк удаляет свои курсы (уроки и отзывы уходят каскадом).
+
+Нужна пустая или тестовая база Postgres из DB_DSN, на рабочей не запускать.
+
+Запуск из services/courses_service:
+    PYTHONPATH=.:../../shared python -m benchmarks.search
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.common.db.base import Base
+from app.common.db.session import engine
+from app.modules.courses.search import apply_search_schema
+
+COURSES = 1_000
+LESSONS_PER_COURSE = 100
+REVIEWS_PER_COURSE = 1_000
+RUNS = 5
+TITLE_PREFIX = "bench-search"
+
+WORDS = [
+    "кэширование", "индексы", "транзакции", "репликация", "шардирование", "очереди",
+    "асинхронность", "профилирование", "алгоритмы", "сортировка", "графы", "деревья",
+    "хеширование", "сериализация", "компиляция", "оптимизация", "тестирование",
+    "безопасность", "шифрование", "контейнеры", "оркестрация", "мониторинг",
+    "логирование", "нагрузка", "масштабирование", "память", "процессор", "сеть",
+    "протоколы", "базы", "данных", "запросы", "планировщик", "потоки", "блокировки",
+    "отказоустойчивость", "балансировка", "микросервисы", "архитектура", "паттерны",
+]
+
+# по слову на позицию: случайная фраза из словаря длиной n
+PHRASE = """
+    (SELECT string_agg(w[1 + floor(random() * array_length(w, 1))::int], ' ')
+     FROM generate_series(1, {n}) WHERE {seed} IS NOT NULL)
+"""
+
+SEED = [
+    f"""
+    INSERT INTO courses (id, title, description, author_id, is_published, delete_flg, create_at, update_at)
+    SELECT gen_random_uuid(), '{TITLE_PREFIX}-' || c, {PHRASE.format(n=30, seed="c")},
+           gen_random_uuid(), true, false, now(), now()
+    FROM generate_series(1, {COURSES}) AS c, (SELECT CAST(:words AS text[]) AS w) AS dict
+    """,
+    f"""
+    INSERT INTO lessons (id, course_id, title, short_description, content_type, text_content,
+                         order_index, delete_flg, create_at, update_at)
+    SELECT gen_random_uuid(), courses.id, {PHRASE.format(n=4, seed="l")}, {PHRASE.format(n=12, seed="l")},
+           'TEXT', {PHRASE.format(n=120, seed="l")}, l, false, now(), now()
+    FROM courses, generate_series(0, {LESSONS_PER_COURSE - 1}) AS l, (SELECT CAST(:words AS text[]) AS w) AS dict
+    WHERE courses.title LIKE '{TITLE_PREFIX}-%'
+    """,
+    f"""
+    INSERT INTO course_reviews (id, course_id, user_id, rating, comment, is_published, delete_flg,
+                                create_at, update_at)
+    SELECT gen_random_uuid(), courses.id, gen_random_uuid(), 1 + r % 5, {PHRASE.format(n=25, seed="r")},
+           true, false, now() - r * interval '1 minute', now()
+    FROM courses, generate_series(1, {REVIEWS_PER_COURSE}) AS r, (SELECT CAST(:words AS text[]) AS w) AS dict
+    WHERE courses.title LIKE '{TITLE_PREFIX}-%'
+    """,
+]
+
+FTS = "websearch_to_tsquery('russian', :term)"
+
+QUERIES = {
+    "lessons in course": (
+        """
+        SELECT id FROM lessons
+        WHERE course_id = :course_id AND delete_flg = false
+          AND (title ILIKE :pattern OR short_description ILIKE :pattern OR text_content ILIKE :pattern)
+        ORDER BY order_index LIMIT 20
+        """,
+        f"""
+        SELECT id FROM lessons
+        WHERE course_id = :course_id AND delete_flg = false AND search_vector @@ {FTS}
+        ORDER BY ts_rank(search_vector, {FTS}) DESC, order_index LIMIT 20
+        """,
+    ),
+    "lessons catalog": (
+        """
+        SELECT id FROM lessons
+        WHERE delete_flg = false
+          AND (title ILIKE :pattern OR short_description ILIKE :pattern OR text_content ILIKE :pattern)
+        ORDER BY order_index LIMIT 20
+        """,
+        f"""
+        SELECT id FROM lessons
+        WHERE delete_flg = false AND search_vector @@ {FTS}
+        ORDER BY ts_rank(search_vector, {FTS}) DESC LIMIT 20
+        """,
+    ),
+    "reviews catalog": (
+        """
+        SELECT id FROM course_reviews
+        WHERE delete_flg = false AND comment ILIKE :pattern
+        ORDER BY create_at DESC LIMIT 20
+        """,
+        f"""
+        SELECT id FROM course_reviews
+        WHERE delete_flg = false AND search_vector @@ {FTS}
+        ORDER BY ts_rank(search_vector, {FTS}) DESC, create_at DESC LIMIT 20
+        """,
+    ),
+    # два слова: ILIKE проверяет по шаблону на слово, FTS — один запрос по индексу
+    "reviews, two words": (
+        """
+        SELECT id FROM course_reviews
+        WHERE delete_flg = false AND comment ILIKE :pattern AND comment ILIKE :pattern2
+        ORDER BY create_at DESC LIMIT 20
+        """,
+        f"""
+        SELECT id FROM course_reviews
+        WHERE delete_flg = false AND search_vector @@ {FTS}
+        ORDER BY ts_rank(search_vector, {FTS}) DESC, create_at DESC LIMIT 20
+        """,
+    ),
+}
+
+
+async def timed(conn, sql: str, params: dict) -> float:
+    samples = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        await conn.execute(text(sql), params)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+async def seed(conn) -> None:
+    for statement in SEED:
+        started = time.perf_counter()
+        await conn.execute(text(statement), {"words": WORDS})
+        print(f"seed {statement.split()[2]:<15} {time.perf_counter() - started:8.1f} s")
+
+
+async def cleanup(conn) -> None:
+    await conn.execute(text(f"DELETE FROM courses WHERE title LIKE '{TITLE_PREFIX}-%'"))
+
+
+async def main() -> None:
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("нужен Postgres: tsvector и GIN есть только там")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await cleanup(conn)
+        await seed(conn)
+
+    started = time.perf_counter()
+    await apply_search_schema(engine)
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE courses, lessons, course_reviews"))
+    print(f"search schema   {time.perf_counter() - started:8.1f} s")
+
+    async with engine.connect() as conn:
+        course_id = (
+            await conn.execute(text(f"SELECT id FROM courses WHERE title = '{TITLE_PREFIX}-1'"))
+        ).scalar_one()
+
+        print(f"courses_service: {COURSES} courses, {COURSES * LESSONS_PER_COURSE} lessons, "
+              f"{COURSES * REVIEWS_PER_COURSE} reviews, median of {RUNS}")
+        for name, (ilike, fts) in QUERIES.items():
+            first, second = WORDS[0], WORDS[7]
+            params = {
+                "course_id": course_id,
+                "term": first if "two words" not in name else f"{first} {second}",
+                "pattern": f"%{first}%",
+                "pattern2": f"%{second}%",
+            }
+            ilike_ms = await timed(conn, ilike, params)
+            fts_ms = await timed(conn, fts, params)
+            print(f"{name:<20} ilike {ilike_ms:9.2f} ms   fts {fts_ms:9.2f} ms   x{ilike_ms / fts_ms:.1f}")
+
+    async with engine.begin() as conn:
+        await cleanup(conn)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -46,6 +46,7 @@ def mock_course_service(course_response: CourseResponse) -> AsyncMock:
 
     service.soft_delete_course.return_value = True
     service.hard_delete.return_value = True
+    service.restore.return_value = True
 
     return service
 
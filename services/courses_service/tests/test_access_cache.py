@@ -0,0 +1,141 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from app.modules.courses import access_cache as access_cache_module
+from app.modules.courses.access_cache import AccessCache, access_cache
+from app.modules.courses.repositories.CourseRepository import CourseRepository
+from app.modules.courses.repositories.CourseUserRepository import CourseUserRepository
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    access_cache.clear()
+    yield
+    access_cache.clear()
+
+
+def make_session(found_ids) -> AsyncMock:
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = list(found_ids)
+    db.execute.return_value = result
+    return db
+
+
+def test_lru_evicts_oldest() -> None:
+    cache = AccessCache(maxsize=2, ttl=60)
+    user, a, b, c = uuid4(), uuid4(), uuid4(), uuid4()
+
+    cache.set(user, a, "student", True)
+    cache.set(user, b, "student", True)
+    cache.get(user, a, "student")
+    cache.set(user, c, "student", False)
+
+    assert cache.get(user, b, "student") is None
+    assert cache.get(user, a, "student") is True
+    assert cache.get(user, c, "student") is False
+    assert cache.stats()["evictions"] == 1
+
+
+def test_clear_resets_stats() -> None:
+    cache = AccessCache(maxsize=1, ttl=60)
+    user, a, b = uuid4(), uuid4(), uuid4()
+    cache.set(user, a, "student", True)
+    cache.set(user, b, "student", True)
+    cache.get(user, a, "student")
+    cache.get(user, b, "student")
+
+    cache.clear()
+
+    stats = cache.stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (0, 0, 0, 0)
+
+
+def test_ttl_expires(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(access_cache_module.time, "monotonic", lambda: now[0])
+    cache = AccessCache(maxsize=10, ttl=5)
+    user, course = uuid4(), uuid4()
+
+    cache.set(user, course, "teacher", True)
+    now[0] += 4
+    assert cache.get(user, course, "teacher") is True
+    now[0] += 2
+    assert cache.get(user, course, "teacher") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_invalidation_is_precise() -> None:
+    cache = AccessCache(maxsize=10, ttl=60)
+    alice, bob, course, other = uuid4(), uuid4(), uuid4(), uuid4()
+    for user in (alice, bob):
+        for course_id in (course, other):
+            cache.set(user, course_id, "student", True)
+
+    cache.invalidate_user_course(alice, course)
+    assert cache.get(alice, course, "student") is None
+    assert cache.get(bob, course, "student") is True
+    assert cache.get(alice, other, "student") is True
+
+    cache.invalidate_course(other)
+    assert cache.get(alice, other, "student") is None
+    assert cache.get(bob, other, "student") is None
+    assert cache.get(bob, course, "student") is True
+
+
+async def test_repository_serves_repeated_checks_from_cache() -> None:
+    user, course = uuid4(), uuid4()
+    db = make_session([course])
+    repo = CourseRepository(db)
+
+    assert await repo.get_assigned_to_user(user, course, "student") is True
+    assert await repo.get_assigned_to_user(user, course, "student") is True
+
+    assert db.execute.await_count == 1
+    assert access_cache.hits == access_cache.misses == 1
+
+
+async def test_batch_queries_only_missing_ids() -> None:
+    user = uuid4()
+    cached_ok, cached_denied, fresh = uuid4(), uuid4(), uuid4()
+    access_cache.set(user, cached_ok, "teacher", True)
+    access_cache.set(user, cached_denied, "teacher", False)
+    db = make_session([fresh])
+
+    allowed = await CourseRepository(db).get_assigned_ids_to_user(
+        user, [cached_ok, cached_denied, fresh], "teacher"
+    )
+
+    assert allowed == {cached_ok, fresh}
+    db.execute.assert_awaited_once()
+    assert access_cache.get(user, fresh, "teacher") is True
+
+
+async def test_unpublish_invalidates_course() -> None:
+    user, course_id = uuid4(), uuid4()
+    access_cache.set(user, course_id, "student", True)
+    db = AsyncMock()
+    repo = CourseRepository(db)
+    repo.get_by_id = AsyncMock(return_value=SimpleNamespace(id=course_id, is_published=True))
+
+    await repo.unpublish(course_id)
+
+    assert access_cache.get(user, course_id, "student") is None
+
+
+@pytest.mark.parametrize("method", ["activate", "deactivate", "soft_delete"])
+async def test_enrollment_writes_invalidate_user_course(method: str) -> None:
+    user, course_id = uuid4(), uuid4()
+    access_cache.set(user, course_id, "student", True)
+    access_cache.set(uuid4(), course_id, "student", True)
+    repo = CourseUserRepository(AsyncMock())
+    repo.get_by_id = AsyncMock(
+        return_value=SimpleNamespace(user_id=user, course_id=course_id, is_active=True)
+    )
+
+    await getattr(repo, method)(uuid4())
+
+    assert access_cache.get(user, course_id, "student") is None
+    assert access_cache.stats()["size"] == 1
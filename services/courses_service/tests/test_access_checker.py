@@ -0,0 +1,149 @@
+import pytest
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from app.modules.courses.enums import QuestionType
+from app.modules.courses.exceptions import NotFoundError
+from app.modules.courses.services.BaseAccessCheckerCourse import BaseAccessCheckerCourse
+from app.modules.courses.services.QuestionService import QuestionService
+from app.modules.courses.services.TestService import TestService as QuizService
+
+
+class FakeUser:
+    def __init__(self, roles: list[str]):
+        self.id = uuid4()
+        self.roles = roles
+
+
+def make_objs(count: int) -> list[SimpleNamespace]:
+    return [SimpleNamespace(id=uuid4()) for _ in range(count)]
+
+
+@pytest.mark.parametrize("role", ["teacher", "student"])
+@pytest.mark.parametrize("count", [1, 100])
+async def test_filter_objects_uses_single_query(role: str, count: int) -> None:
+    objs = make_objs(count)
+    allowed = {obj.id for obj in objs[::2]}
+    repo = AsyncMock()
+    repo.get_assigned_ids_to_user.return_value = allowed
+    user = FakeUser([role])
+
+    result = await BaseAccessCheckerCourse(repo).filter_courses_access(user, objs, None)
+
+    assert [obj.id for obj in result] == [obj.id for obj in objs if obj.id in allowed]
+    repo.get_assigned_ids_to_user.assert_awaited_once()
+    assert repo.get_assigned_ids_to_user.await_args.args[2] == role
+    repo.get_assigned_to_user.assert_not_awaited()
+    repo.get_by_id.assert_not_awaited()
+
+
+async def test_filter_ids_loads_allowed_objects_once() -> None:
+    objs = make_objs(100)
+    allowed = {obj.id for obj in objs[:10]}
+    repo = AsyncMock()
+    repo.get_assigned_ids_to_user.return_value = allowed
+    repo.get_by_ids.return_value = objs[:10]
+
+    result = await BaseAccessCheckerCourse(repo).filter_courses_access(
+        FakeUser(["student"]), None, [obj.id for obj in objs]
+    )
+
+    assert result == objs[:10]
+    repo.get_by_ids.assert_awaited_once_with(allowed)
+    repo.get_by_id.assert_not_awaited()
+
+
+async def test_admin_skips_assignment_query() -> None:
+    objs = make_objs(5)
+    repo = AsyncMock()
+
+    checker = BaseAccessCheckerCourse(repo)
+    ids = await checker.get_accessible_ids(FakeUser(["admin"]), [obj.id for obj in objs])
+
+    assert ids == {obj.id for obj in objs}
+    repo.get_assigned_ids_to_user.assert_not_awaited()
+
+
+async def test_unknown_role_gets_nothing() -> None:
+    repo = AsyncMock()
+
+    ids = await BaseAccessCheckerCourse(repo).get_accessible_ids(FakeUser([]), [uuid4()])
+
+    assert ids == set()
+    repo.get_assigned_ids_to_user.assert_not_awaited()
+
+
+def make_question(test_id) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    question_id = uuid4()
+    answers = [
+        SimpleNamespace(
+            id=uuid4(), question_id=question_id, text=f"ответ {i}", is_correct=i == 0,
+            order_index=i, delete_flg=False, create_at=now, update_at=now,
+        )
+        for i in range(2)
+    ]
+    return SimpleNamespace(
+        id=question_id, text="вопрос", question_type=QuestionType.SINGLE_CHOICE, order_index=0,
+        score=1, test_id=test_id, delete_flg=False, create_at=now, update_at=now, answer=answers,
+    )
+
+
+def make_test(is_active: bool) -> SimpleNamespace:
+    now = datetime.now(timezone.utc)
+    test_id = uuid4()
+    return SimpleNamespace(
+        id=test_id, title="тест", description=None, is_active=is_active, lesson_id=uuid4(),
+        delete_flg=False, create_at=now, update_at=now, question=[make_question(test_id)],
+    )
+
+
+def quiz_service(test) -> QuizService:
+    repo = AsyncMock()
+    repo.get_with_questions.return_value = test
+    repo.get_assigned_to_user.return_value = True
+    return QuizService(repo, AsyncMock())
+
+
+def question_service(test) -> QuestionService:
+    repo, test_repo = AsyncMock(), AsyncMock()
+    repo.get_with_answers.return_value = test.question[0]
+    test_repo.get_by_id.return_value = test
+    test_repo.get_assigned_to_user.return_value = True
+    return QuestionService(repo, test_repo)
+
+
+async def test_student_does_not_see_correct_answers() -> None:
+    test = make_test(is_active=True)
+    student = FakeUser(["student"])
+
+    quiz = await quiz_service(test).get_with_questions(student, test.id, None)
+    question = await question_service(test).get_with_answers(student, test.question[0].id, None)
+
+    assert all("is_correct" not in a for q in quiz["questions"] for a in q["answers"])
+    assert all("is_correct" not in a for a in question["answers"])
+    assert [a["text"] for a in question["answers"]] == ["ответ 0", "ответ 1"]
+
+
+@pytest.mark.parametrize("role", ["admin", "teacher"])
+async def test_staff_sees_correct_answers_and_inactive_tests(role: str) -> None:
+    test = make_test(is_active=False)
+    user = FakeUser([role])
+
+    quiz = await quiz_service(test).get_with_questions(user, test.id, None)
+    question = await question_service(test).get_with_answers(user, test.question[0].id, None)
+
+    assert [a["is_correct"] for a in quiz["questions"][0]["answers"]] == [True, False]
+    assert [a["is_correct"] for a in question["answers"]] == [True, False]
+
+
+async def test_student_does_not_see_inactive_test() -> None:
+    test = make_test(is_active=False)
+    student = FakeUser(["student"])
+
+    with pytest.raises(NotFoundError):
+        await quiz_service(test).get_with_questions(student, test.id, None)
+    with pytest.raises(NotFoundError):
+        await question_service(test).get_with_answers(student, test.question[0].id, None)
@@ -0,0 +1,137 @@
+import json
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from learning_platform_common.logging import get_request_context
+from learning_platform_common.revocations import RevocationFeed
+
+from app.core.jwks import AsyncJWKSProvider
+from app.middleware import auth as auth_module
+from app.middleware.auth import setup_auth_middleware
+
+
+@pytest.fixture
+def signing_key(monkeypatch):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid="k1", alg="RS256", use="sig")
+
+    async def fetch():
+        return {"keys": [jwk]}
+
+    provider = AsyncJWKSProvider("http://auth", fetch=fetch)
+    monkeypatch.setattr(auth_module, "_jwks_provider", provider)
+    monkeypatch.setattr(auth_module, "AUTH_ISSUER", "auth-service")
+    return private_key
+
+
+def make_token(private_key, **claims) -> str:
+    now = int(time.time())
+    payload = {
+        "sub": "user-1",
+        "role": "student",
+        "type": "access",
+        "iss": "auth-service",
+        "iat": now,
+        "exp": now + 60,
+        **claims,
+    }
+    # None — убрать claim из токена
+    payload = {k: v for k, v in payload.items() if v is not None}
+    return jwt.encode(payload, private_key, algorithm="RS256", headers={"kid": "k1"})
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    setup_auth_middleware(app)
+
+    @app.get("/whoami")
+    async def whoami(request: Request):
+        return {
+            "user_id": request.state.auth_user_id,
+            "role": request.state.auth_role,
+            "type": request.state.auth_payload["type"],
+        }
+
+    @app.get("/context")
+    async def context():
+        return get_request_context()
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i};".encode()
+
+        return StreamingResponse(chunks())
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+async def test_state_is_visible_to_handlers(client: AsyncClient, signing_key) -> None:
+    response = await client.get("/whoami", headers={"Authorization": make_token(signing_key)})
+
+    assert response.status_code == 200
+    assert response.json() == {"user_id": "user-1", "role": "student", "type": "access"}
+
+
+async def test_request_context_user_id_only_with_sub(client: AsyncClient, signing_key) -> None:
+    with_sub = await client.get("/context", headers={"Authorization": make_token(signing_key)})
+    without_sub = await client.get(
+        "/context", headers={"Authorization": make_token(signing_key, sub=None)}
+    )
+
+    assert with_sub.json()["user_id"] == "user-1"
+    assert without_sub.status_code == 200
+    assert "user_id" not in without_sub.json()
+
+
+async def test_missing_token(client: AsyncClient, signing_key) -> None:
+    response = await client.get("/whoami")
+
+    assert response.status_code == 401
+    assert response.json()["message"] == "access_required"
+
+
+async def test_refresh_token_rejected(client: AsyncClient, signing_key) -> None:
+    token = make_token(signing_key, type="refresh")
+
+    response = await client.get("/whoami", headers={"Authorization": token})
+
+    assert response.status_code == 401
+    assert response.json()["message"] == "not_access"
+
+
+async def test_streaming_response_passes_through(client: AsyncClient, signing_key) -> None:
+    response = await client.get("/stream", headers={"Authorization": make_token(signing_key)})
+
+    assert response.text == "0;1;2;"
+
+
+async def test_revoked_token_rejected(client: AsyncClient, signing_key, monkeypatch) -> None:
+    now = int(time.time())
+
+    async def fetch(since: int) -> dict:
+        return {
+            "entries": [{"user_id": "user-1", "not_before": now - 5}],
+            "cursor": 1,
+            "has_more": False,
+        }
+
+    feed = RevocationFeed("http://auth/revocations", fetch=fetch)
+    await feed.poll()
+    monkeypatch.setattr(auth_module, "_revocation_feed", feed)
+
+    old = await client.get("/whoami", headers={"Authorization": make_token(signing_key, iat=now - 10)})
+    fresh = await client.get("/whoami", headers={"Authorization": make_token(signing_key, iat=now)})
+
+    assert old.status_code == 401
+    assert old.json()["message"] == "token_revoked"
+    assert fresh.status_code == 200
@@ -0,0 +1,163 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.modules.courses.enums import QuestionType
+from app.modules.courses.models_import import Answer, Question
+from app.modules.courses.repositories.AnswerRepository import AnswerRepository
+from app.modules.courses.exceptions import ForbiddenError
+from app.modules.courses.repositories.BulkInsertRepository import BulkInsertRepository, BulkInsertResult
+from app.modules.courses.repositories.QuestionRepository import QuestionRepository
+from app.modules.courses.schemas.TestScheme import TestCreate as QuizCreate
+from app.modules.courses.services.TestService import TestService as QuizService
+
+
+class SyncSessionAdapter:
+    """AsyncSession-подобная обёртка над синхронной sqlite-сессией: считает INSERT и commit."""
+
+    def __init__(self, engine):
+        # как SessionLocal: после commit объекты не перечитываются
+        self.session = Session(engine, expire_on_commit=False)
+        self.statements = []
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    async def scalars(self, *args, **kwargs):
+        return self.session.scalars(*args, **kwargs)
+
+    async def commit(self):
+        self.commits += 1
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        Question.__table__.create(conn)
+        Answer.__table__.create(conn)
+    yield SyncSessionAdapter(engine)
+    engine.dispose()
+
+
+def question_rows(test_id, count: int) -> list[dict]:
+    return [
+        {"test_id": test_id, "text": f"question {i}", "question_type": QuestionType.OPEN, "score": 1}
+        for i in range(count)
+    ]
+
+
+async def test_batch_is_one_statement_with_assigned_order(db) -> None:
+    test_id = uuid4()
+    repo = QuestionRepository(db)
+
+    first = await repo.create_bulk(question_rows(test_id, 3))
+    db.statements.clear()
+    second = await repo.create_bulk(question_rows(test_id, 50))
+
+    assert [q.order_index for q in first.inserted] == [0, 1, 2]
+    assert [q.order_index for q in second.inserted] == list(range(3, 53))
+    assert [q.text for q in second.inserted] == [f"question {i}" for i in range(50)]
+    assert len(db.statements) == 1
+    assert db.statements[0].startswith("INSERT INTO questions")
+    assert db.commits == 2
+
+
+async def test_conflicting_batch_inserts_nothing(db) -> None:
+    question_id = uuid4()
+    repo = AnswerRepository(db)
+    await repo.create_bulk([{"question_id": question_id, "text": "a", "order_index": 1}])
+
+    result = await repo.create_bulk(
+        [
+            {"question_id": question_id, "text": "b", "order_index": 0},
+            {"question_id": question_id, "text": "c", "order_index": 1},
+        ]
+    )
+
+    assert result.inserted == []
+    assert [row["order_index"] for row in result.conflicts] == [1]
+    assert db.session.query(Answer).count() == 1
+    assert db.commits == 1
+
+
+def test_statement_targets_postgres_upsert() -> None:
+    rows = [{**row, "id": uuid4()} for row in question_rows(uuid4(), 2)]
+
+    sql = str(
+        BulkInsertRepository(None)
+        .build_statement(Question, rows, Question.test_id)
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert sql.startswith("INSERT INTO questions")
+    assert "coalesce(max(questions.order_index)" in sql
+    assert "ON CONFLICT DO NOTHING RETURNING questions.id" in sql
+
+
+async def test_order_race_is_retried() -> None:
+    db = AsyncMock()
+    calls = []
+
+    async def scalars(stmt, **kwargs):
+        ids = [v for k, v in stmt.compile(dialect=postgresql.dialect()).params.items() if k.startswith("id_m")]
+        calls.append(ids)
+        # первая попытка: параллельная вставка заняла второй order_index
+        returned = ids[:1] if len(calls) == 1 else ids
+        return MagicMock(all=MagicMock(return_value=[SimpleNamespace(id=i) for i in returned]))
+
+    db.scalars.side_effect = scalars
+
+    result = await BulkInsertRepository(db).insert(Question, question_rows(uuid4(), 2), Question.test_id)
+
+    assert [obj.id for obj in result.inserted] == calls[1]
+    assert result.conflicts == []
+    db.rollback.assert_awaited_once()
+    db.commit.assert_awaited_once()
+
+
+def teacher_quiz_service(lessons, assigned):
+    repo = AsyncMock()
+    repo.get_assigned_ids_to_create_by_user.return_value = assigned
+    repo.create_bulk.return_value = BulkInsertResult(inserted=["ok"])
+    lesson_repo = AsyncMock()
+    lesson_repo.get_by_ids.return_value = lessons
+    return QuizService(repo, lesson_repo), repo, lesson_repo
+
+
+async def test_test_batch_checks_lessons_in_one_query() -> None:
+    lessons = [SimpleNamespace(id=uuid4(), delete_flg=False) for _ in range(100)]
+    service, repo, lesson_repo = teacher_quiz_service(lessons, {lesson.id for lesson in lessons})
+    user = SimpleNamespace(id=uuid4(), roles=["teacher"])
+
+    inserted = await service.create_bulk(
+        user, [QuizCreate(title=f"quiz {i}", lesson_id=lesson.id) for i, lesson in enumerate(lessons)]
+    )
+
+    assert inserted == ["ok"]
+    lesson_repo.get_by_ids.assert_awaited_once()
+    lesson_repo.get_by_id.assert_not_awaited()
+    repo.get_assigned_ids_to_create_by_user.assert_awaited_once()
+    repo.get_assigned_to_create_by_user.assert_not_awaited()
+
+
+async def test_test_batch_rejects_foreign_lesson() -> None:
+    lessons = [SimpleNamespace(id=uuid4(), delete_flg=False) for _ in range(3)]
+    service, repo, _ = teacher_quiz_service(lessons, {lesson.id for lesson in lessons[:2]})
+    user = SimpleNamespace(id=uuid4(), roles=["teacher"])
+
+    with pytest.raises(ForbiddenError):
+        await service.create_bulk(user, [QuizCreate(title="quiz", lesson_id=lesson.id) for lesson in lessons])
+
+    repo.create_bulk.assert_not_awaited()
@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from app.modules.courses.repositories.CascadeDeleteRepository import CascadeDeleteRepository
+
+
+# root -> число UPDATE: сам узел + уровни ниже (+ course_students/course_reviews для курса)
+CASCADES = [
+    ("course", 7),
+    ("lesson", 4),
+    ("test", 3),
+    ("question", 2),
+]
+
+
+def make_session(tree_size: int) -> AsyncMock:
+    db = AsyncMock()
+    # старая реализация обходила дерево по id из db.scalars — отдаём "большое дерево"
+    db.scalars.return_value = [uuid4() for _ in range(tree_size)]
+    return db
+
+
+def compiled(db: AsyncMock) -> list[str]:
+    return [
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in db.execute.await_args_list
+    ]
+
+
+@pytest.mark.parametrize("root, expected", CASCADES)
+@pytest.mark.parametrize("tree_size", [1, 40, 1000])
+@pytest.mark.parametrize("action", ["delete", "restore"])
+async def test_cascade_statement_count_is_constant(
+    root: str, expected: int, tree_size: int, action: str
+) -> None:
+    db = make_session(tree_size)
+    repo = CascadeDeleteRepository(db)
+
+    await getattr(repo, f"{action}_{root}")(uuid4())
+
+    assert db.execute.await_count == expected
+    db.scalars.assert_not_awaited()
+    assert all(sql.startswith("UPDATE") for sql in compiled(db))
+
+
+async def test_delete_course_uses_parent_subqueries() -> None:
+    db = make_session(0)
+
+    await CascadeDeleteRepository(db).delete_course(uuid4())
+
+    statements = compiled(db)
+    tables = [sql.split()[1] for sql in statements]
+    # снизу вверх: ответы раньше вопросов, ..., сам курс последним
+    order = [tables.index(t) for t in ("answers", "questions", "tests", "lessons", "courses")]
+    assert order == sorted(order)
+    assert tables[-1] == "courses"
+    assert "answers.question_id IN (SELECT questions.id" in statements[tables.index("answers")]
+
+
+async def test_restore_matches_cascade_timestamp() -> None:
+    db = make_session(0)
+
+    await CascadeDeleteRepository(db).restore_lesson(uuid4())
+
+    for sql in compiled(db):
+        assert "(SELECT lessons.update_at" in sql
@@ -0,0 +1,272 @@
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from httpx import AsyncClient
+
+from app.modules.courses import course_tree as course_tree_module
+from app.modules.courses.course_tree import (
+    FULL,
+    STUDENT,
+    CourseTreeCache,
+    build_snapshot,
+    course_tree_cache,
+)
+from app.modules.courses.enums import ContentType, CourseLevel, QuestionType
+from app.modules.courses.exceptions import ForbiddenError
+from app.modules.courses.repositories.AnswerRepository import AnswerRepository
+from app.modules.courses.repositories.LessonRepository import LessonRepository
+from app.modules.courses.repositories import TestRepository as test_repository
+from app.modules.courses.services.CourseService import CourseService
+
+
+class FakeUser:
+    def __init__(self, roles: list[str]):
+        self.id = uuid4()
+        self.roles = roles
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    course_tree_cache.clear()
+    yield
+    course_tree_cache.clear()
+
+
+def answer(order_index: int, is_correct: bool = False):
+    return SimpleNamespace(id=uuid4(), text=f"answer {order_index}", is_correct=is_correct, order_index=order_index)
+
+
+def question(order_index: int, answers: list):
+    return SimpleNamespace(
+        id=uuid4(),
+        text=f"question {order_index}",
+        question_type=QuestionType.SINGLE_CHOICE,
+        order_index=order_index,
+        score=1,
+        answer=answers,
+    )
+
+
+def lesson(order_index: int, test=None):
+    return SimpleNamespace(
+        id=uuid4(),
+        title=f"lesson {order_index}",
+        short_description=None,
+        content_type=ContentType.TEXT,
+        order_index=order_index,
+        text_content="text",
+        content_url=None,
+        test=[test] if test else [],
+    )
+
+
+def make_session() -> AsyncMock:
+    db = AsyncMock()
+    db.add = MagicMock()
+    return db
+
+
+def make_course(author_id=None):
+    active = SimpleNamespace(
+        id=uuid4(),
+        title="active test",
+        description=None,
+        is_active=True,
+        question=[question(1, [answer(1), answer(0, True)]), question(0, [answer(0)])],
+    )
+    inactive = SimpleNamespace(id=uuid4(), title="draft", description=None, is_active=False, question=[])
+    return SimpleNamespace(
+        id=uuid4(),
+        title="Course tree",
+        description=None,
+        level=CourseLevel.BEGINNER,
+        author_id=author_id or uuid4(),
+        is_published=True,
+        delete_flg=False,
+        update_at=datetime(2026, 1, 1),
+        lesson=[lesson(2, inactive), lesson(0, active), lesson(1)],
+    )
+
+
+def test_snapshot_orders_tree_and_strips_answers_for_students() -> None:
+    course = make_course()
+
+    snapshot = build_snapshot(course, course_tree_cache.generation)
+    full = json.loads(snapshot.body(FULL)[0])
+    student = json.loads(snapshot.body(STUDENT)[0])
+
+    assert [item["order_index"] for item in full["lessons"]] == [0, 1, 2]
+    questions = full["lessons"][0]["test"]["questions"]
+    assert [item["order_index"] for item in questions] == [0, 1]
+    assert [item["is_correct"] for item in questions[1]["answers"]] == [True, False]
+    assert full["lessons"][2]["test"]["is_active"] is False
+
+    student_answers = student["lessons"][0]["test"]["questions"][1]["answers"]
+    assert all("is_correct" not in item for item in student_answers)
+    assert student["lessons"][2]["test"] is None
+    assert snapshot.body(FULL)[1] != snapshot.body(STUDENT)[1]
+    assert len(snapshot.members) == 3 + 2 + 2 + 3
+
+
+def test_invalidation_by_any_node_id() -> None:
+    cache = CourseTreeCache(maxsize=10, ttl=60)
+    course, other = make_course(), make_course()
+    cache.set(build_snapshot(course, cache.generation))
+    cache.set(build_snapshot(other, cache.generation))
+
+    deep_answer = course.lesson[1].test[0].question[0].answer[0]
+    cache.invalidate(deep_answer.id)
+
+    assert cache.get(course.id) is None
+    assert cache.get(other.id) is not None
+    assert cache.stats()["indexed_ids"] == len(cache.get(other.id).members) + 1
+
+
+def test_fill_started_before_invalidation_is_dropped() -> None:
+    cache = CourseTreeCache(maxsize=10, ttl=60)
+    course = make_course()
+    version = cache.generation
+
+    cache.invalidate(course.lesson[1].test[0].question[0].id)
+    cache.set(build_snapshot(course, version))
+
+    assert cache.get(course.id) is None
+    assert cache.stats()["stale_fills"] == 1
+
+
+def test_other_course_changes_do_not_drop_fill() -> None:
+    cache = CourseTreeCache(maxsize=10, ttl=60)
+    course, other = make_course(), make_course()
+    version = cache.generation
+
+    cache.invalidate(other.id, other.lesson[0].id)
+    cache.set(build_snapshot(course, version))
+
+    assert cache.get(course.id) is not None
+    assert cache.stats()["stale_fills"] == 0
+
+
+def test_fill_older_than_change_log_is_dropped() -> None:
+    cache = CourseTreeCache(maxsize=10, ttl=60, log_size=2)
+    course = make_course()
+    version = cache.generation
+
+    cache.invalidate(course.id)
+    cache.invalidate(uuid4(), uuid4())
+    cache.set(build_snapshot(course, version))
+
+    assert cache.get(course.id) is None
+    assert cache.stats()["changed_ids"] == 2
+
+
+def test_ttl_expires(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(course_tree_module.time, "monotonic", lambda: now[0])
+    cache = CourseTreeCache(maxsize=10, ttl=5)
+    course = make_course()
+
+    cache.set(build_snapshot(course, cache.generation))
+    now[0] += 6
+
+    assert cache.get(course.id) is None
+    assert cache.stats()["indexed_ids"] == 0
+
+
+async def test_service_loads_once_and_checks_access_on_hits() -> None:
+    teacher = FakeUser(["teacher"])
+    course = make_course(author_id=teacher.id)
+    repo = AsyncMock()
+    repo.get_by_id.return_value = course
+    repo.get_tree.return_value = course
+    service = CourseService(repo)
+
+    first = await service.get_course_tree(teacher, course.id, False)
+    second = await service.get_course_tree(teacher, course.id, False)
+    stripped = await service.get_course_tree(teacher, course.id, True)
+
+    assert first == second
+    assert stripped != first
+    repo.get_tree.assert_awaited_once_with(course.id)
+
+    with pytest.raises(ForbiddenError):
+        await service.get_course_tree(FakeUser(["teacher"]), course.id, False)
+
+
+async def test_access_is_checked_before_tree_is_loaded() -> None:
+    course = make_course()
+    repo = AsyncMock()
+    repo.get_by_id.return_value = course
+    repo.get_tree.return_value = course
+
+    with pytest.raises(ForbiddenError):
+        await CourseService(repo).get_course_tree(FakeUser(["teacher"]), course.id, False)
+
+    repo.get_tree.assert_not_awaited()
+    assert course_tree_cache.get(course.id) is None
+
+
+async def test_student_always_gets_stripped_tree() -> None:
+    student = FakeUser(["student"])
+    course = make_course()
+    repo = AsyncMock()
+    repo.get_by_id.return_value = course
+    repo.get_tree.return_value = course
+    repo.get_assigned_to_user.return_value = True
+
+    body, _ = await CourseService(repo).get_course_tree(student, course.id, False)
+
+    assert b"is_correct" not in body
+    repo.get_assigned_to_user.assert_awaited_once_with(student.id, course.id, "student")
+
+
+async def test_repository_writes_invalidate_tree() -> None:
+    course = make_course()
+    course_tree_cache.set(build_snapshot(course, course_tree_cache.generation))
+    test = course.lesson[1].test[0]
+    repo = test_repository.TestRepository(AsyncMock())
+    repo.get_by_id = AsyncMock(return_value=SimpleNamespace(id=test.id, is_active=True))
+
+    await repo.deactivate(test.id)
+
+    assert course_tree_cache.get(course.id) is None
+
+
+async def test_new_nodes_invalidate_through_parent() -> None:
+    course = make_course()
+    course_tree_cache.set(build_snapshot(course, course_tree_cache.generation))
+
+    await LessonRepository(make_session()).create(
+        {"course_id": course.id, "title": "new lesson", "order_index": 3}
+    )
+    assert course_tree_cache.get(course.id) is None
+
+    course_tree_cache.set(build_snapshot(course, course_tree_cache.generation))
+    parent = course.lesson[1].test[0].question[0]
+    await AnswerRepository(make_session()).create({"question_id": parent.id, "text": "new", "order_index": 5})
+    assert course_tree_cache.get(course.id) is None
+
+
+async def test_tree_route_supports_etag(client: AsyncClient, mock_course_service: AsyncMock) -> None:
+    mock_course_service.get_course_tree.return_value = (b'{"lessons": []}', '"abc"')
+    course_id = str(uuid4())
+
+    response = await client.get("/courses/tree", params={"course_id": course_id})
+    cached = await client.get(
+        "/courses/tree", params={"course_id": course_id}, headers={"If-None-Match": '"abc"'}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] == '"abc"'
+    assert response.json() == {"lessons": []}
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    for header in ('"old", "abc"', 'W/"abc"', "*"):
+        revalidated = await client.get(
+            "/courses/tree", params={"course_id": course_id}, headers={"If-None-Match": header}
+        )
+        assert revalidated.status_code == 304
@@ -94,3 +94,14 @@ async def test_hard_delete_course(client: AsyncClient) -> None:
 
     assert response.status_code == 200
     assert response.json() is True
+
+
+@pytest.mark.asyncio
+async def test_restore_course(client: AsyncClient) -> None:
+    response = await client.put(
+        "/courses/restore",
+        params={"course_id": str(uuid4())},
+    )
+
+    assert response.status_code == 200
+    assert response.json() is True
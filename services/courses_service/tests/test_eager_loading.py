@@ -0,0 +1,101 @@
+import pytest
+from uuid import uuid4
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.modules.courses.enums import QuestionType
+from app.modules.courses.models_import import Answer, Question, Test as Quiz
+from app.modules.courses.repositories.QuestionRepository import QuestionRepository
+from app.modules.courses.repositories import TestRepository as test_repository
+from app.modules.courses.schemas_import import QuestionWithAnswers, TestWithQuestions as QuizWithQuestions
+
+
+@pytest.fixture
+def engine():
+    # те же запросы, что уходят в Postgres, на синхронном sqlite в памяти:
+    # считаем statements, а не время
+    engine = create_engine("sqlite://")
+    tables = [Quiz.__table__, Question.__table__, Answer.__table__]
+    with engine.begin() as conn:
+        for table in tables:
+            table.create(conn)
+    yield engine
+    engine.dispose()
+
+
+def seed(engine, questions: int, answers: int):
+    test = Quiz(id=uuid4(), lesson_id=uuid4(), title="Quiz")
+    # вставляем в обратном порядке — порядок в ответе задаёт order_index
+    for q in reversed(range(questions)):
+        question = Question(
+            test=test,
+            text=f"question {q}",
+            question_type=QuestionType.SINGLE_CHOICE,
+            order_index=q,
+            score=1,
+            delete_flg=q == 1,
+        )
+        for a in reversed(range(answers)):
+            Answer(question=question, text=f"answer {a}", order_index=a, delete_flg=a == 0)
+
+    with Session(engine) as session:
+        session.add(test)
+        session.commit()
+        return test.id
+
+
+def count_statements(engine, query):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        with Session(engine) as session:
+            obj = session.execute(query).scalar_one_or_none()
+            # сериализация не должна догружать связи
+            payload = (QuizWithQuestions if isinstance(obj, Quiz) else QuestionWithAnswers).model_validate(obj)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return len(statements), payload
+
+
+@pytest.mark.parametrize("questions,answers", [(2, 2), (40, 6)])
+def test_test_with_questions_is_three_statements(engine, questions: int, answers: int) -> None:
+    test_id = seed(engine, questions, answers)
+
+    count, payload = count_statements(
+        engine, test_repository.TestRepository.with_questions_query(test_id, False)
+    )
+
+    assert count == 3
+    orders = [question.order_index for question in payload.questions]
+    assert orders == [q for q in range(questions) if q != 1]
+    assert [answer.order_index for answer in payload.questions[0].answers] == list(range(1, answers))
+
+
+def test_deleted_filter_is_optional(engine) -> None:
+    test_id = seed(engine, 3, 2)
+
+    count, payload = count_statements(
+        engine, test_repository.TestRepository.with_questions_query(test_id, None)
+    )
+
+    assert count == 3
+    assert [question.order_index for question in payload.questions] == [0, 1, 2]
+    assert len(payload.questions[1].answers) == 2
+
+
+@pytest.mark.parametrize("answers", [1, 50])
+def test_question_with_answers_is_two_statements(engine, answers: int) -> None:
+    test_id = seed(engine, 1, answers)
+    with Session(engine) as session:
+        question_id = session.query(Question.id).filter(Question.test_id == test_id).scalar()
+
+    count, payload = count_statements(engine, QuestionRepository.with_answers_query(question_id, False))
+
+    assert count == 2
+    assert [answer.order_index for answer in payload.answers] == list(range(1, answers))
@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.core.jwks import AsyncJWKSProvider, JWKSUnavailableError
+
+
+def make_jwk(kid: str) -> tuple[rsa.RSAPrivateKey, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid=kid, alg="RS256", use="sig")
+    return private_key, jwk
+
+
+class FakeAuthService:
+    def __init__(self, *jwks: dict):
+        self.jwks = list(jwks)
+        self.calls = 0
+        self.fail = False
+        self.delay = 0.0
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("auth service is down")
+        return {"keys": self.jwks}
+
+
+async def test_concurrent_misses_share_one_fetch() -> None:
+    private_key, jwk = make_jwk("k1")
+    service = FakeAuthService(jwk)
+    service.delay = 0.01
+    provider = AsyncJWKSProvider("http://auth", fetch=service)
+
+    keys = await asyncio.gather(*(provider.get_signing_key("k1") for _ in range(50)))
+
+    assert service.calls == 1
+    token = jwt.encode({"sub": "u"}, private_key, algorithm="RS256", headers={"kid": "k1"})
+    assert jwt.decode(token, keys[0], algorithms=["RS256"])["sub"] == "u"
+
+
+async def test_cached_keys_do_not_refetch() -> None:
+    _, jwk = make_jwk("k1")
+    service = FakeAuthService(jwk)
+    provider = AsyncJWKSProvider("http://auth", fetch=service)
+
+    first = await provider.get_signing_key("k1")
+    for _ in range(100):
+        assert await provider.get_signing_key("k1") is first
+
+    assert service.calls == 1
+
+
+async def test_stale_keys_are_served_while_auth_is_down() -> None:
+    _, jwk = make_jwk("k1")
+    service = FakeAuthService(jwk)
+    provider = AsyncJWKSProvider("http://auth", ttl=0.0, fetch=service)
+    key = await provider.get_signing_key("k1")
+
+    service.fail = True
+    assert await provider.get_signing_key("k1") is key
+    await asyncio.sleep(0)
+
+    assert service.calls == 2
+    assert await provider.get_signing_key("k1") is key
+
+
+async def test_unavailable_without_any_keys() -> None:
+    service = FakeAuthService()
+    service.fail = True
+    provider = AsyncJWKSProvider("http://auth", fetch=service)
+
+    with pytest.raises(JWKSUnavailableError):
+        await provider.get_signing_key("k1")
+
+
+async def test_unknown_kid_triggers_rotation_refresh() -> None:
+    _, old = make_jwk("old")
+    _, new = make_jwk("new")
+    service = FakeAuthService(old)
+    provider = AsyncJWKSProvider("http://auth", min_refresh_interval=0.0, fetch=service)
+    await provider.get_signing_key("old")
+
+    service.jwks = [old, new]
+    key = await provider.get_signing_key("new")
+
+    assert service.calls == 2
+    assert key.public_numbers().n == jwt.PyJWK.from_dict(new).key.public_numbers().n
+
+
+async def test_unknown_kid_refresh_is_rate_limited() -> None:
+    _, jwk = make_jwk("k1")
+    service = FakeAuthService(jwk)
+    provider = AsyncJWKSProvider("http://auth", min_refresh_interval=60.0, fetch=service)
+    await provider.get_signing_key("k1")
+
+    for _ in range(20):
+        await provider.get_signing_key("forged")
+
+    assert service.calls == 1
+
+
+async def test_background_refresh_before_expiry() -> None:
+    _, jwk = make_jwk("k1")
+    service = FakeAuthService(jwk)
+    provider = AsyncJWKSProvider("http://auth", ttl=0.05, refresh_margin=0.04, fetch=service)
+
+    provider.start()
+    await asyncio.sleep(0.05)
+    await provider.stop()
+
+    assert service.calls >= 2
+
+
+@pytest.mark.parametrize("alg", ["ES256", "EdDSA"])
+async def test_non_rsa_keys_carry_their_algorithm(alg: str) -> None:
+    algorithm = jwt.get_algorithm_by_name(alg)
+    if alg == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    jwk = json.loads(algorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid="k2", alg=alg, use="sig")
+    provider = AsyncJWKSProvider("http://auth", fetch=FakeAuthService(jwk))
+
+    key = await provider.get_jwk("k2")
+
+    token = jwt.encode({"sub": "u"}, private_key, algorithm=alg, headers={"kid": "k2"})
+    assert key.algorithm_name == alg
+    assert jwt.decode(token, key.key, algorithms=[key.algorithm_name])["sub"] == "u"
@@ -0,0 +1,117 @@
+import asyncio
+
+from learning_platform_common.revocations import RevocationFeed
+
+
+class FakeFeed:
+    """Лента auth-сервиса в памяти: страницы по `page` записей после since."""
+
+    def __init__(self, page: int = 100):
+        self.rows: list[tuple[int, str, float]] = []
+        self.page = page
+        self.calls: list[int] = []
+        self.fail = False
+
+    def revoke(self, user_id: str, not_before: float) -> None:
+        self.rows = [r for r in self.rows if r[1] != user_id]
+        seq = max((r[0] for r in self.rows), default=0) + 1
+        self.rows.append((seq, user_id, not_before))
+
+    async def __call__(self, since: int) -> dict:
+        self.calls.append(since)
+        if self.fail:
+            raise ConnectionError("auth service is down")
+        rows = [r for r in sorted(self.rows) if r[0] > since]
+        page = rows[: self.page]
+        return {
+            "entries": [{"user_id": u, "not_before": nb} for _, u, nb in page],
+            "cursor": page[-1][0] if page else since,
+            "has_more": len(rows) > self.page,
+            "ttl": 900,
+        }
+
+
+async def test_tokens_issued_before_watermark_are_revoked() -> None:
+    fake = FakeFeed()
+    fake.revoke("u1", 1000)
+    feed = RevocationFeed("http://auth", fetch=fake)
+
+    await feed.poll()
+
+    assert feed.is_revoked("u1", 999)
+    assert not feed.is_revoked("u1", 1000)
+    assert not feed.is_revoked("u2", 1)
+    assert feed.is_revoked("u1", None)
+
+
+async def test_incremental_polls_follow_cursor_across_pages() -> None:
+    fake = FakeFeed(page=2)
+    for i in range(5):
+        fake.revoke(f"u{i}", 100)
+    feed = RevocationFeed("http://auth", fetch=fake)
+
+    await feed.poll()
+    assert fake.calls == [0, 2, 4]
+    assert feed.cursor == 5
+
+    fake.revoke("u0", 200)
+    await feed.poll()
+
+    assert fake.calls[-1] == 5
+    assert feed.cursor == 6
+    assert feed.is_revoked("u0", 150)
+    assert feed.stats()["size"] == 5
+
+
+async def test_full_resync_replaces_map() -> None:
+    fake = FakeFeed()
+    fake.revoke("u1", 100)
+    feed = RevocationFeed("http://auth", resync_interval=0, fetch=fake)
+    await feed.poll()
+
+    # запись вычищена на стороне auth (старше ttl) — после пересинхронизации её нет
+    fake.rows.clear()
+    fake.revoke("u2", 100)
+    await feed.poll()
+
+    assert fake.calls == [0, 0]
+    assert not feed.is_revoked("u1", 1)
+    assert feed.is_revoked("u2", 1)
+
+
+async def test_failed_poll_keeps_last_map() -> None:
+    fake = FakeFeed()
+    fake.revoke("u1", 100)
+    feed = RevocationFeed("http://auth", interval=0, fetch=fake)
+    await feed.poll()
+
+    fake.fail = True
+    feed.maybe_poll()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert feed.stats()["failures"] == 1
+    assert feed.is_revoked("u1", 1)
+
+
+async def test_maybe_poll_respects_interval() -> None:
+    fake = FakeFeed()
+    feed = RevocationFeed("http://auth", interval=60, fetch=fake)
+    await feed.poll()
+
+    feed.maybe_poll()
+    await asyncio.sleep(0)
+
+    assert fake.calls == [0]
+
+
+async def test_sub_second_watermark() -> None:
+    fake = FakeFeed()
+    fake.revoke("u1", 1000.4)
+    feed = RevocationFeed("http://auth", fetch=fake)
+    await feed.poll()
+
+    # выдан до отзыва в ту же секунду — отозван; новый вход после отзыва — нет
+    assert feed.is_revoked("u1", 1000.3)
+    assert not feed.is_revoked("u1", 1000.5)
+    assert feed.is_revoked("u1", "1000.5")
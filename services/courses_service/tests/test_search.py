@@ -0,0 +1,116 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from httpx import AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.modules.courses import search
+from app.modules.courses.repositories.CatalogSearchRepository import CatalogSearchRepository, SEARCH_TYPES
+from app.modules.courses.repositories.LessonRepository import LessonRepository
+from app.modules.courses.services.CourseService import CourseService
+from app.modules.courses.exceptions import ConflictError, ForbiddenError
+
+
+class FakeUser:
+    def __init__(self, roles: list[str]):
+        self.id = uuid4()
+        self.roles = roles
+
+
+def compile_pg(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def catalog_sql(role: str, types=SEARCH_TYPES) -> str:
+    return compile_pg(CatalogSearchRepository(None).build_statement(uuid4(), role, "кэширование", types, 20))
+
+
+def test_schema_statements_cover_every_document() -> None:
+    statements = search.search_schema_statements()
+
+    assert len(statements) == 2 * len(search.SEARCH_DOCUMENTS)
+    assert statements[0].startswith("ALTER TABLE courses ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    assert "setweight(to_tsvector('russian', coalesce(title, '')), 'A')" in statements[0]
+    assert statements[0].endswith("STORED")
+    assert statements[1] == "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_courses_search_vector ON courses USING gin (search_vector)"
+
+
+async def test_lesson_search_uses_full_text_index() -> None:
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    await LessonRepository(db).search_in_course(uuid4(), "кэш", False, 0, 10)
+
+    sql = compile_pg(db.execute.await_args.args[0])
+
+    assert "ILIKE" not in sql.upper()
+    assert "lessons.search_vector @@ websearch_to_tsquery(CAST(" in sql
+    assert "ORDER BY ts_rank(lessons.search_vector" in sql
+
+
+def test_catalog_is_one_ranked_union() -> None:
+    sql = catalog_sql("admin")
+
+    assert sql.count("UNION ALL") == len(SEARCH_TYPES) - 1
+    assert sql.count("@@ websearch_to_tsquery") == len(SEARCH_TYPES)
+    assert "ORDER BY anon_1.rank DESC" in sql
+    assert "LIMIT" in sql
+    assert "course_students" not in sql
+
+
+def test_catalog_access_is_filtered_in_sql() -> None:
+    teacher = catalog_sql("teacher")
+    student = catalog_sql("student")
+
+    assert "courses.author_id =" in teacher
+    assert "is_published" not in teacher
+    assert "course_students.is_active = true" in student
+    assert "courses.is_published = true" in student
+    assert "tests.is_active = true" in student
+    assert "course_reviews.is_published = true" in student
+
+
+def test_catalog_only_requested_types() -> None:
+    sql = catalog_sql("admin", ["lesson"])
+
+    assert "UNION ALL" not in sql
+    assert "lessons.search_vector" in sql
+    assert "courses.search_vector" not in sql
+
+
+async def test_service_picks_role_and_filters_types() -> None:
+    search_repo = AsyncMock()
+    search_repo.search.return_value = []
+    service = CourseService(AsyncMock(), search_repo)
+    user = FakeUser(["student", "teacher"])
+
+    await service.search_catalog(user, "  кэш  ", ["review", "lesson", "unknown"], 10)
+
+    search_repo.search.assert_awaited_once_with(user.id, "teacher", "кэш", ["lesson", "review"], 10)
+
+
+async def test_service_rejects_blank_query_and_unknown_role() -> None:
+    service = CourseService(AsyncMock(), AsyncMock())
+
+    with pytest.raises(ConflictError):
+        await service.search_catalog(FakeUser(["admin"]), "   ", None, 10)
+    with pytest.raises(ForbiddenError):
+        await service.search_catalog(FakeUser(["guest"]), "кэш", None, 10)
+
+
+async def test_search_route(client: AsyncClient, mock_course_service: AsyncMock) -> None:
+    hit = {"type": "lesson", "id": uuid4(), "course_id": uuid4(), "title": "Кэширование", "rank": 0.6}
+    mock_course_service.search_catalog.return_value = [hit]
+
+    response = await client.get("/courses/search", params={"q": "кэш", "types": ["lesson", "test"], "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == str(hit["id"])
+    args = mock_course_service.search_catalog.await_args.args
+    assert args[1:] == ("кэш", ["lesson", "test"], 5)
+
+
+async def test_search_route_validates_input(client: AsyncClient) -> None:
+    assert (await client.get("/courses/search", params={"q": "x"})).status_code == 422
+    assert (await client.get("/courses/search", params={"q": "кэш", "types": "answer"})).status_code == 422
+    assert (await client.get("/courses/search", params={"q": "кэш", "limit": 500})).status_code == 422
@@ -1,9 +1,14 @@
+import logging
 import os
 
 from fastapi import FastAPI
+from learning_platform_common.logging import RequestContextMiddleware, setup_logging
 
 from app.api.main_router import main_router
 
+logger = logging.getLogger(__name__)
+
+
 def try_pycharm_attach() -> None:
   if os.getenv("PYCHARM_ATTACH", "0").lower() in ("1", "true", "yes"):
     try:
@@ -17,12 +22,13 @@ def try_pycharm_attach() -> None:
         suspend=False,
         trace_only_current_thread=False,
       )
-      print(f"[debug] ✅ Attached to PyCharm at {host}:{port}")
+      logger.info("PyCharm debugger attached at %s:%s", host, port)
     except Exception as e:
-      print(f"[debug] ❌ Failed to attach to PyCharm: {e}")
+      logger.warning("Failed to attach to PyCharm: %s", e)
 
 
 def create_app() -> FastAPI:
+  setup_logging("progress_service")
   try_pycharm_attach()
 
   app = FastAPI(
@@ -36,6 +42,6 @@ def create_app() -> FastAPI:
   async def _startup_attach() -> None:
     try_pycharm_attach()
 
-
+  app.add_middleware(RequestContextMiddleware)
   app.include_router(main_router)
   return app
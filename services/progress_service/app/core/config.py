@@ -12,6 +12,10 @@ class Settings(BaseSettings):
   auth_jwks_url: str | None = Field(alias="AUTH_JWKS_URL", default=None)
   auth_issuer: str | None = Field(alias="AUTH_ISSUER", default=None)
   auth_audience: str | None = Field(alias="AUTH_AUDIENCE", default=None)
+  # лента отзыва auth-сервиса; без URL проверка отзыва выключена
+  auth_revocations_url: str | None = Field(alias="AUTH_REVOCATIONS_URL", default=None)
+  revocation_feed_token: str | None = Field(alias="REVOCATION_FEED_TOKEN", default=None)
+  revocation_poll_interval: float = Field(alias="REVOCATION_POLL_INTERVAL", default=5.0)
 
   progress_schema: str = Field(default="progress", description="Схема для таблиц прогресса")
   max_lessons_per_course: int = Field(default=10, description="Максимальное количество уроков в курсе")
@@ -1,83 +1,160 @@
 from __future__ import annotations
 
-import base64
+import hashlib
 import time
+from collections import OrderedDict
 from typing import Any
 
 import httpx
 import jwt
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyCookie
+from learning_platform_common.revocations import RevocationFeed
 
 from app.core.config import settings
 
 
 class _JWKS:
     keys: dict[str, Any] | None = None
+    # kid -> (готовый объект открытого ключа, alg); пересобирается вместе с keys
+    parsed: dict[str | None, tuple[Any, str]] = {}
     exp_at: float = 0.0
     ttl: int = 300  # 5 минут
+    # внеочередное перечитывание при неизвестном kid — не чаще раза в столько секунд
+    min_refresh_interval: int = 10
+    fetched_at: float = 0.0
 
 
-async def _get_jwks() -> dict[str, Any]:
+class _VerifiedTokens:
+    # sha256(token) -> (момент истечения записи, payload)
+    entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+    maxsize: int = 10_000
+    ttl: int = 60
+
+
+# без фоновой задачи: опрос запускается из verify_jwt не чаще interval
+revocation_feed = (
+    RevocationFeed(
+        settings.auth_revocations_url,
+        interval=settings.revocation_poll_interval,
+        token=settings.revocation_feed_token,
+    )
+    if settings.auth_revocations_url
+    else None
+)
+
+
+def _check_revoked(payload: dict[str, Any]) -> dict[str, Any]:
+    if revocation_feed is not None:
+        revocation_feed.maybe_poll()
+        if revocation_feed.is_revoked(payload.get("sub"), payload.get("iat")):
+            raise jwt.InvalidTokenError("token_revoked")
+    return payload
+
+
+async def _get_jwks(force: bool = False) -> dict[str, Any]:
     now = time.time()
     if _JWKS.keys is not None and now < _JWKS.exp_at:
-        return _JWKS.keys  # type: ignore[return-value]
+        if not force or now - _JWKS.fetched_at < _JWKS.min_refresh_interval:
+            return _JWKS.keys  # type: ignore[return-value]
 
     async with httpx.AsyncClient(timeout=5) as c:
         r = await c.get(settings.auth_jwks_url)
         r.raise_for_status()
         data = r.json()
 
+    parsed = _parse_keys(data)
+    if parsed.keys() != _JWKS.parsed.keys():
+        # набор ключей сменился — ранее проверенные токены перепроверяем
+        _VerifiedTokens.entries.clear()
+
     _JWKS.keys = data
+    _JWKS.parsed = parsed
+    _JWKS.fetched_at = now
     _JWKS.exp_at = now + _JWKS.ttl
     return data
 
 
-def _rsa_pub_from_n_e(n_b64: str, e_b64: str) -> bytes:
-    n = int.from_bytes(base64.urlsafe_b64decode(n_b64 + "=="), "big")
-    e = int.from_bytes(base64.urlsafe_b64decode(e_b64 + "=="), "big")
-    pub = rsa.RSAPublicNumbers(e, n).public_key(default_backend())
-    return pub.public_bytes(
-        encoding=serialization.Encoding.PEM,
-        format=serialization.PublicFormat.SubjectPublicKeyInfo,
-    )
+def _parse_keys(jwks: dict[str, Any]) -> dict[str | None, tuple[Any, str]]:
+    parsed: dict[str | None, tuple[Any, str]] = {}
+    for key in jwks.get("keys", []) or []:
+        # RSA, EC (ES256) и OKP (EdDSA); симметричные и битые ключи пропускаем
+        if key.get("kty", "RSA") not in ("RSA", "EC", "OKP"):
+            continue
+        try:
+            jwk = jwt.PyJWK.from_dict(key)
+        except jwt.exceptions.PyJWKError:
+            continue
+        parsed[key.get("kid")] = (jwk.key, jwk.algorithm_name)
+    return parsed
+
+
+def _cached_payload(digest: bytes) -> dict[str, Any] | None:
+    entry = _VerifiedTokens.entries.get(digest)
+    if entry is None:
+        return None
+    if entry[0] <= time.time():
+        _VerifiedTokens.entries.pop(digest, None)
+        return None
+    _VerifiedTokens.entries.move_to_end(digest)
+    return dict(entry[1])
+
+
+def _remember_payload(digest: bytes, payload: dict[str, Any]) -> None:
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)):
+        return
+    # запись не переживает сам токен
+    expires_at = min(float(exp), time.time() + _VerifiedTokens.ttl)
+    _VerifiedTokens.entries[digest] = (expires_at, dict(payload))
+    _VerifiedTokens.entries.move_to_end(digest)
+    while len(_VerifiedTokens.entries) > _VerifiedTokens.maxsize:
+        _VerifiedTokens.entries.popitem(last=False)
 
 
 async def verify_jwt(token: str) -> dict[str, Any]:
+  digest = hashlib.sha256(token.encode()).digest()
+  cached = _cached_payload(digest)
+  if cached is not None and time.time() < _JWKS.exp_at:
+    return _check_revoked(cached)
+
   try:
     headers = jwt.get_unverified_header(token)
   except jwt.InvalidTokenError as err:
     raise jwt.InvalidTokenError("bad_header") from err
 
-  jwks = await _get_jwks()
-  keys = jwks.get("keys", []) or []
+  await _get_jwks()
+  keys = _JWKS.parsed
 
   kid = headers.get("kid")
 
   if kid:
-    key = next((k for k in keys if k.get("kid") == kid), None)
+    key = keys.get(kid)
+    if not key:
+      # ключ могли ротировать после того, как мы закэшировали JWKS
+      await _get_jwks(force=True)
+      keys = _JWKS.parsed
+      key = keys.get(kid)
     if not key:
       raise jwt.InvalidTokenError("kid_not_found")
   else:
     # fallback: если kid нет, но ключ один — берём его
     if len(keys) == 1:
-      key = keys[0]
+      key = next(iter(keys.values()))
     else:
       raise jwt.InvalidTokenError("missing_kid")
 
-  pub_pem = _rsa_pub_from_n_e(key["n"], key["e"])
+  public_key, alg = key
 
   payload = jwt.decode(
     token,
-    pub_pem,
-    algorithms=[key.get("alg", "RS256")],
+    public_key,
+    algorithms=[alg],
     issuer=settings.auth_issuer,
     options={"require": ["exp", "iat", "iss"]},
   )
-  return payload
+  _remember_payload(digest, payload)
+  return _check_revoked(payload)
 
 
 # ---------- cookie auth для Swagger / зависимостей ----------
@@ -0,0 +1,107 @@
+"""
+Микробенчмарк проверки access-токена в verify_jwt.
+
+Сравнивает стоимость одного запроса:
+  - legacy  — как было: n/e -> RSA -> PEM -> повторный разбор PEM в PyJWT;
+  - parsed  — готовый объект ключа из _JWKS.parsed, без кэша токенов;
+  - cached  — повторный запрос с тем же токеном (кэш проверенных токенов).
+
+Запуск из services/progress_service:
+    PYTHONPATH=. python -m benchmarks.verify_jwt
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.core import security
+from app.core.config import settings
+
+ITERATIONS = 2_000
+ISSUER = "auth-service"
+
+
+def legacy_pem_from_n_e(n_b64: str, e_b64: str) -> bytes:
+    n = int.from_bytes(base64.urlsafe_b64decode(n_b64 + "=="), "big")
+    e = int.from_bytes(base64.urlsafe_b64decode(e_b64 + "=="), "big")
+    pub = rsa.RSAPublicNumbers(e, n).public_key(default_backend())
+    return pub.public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+
+def legacy_verify(token: str, jwk: dict) -> dict:
+    jwt.get_unverified_header(token)
+    pem = legacy_pem_from_n_e(jwk["n"], jwk["e"])
+    return jwt.decode(
+        token,
+        pem,
+        algorithms=["RS256"],
+        issuer=ISSUER,
+        options={"require": ["exp", "iat", "iss"]},
+    )
+
+
+def setup() -> tuple[str, dict]:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(jwt.algorithms.RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update(kid="main-key-1", alg="RS256", use="sig")
+
+    jwks = {"keys": [jwk]}
+    security._JWKS.keys = jwks
+    security._JWKS.parsed = security._parse_keys(jwks)
+    security._JWKS.exp_at = time.time() + 3600
+    settings.auth_issuer = ISSUER
+
+    now = int(time.time())
+    token = jwt.encode(
+        {"sub": "user", "type": "access", "iss": ISSUER, "iat": now, "exp": now + 900},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "main-key-1"},
+    )
+    return token, jwk
+
+
+def report(name: str, elapsed: float, baseline: float | None = None) -> None:
+    per_call = elapsed / ITERATIONS * 1e6
+    speedup = f"  x{baseline / elapsed:.1f}" if baseline else ""
+    print(f"{name:<8} {per_call:10.1f} us/request{speedup}")
+
+
+async def main() -> None:
+    token, jwk = setup()
+
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        legacy_verify(token, jwk)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        security._VerifiedTokens.entries.clear()
+        await security.verify_jwt(token)
+    parsed = time.perf_counter() - started
+
+    await security.verify_jwt(token)
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await security.verify_jwt(token)
+    cached = time.perf_counter() - started
+
+    report("legacy", legacy)
+    report("parsed", parsed, legacy)
+    report("cached", cached, legacy)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+"""HTTP-помощники, общие для сервисов платформы."""
+
+from __future__ import annotations
+
+from starlette.requests import Request
+
+
+def parse_if_none_match(value: str | None) -> set[str]:
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Слабое сравнение ETag с If-None-Match (RFC 9110, 13.1.2)."""
+    tags = parse_if_none_match(request.headers.get("if-none-match"))
+    return "*" in tags or etag.removeprefix("W/") in tags
@@ -0,0 +1,255 @@
+"""
+Неблокирующее логирование для сервисов платформы.
+
+Записи кладутся в ограниченную очередь (QueueHandler) и пишутся в stdout
+отдельным потоком (QueueListener), поэтому медленный stdout не тормозит
+event loop. При переполнении очереди запись отбрасывается и учитывается
+в счётчике dropped. Контекст запроса (request_id, user_id, path, method)
+хранится в contextvars и подмешивается в запись на потоке вызывающего.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import uuid
+from contextvars import ContextVar, Token
+from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Literal
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ставится вместе с сервисами
+    orjson = None
+
+LogLevel = Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"]
+
+CONTEXT_FIELDS = ("request_id", "user_id", "path", "method")
+DEFAULT_QUEUE_SIZE = 10_000
+REQUEST_ID_HEADER = b"x-request-id"
+
+_request_context: ContextVar[dict[str, Any] | None] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> dict[str, Any]:
+    return dict(_request_context.get() or {})
+
+
+def bind_request_context(**values: Any) -> Token:
+    """Заменить контекст запроса целиком; вернуть токен для reset_request_context."""
+    return _request_context.set({k: v for k, v in values.items() if v is not None})
+
+
+def update_request_context(**values: Any) -> None:
+    """Дополнить текущий контекст (например, user_id после аутентификации)."""
+    current = _request_context.get() or {}
+    _request_context.set({**current, **{k: v for k, v in values.items() if v is not None}})
+
+
+def reset_request_context(token: Token) -> None:
+    _request_context.reset(token)
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class JsonFormatter(logging.Formatter):
+    def __init__(self, service: str | None = None) -> None:
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "ts": self.formatTime(record, datefmt="%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if self.service:
+            data["service"] = self.service
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+
+        for key in CONTEXT_FIELDS:
+            value = getattr(record, key, None)
+            if value is not None:
+                data[key] = value
+        return _dumps(data)
+
+
+class RequestContextFilter(logging.Filter):
+    """Подставляет поля контекста запроса, не перетирая явно переданные в extra."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _request_context.get()
+        if context:
+            for key, value in context.items():
+                if not hasattr(record, key):
+                    setattr(record, key, value)
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler над ограниченной очередью: при переполнении запись теряется, а не блокирует."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.addFilter(RequestContextFilter())
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Форматирование целиком уходит в поток listener'а; здесь только фиксируем
+        # сообщение (аргументы могут измениться) и текст исключения (traceback
+        # не должен переживать кадры вызывающего).
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_handler: DroppingQueueHandler | None = None
+_listener: QueueListener | None = None
+
+
+def _plain_formatter() -> logging.Formatter:
+    return logging.Formatter(
+        "%(asctime)s %(levelname)s %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S%z",
+    )
+
+
+def _base_config(level: str) -> dict:
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "loggers": {
+            "": {"level": level},
+            "uvicorn": {"level": level, "propagate": False},
+            "uvicorn.error": {"level": level, "propagate": False},
+            "uvicorn.access": {"level": level, "propagate": False},
+            # Полезные шумные логгеры можно опустить уровнем
+            "sqlalchemy.engine": {"level": os.getenv("SQL_LOG_LEVEL", "WARNING")},
+            "alembic": {"level": "INFO"},
+        },
+    }
+
+
+def setup_logging(
+    service: str | None = None,
+    level: LogLevel | None = None,
+    *,
+    json_logs: bool | None = None,
+    queue_size: int | None = None,
+) -> QueueListener:
+    """
+    Настроить корневой и uvicorn-логгеры на общую очередь.
+
+    Повторный вызов останавливает прежний listener (с дозаписью очереди)
+    и собирает конвейер заново.
+    """
+    global _handler, _listener
+
+    if level is None:
+        level = (os.getenv("APP_LOG_LEVEL") or "INFO").upper()
+    if json_logs is None:
+        json_logs = os.getenv("JSON_LOGS", "false").lower() in ("1", "true", "yes")
+    if queue_size is None:
+        queue_size = int(os.getenv("LOG_QUEUE_SIZE", str(DEFAULT_QUEUE_SIZE)))
+
+    stop_logging()
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(JsonFormatter(service) if json_logs else _plain_formatter())
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, stream, respect_handler_level=False)
+
+    dictConfig(_base_config(level))
+    for name in ("", "uvicorn", "uvicorn.error", "uvicorn.access"):
+        target = logging.getLogger(name)
+        target.handlers = [handler]
+
+    listener.start()
+    _handler, _listener = handler, listener
+
+    logging.getLogger(__name__).debug(
+        "Logging configured: level=%s json=%s queue_size=%s", level, json_logs, queue_size
+    )
+    return listener
+
+
+def stop_logging() -> None:
+    """Остановить listener, дописав всё, что уже в очереди."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> dict[str, Any]:
+    if _handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "running": _listener is not None,
+        "queue_size": _handler.queue.maxsize,
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+    }
+
+
+atexit.register(stop_logging)
+
+
+class RequestContextMiddleware:
+    """
+    Чистый ASGI-middleware: кладёт request_id/path/method в контекст логов.
+
+    request_id берётся из X-Request-ID или генерируется; user_id дописывает
+    auth-middleware через update_request_context.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+                break
+
+        token = bind_request_context(
+            request_id=request_id or uuid.uuid4().hex,
+            path=scope["path"],
+            method=scope["method"],
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_request_context(token)
@@ -0,0 +1,152 @@
+"""
+Клиент ленты отзыва auth-сервиса (GET /auth/revocations).
+
+Сервис-потребитель держит в памяти карту user_id -> not_before и проверяет
+токен одним словарным lookup'ом, без похода в auth на каждый запрос. Карта
+дочитывается инкрементально по cursor; раз в `resync_interval` она
+перечитывается целиком (since=0) — так подбираются записи, закоммиченные
+позже соседних с большим seq, и выбрасываются устаревшие.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+FEED_TOKEN_HEADER = "X-Feed-Token"
+
+Fetch = Callable[[int], Awaitable[dict[str, Any]]]
+
+
+class RevocationFeed:
+    def __init__(
+        self,
+        url: str,
+        interval: float = 5.0,
+        resync_interval: float = 300.0,
+        timeout: float = 5.0,
+        token: str | None = None,
+        fetch: Fetch | None = None,
+    ) -> None:
+        self.url = url
+        self.interval = interval
+        self.resync_interval = resync_interval
+        self.timeout = timeout
+        self.token = token
+        self._fetch = fetch or self._fetch_http
+
+        self._not_before: dict[str, float] = {}
+        self.cursor = 0
+        self.ttl = 0
+        self._polled_at = 0.0
+        self._resynced_at = 0.0
+        self._inflight: asyncio.Task | None = None
+        self._poller: asyncio.Task | None = None
+
+        self.polls = 0
+        self.failures = 0
+
+    def is_revoked(self, user_id: Any, iat: Any) -> bool:
+        """
+        Токен отозван, если выдан раньше водяного знака пользователя.
+
+        auth отдаёт not_before и iat с долями секунды, поэтому строгое
+        iat < not_before отсекает выданные до отзыва токены, но не новый
+        вход, случившийся в ту же секунду после отзыва.
+        """
+        not_before = self._not_before.get(str(user_id))
+        if not_before is None:
+            return False
+        return not isinstance(iat, (int, float)) or iat < not_before
+
+    async def poll(self) -> None:
+        """Дочитать ленту с текущего cursor (или целиком, если пора пересинхронизироваться)."""
+        full = time.monotonic() - self._resynced_at >= self.resync_interval
+        since = 0 if full else self.cursor
+        fresh: dict[str, float] = {}
+
+        while True:
+            data = await self._fetch(since)
+            for entry in data.get("entries", ()):
+                user_id, not_before = entry["user_id"], float(entry["not_before"])
+                if not_before > fresh.get(user_id, 0):
+                    fresh[user_id] = not_before
+            since = int(data.get("cursor", since))
+            self.ttl = int(data.get("ttl", self.ttl))
+            if not data.get("has_more"):
+                break
+
+        if full:
+            # новая карта целиком: устаревшие записи auth в ленту уже не отдаёт
+            self._not_before = fresh
+            self._resynced_at = time.monotonic()
+        else:
+            for user_id, not_before in fresh.items():
+                if not_before > self._not_before.get(user_id, 0):
+                    self._not_before[user_id] = not_before
+        self.cursor = since
+        self._polled_at = time.monotonic()
+        self.polls += 1
+
+    def maybe_poll(self) -> None:
+        """Для сервисов без фоновой задачи: запустить опрос, если прошло `interval`."""
+        if time.monotonic() - self._polled_at < self.interval:
+            return
+        if self._inflight is None or self._inflight.done():
+            self._polled_at = time.monotonic()
+            self._inflight = asyncio.create_task(self.poll())
+            self._inflight.add_done_callback(self._consume_exception)
+
+    def start(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        for task in (self._poller, self._inflight):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        self._poller = None
+        self._inflight = None
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception as err:
+                # недоступность auth не роняет проверку: работаем по последней карте
+                self.failures += 1
+                logger.warning("Revocation feed poll failed: %s", err)
+            await asyncio.sleep(self.interval)
+
+    def _consume_exception(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.failures += 1
+            logger.warning("Revocation feed poll failed: %s", task.exception())
+
+    async def _fetch_http(self, since: int) -> dict[str, Any]:
+        import httpx  # noqa: PLC0415 - httpx есть у всех сервисов-потребителей
+
+        headers = {FEED_TOKEN_HEADER: self.token} if self.token else None
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.get(self.url, params={"since": since}, headers=headers)
+            response.raise_for_status()
+            return response.json()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._not_before),
+            "cursor": self.cursor,
+            "polls": self.polls,
+            "failures": self.failures,
+            "seconds_since_poll": (
+                round(time.monotonic() - self._polled_at, 3) if self._polled_at else None
+            ),
+        }